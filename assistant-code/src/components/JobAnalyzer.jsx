@@ -131,7 +131,14 @@ const normalizeLinkedInJobURL = (url) => {
       status: "Saved",
       notes: "",     
       feedback: "",  
-      reminder_date: null
+      reminder_date: null,
+      job_snapshot: JSON.stringify({
+        title: parsed.title,
+        skills: parsed.skills,
+        experience: parsed.experience,
+        education: parsed.education,
+        responsibilities: parsed.responsibilities
+      })
     };
     
     
@@ -75,8 +75,12 @@
       'input[type="month"]',
       'input:not([type])',  // inputs with no type (default text)
       'textarea',
-      'select'
+      'select',
+      'input[type="radio"]',
+      '[role="combobox"]'
     ];
+    const seen = new Set();
+    const seenRadioGroups = new Set();
 
     // Reset counters for each run
     experienceFieldCounter = {};
@@ -85,6 +89,15 @@
 
     selectors.forEach(selector => {
       document.querySelectorAll(selector).forEach(element => {
+        // A text input with role="combobox" matches two selectors
+        if (seen.has(element)) return;
+        seen.add(element);
+        // A radio group is one field, represented by its first radio
+        if (element.type === 'radio') {
+          const groupKey = element.name || generateFieldId(element);
+          if (seenRadioGroups.has(groupKey)) return;
+          seenRadioGroups.add(groupKey);
+        }
         // Only consider visible, enabled fields
         if (element.offsetParent !== null && !element.disabled && !element.readOnly) {
           const field = extractFieldInfo(element);
@@ -119,6 +132,7 @@
       type: element.type || 'text',
       name: element.name || '',
       placeholder: element.placeholder || '',
+      options: getFieldOptions(element),
       id: element.id || '',
       experienceIndex: null,
       experienceFieldType: null,
@@ -128,8 +142,8 @@
       licenseFieldType: null
     };
 
-    // Find label text for the field
-    field.label = findFieldLabel(element);
+    // Find label text for the field (a radio's own label is one of the options)
+    field.label = element.type === 'radio' ? findGroupLabel(element) : findFieldLabel(element);
     if (!field.label || field.label.length < 2) {
       return null;
     }
@@ -191,6 +205,79 @@
     return field;
   }
 
+  // Radios sharing a name with this one, in page order
+  function getRadioGroup(element) {
+    if (!element.name) return [element];
+    const scope = element.form || document;
+    return Array.from(scope.querySelectorAll('input[type="radio"]'))
+      .filter(radio => radio.name === element.name);
+  }
+
+  // Visible choice text of a radio: its label, or its value as a last resort
+  function getRadioLabel(radio) {
+    return findFieldLabel(radio) || (radio.value || '').trim();
+  }
+
+  // The listbox a combobox controls (ARIA 1.2 uses aria-controls, 1.1 aria-owns)
+  function getComboboxListbox(element) {
+    const listId = element.getAttribute('aria-controls') || element.getAttribute('aria-owns');
+    return listId ? document.getElementById(listId) : null;
+  }
+
+  // Choices the server can resolve a value against, for select, radio and combobox fields
+  function getFieldOptions(element) {
+    const optionTexts = nodes => Array.from(nodes).map(opt => (opt.textContent || opt.value || '').trim()).filter(Boolean);
+    if (element.tagName.toLowerCase() === 'select') {
+      return optionTexts(element.options);
+    }
+    if (element.type === 'radio') {
+      return getRadioGroup(element).map(getRadioLabel).filter(Boolean);
+    }
+    if (element.list) {
+      return Array.from(element.list.options).map(opt => (opt.value || opt.textContent || '').trim()).filter(Boolean);
+    }
+    if (element.getAttribute('role') === 'combobox') {
+      const listbox = getComboboxListbox(element);
+      // Many comboboxes only render their options once opened; the server then fills the text as typed
+      return listbox ? optionTexts(listbox.querySelectorAll('[role="option"]')) : [];
+    }
+    return [];
+  }
+
+  // Question text of a radio group: fieldset legend, radiogroup label, or the text before the group
+  function findGroupLabel(element) {
+    const fieldset = element.closest('fieldset');
+    const legend = fieldset && fieldset.querySelector('legend');
+    if (legend && legend.textContent.trim()) {
+      return cleanLabel(legend.textContent.trim());
+    }
+    const group = element.closest('[role="radiogroup"]');
+    if (group) {
+      const labelledBy = group.getAttribute('aria-labelledby');
+      const labelElem = labelledBy && document.getElementById(labelledBy);
+      const text = (labelElem && labelElem.textContent.trim()) || group.getAttribute('aria-label');
+      if (text) return cleanLabel(text.trim());
+    }
+    // Text in the container that holds the whole group, other than the choices themselves
+    const radios = getRadioGroup(element);
+    const choices = new Set(radios.map(getRadioLabel));
+    let container = element.parentElement;
+    while (container && !radios.every(radio => container.contains(radio))) {
+      container = container.parentElement;
+    }
+    if (container) {
+      const walker = document.createTreeWalker(container, NodeFilter.SHOW_TEXT, null, false);
+      let node;
+      while ((node = walker.nextNode())) {
+        const nodeText = node.textContent.trim();
+        if (nodeText && nodeText.length > 1 && nodeText.length < 200 && !choices.has(cleanLabel(nodeText))) {
+          return cleanLabel(nodeText);
+        }
+      }
+    }
+    return element.name ? cleanLabel(element.name.replace(/[_-]/g, ' ').trim()) : '';
+  }
+
   // Extract numerical index from field attributes (name, id, class, data-*)
   function extractNumberFromField(element) {
     const identifiers = [
@@ -360,6 +447,63 @@
  }
 
 
+  // The application a page belongs to: steps of one application share the path and form
+  // (they differ in query string or hash), another posting in the same tab does not
+  function getApplicationScope() {
+    const form = document.querySelector('form[action]');
+    return `${location.origin}${location.pathname}|${form ? form.getAttribute('action') : ''}`;
+  }
+
+  // One server-side session per application, so multi-page applications keep their mapping state
+  function getAutofillSessionId() {
+    const scope = getApplicationScope();
+    let stored = null;
+    try {
+      stored = JSON.parse(sessionStorage.getItem('aynaAutofillSession') || 'null');
+    } catch {
+      stored = null;
+    }
+    if (!stored || stored.scope !== scope) {
+      // New application in this tab: start a fresh plan instead of reusing the last one's
+      stored = { id: crypto.randomUUID(), scope };
+      sessionStorage.setItem('aynaAutofillSession', JSON.stringify(stored));
+    }
+    return stored.id;
+  }
+
+  // Job the application is for, so screening answers can be written for (and adapted to) it
+  function getJobContext() {
+    const job = { title: '', company: '', description: '' };
+    // Most ATS pages publish the posting as schema.org JobPosting
+    for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+      try {
+        const nodes = [].concat(JSON.parse(script.textContent));
+        const posting = nodes.flatMap(n => [n, ...(n['@graph'] || [])])
+          .find(n => n && String(n['@type'] || '').includes('JobPosting'));
+        if (posting) {
+          const org = posting.hiringOrganization;
+          job.title = posting.title || '';
+          job.company = (org && (org.name || org)) || '';
+          const holder = document.createElement('div');
+          holder.innerHTML = posting.description || '';
+          job.description = holder.textContent.trim();
+          break;
+        }
+      } catch {
+        // Malformed JSON-LD: fall back to the page itself
+      }
+    }
+    const meta = name => (document.querySelector(`meta[property="${name}"], meta[name="${name}"]`) || {}).content || '';
+    job.title = job.title || (document.querySelector('h1')?.textContent || '').trim() || meta('og:title') || document.title;
+    job.company = String(job.company || meta('og:site_name'));
+    if (!job.description) {
+      const block = document.querySelector('[class*="job-description"], [class*="jobDescription"], [id*="job-description"], [class*="description"]');
+      job.description = (block ? block.innerText : meta('description') || '').trim();
+    }
+    job.description = job.description.slice(0, 3000);
+    return job;
+  }
+
   // Call server autofill
   async function callServerAutofill(fields, profile) {
     const res = await fetch('http://localhost:8000/autofill', {
@@ -372,6 +516,7 @@
           type: field.type,
           name: field.name,
           placeholder: field.placeholder,
+          options: field.options,
           experienceIndex: field.experienceIndex,
           experienceFieldType: field.experienceFieldType,
           projectIndex: field.projectIndex,
@@ -379,7 +524,9 @@
           licenseIndex: field.licenseIndex,
           licenseFieldType: field.licenseFieldType
         })),
-        profile: profile
+        profile: profile,
+        session_id: getAutofillSessionId(),
+        job: getJobContext()
       })
     });
     if (!res.ok) return null;
@@ -602,7 +749,30 @@
         }
       }
 
-      if (element.tagName.toLowerCase() === 'select') {
+      if (element.type === 'radio') {
+        // Check the radio whose label is the chosen option
+        const wanted = String(fillValue).trim().toLowerCase();
+        const radio = getRadioGroup(element).find(r =>
+          getRadioLabel(r).toLowerCase() === wanted || (r.value || '').toLowerCase() === wanted);
+        if (!radio) {
+          console.log(`No radio option "${fillValue}" for "${field.label}"`);
+          continue;
+        }
+        radio.click();
+        radio.dispatchEvent(new Event('change', { bubbles: true }));
+      } else if (element.tagName.toLowerCase() !== 'input' && element.getAttribute('role') === 'combobox') {
+        // Non-input comboboxes: open the list and click the matching option
+        element.click();
+        const listbox = getComboboxListbox(element);
+        const wanted = String(fillValue).trim().toLowerCase();
+        const option = listbox && Array.from(listbox.querySelectorAll('[role="option"]'))
+          .find(opt => opt.textContent.trim().toLowerCase() === wanted);
+        if (!option) {
+          console.log(`No combobox option "${fillValue}" for "${field.label}"`);
+          continue;
+        }
+        option.click();
+      } else if (element.tagName.toLowerCase() === 'select') {
         // For select dropdowns, set the value and trigger change
         element.focus();
         element.value = fillValue;
@@ -2,17 +2,25 @@
 from fastapi import FastAPI,APIRouter, Depends, HTTPException,UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from src.langchain.profile_enrichment import profile_prompt
-from src.langchain.job_scraper import fetch_job_description
+from src.langchain.job_scraper import reextract_cached_pages
+from src.langchain.batch_scraper import scrape_and_parse, scrape_jobs
+from src.langchain.scrape_cache import scrape_cache
+from src.langchain.site_registry import site_registry
+from src.langchain.browser_pool import browser_pool
+from src.langchain.http_fetcher import close_http_client
 from src.langchain.jd_parser import parse_job_posting
+from src.langchain.jd_cache import jd_cache
 from src.langchain.main import get_llm
+from src.langchain.structured_output import StructuredOutput, structured_output_stats
 from pydantic import BaseModel
 from src.langchain.resume_generator import get_resume_chain,generate_resume_with_retry,generate_pdf_from_doc,get_resume_refinement_chain,refine_resume_with_retry
 from src.langchain.coverletter_generator import get_coverletter_chain,generate_coverletter_with_retry,get_coverletter_refinement_chain,refine_coverletter_with_retry
-from src.langchain.job_matcher import match_score
-from src.langchain.autofill import  smart_autofill, field_usage_tracker,llm, clf, embedder
-from src.langchain.models import AutofillRequest,ProfileData,Field,JobApplicationIn,JobApplicationOut,GenericInput,JobURL,JobTextInput,ApplicationPayload,ResumeRefinementPayload,CoverLetterRefinementPayload,MatchScorePayload,FeedbackIn,LicenseItem,EducationItem,ExperienceItem,ProjectItem,TextInput,EnrichedProfile
+from src.langchain.job_matcher import match_score, match_cache, rank_jobs
+from src.langchain.autofill import  smart_autofill, field_usage_tracker,llm, clf, embedder, option_matcher, autofill_sessions, answer_index
+from src.langchain.models import AutofillRequest,ProfileData,Field,JobApplicationIn,JobApplicationOut,GenericInput,JobURL,BatchScrapePayload,JobTextInput,ApplicationPayload,ResumeRefinementPayload,CoverLetterRefinementPayload,MatchScorePayload,RankJobsPayload,FeedbackIn,ScreeningAnswerIn,ScreeningAnswerOut,ScreeningAnswerAccept,LicenseItem,EducationItem,ExperienceItem,ProjectItem,TextInput,EnrichedProfile
 from fastapi.responses import StreamingResponse
 import io
+from contextlib import aclosing
 import json
 import multiprocessing
 from typing import Dict, Any, List, Optional
@@ -23,7 +31,6 @@ from datetime import datetime
 import joblib
 from sentence_transformers import SentenceTransformer
 from langchain.schema import HumanMessage
-from langchain_core.output_parsers import JsonOutputParser
 import logging
 import re
 from sentence_transformers import SentenceTransformer
@@ -49,7 +56,18 @@ logger = logging.getLogger(__name__)
 if __name__ == "__main__":
     multiprocessing.set_start_method("fork")
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One browser for every scrape; launching per request cost more than the fetch
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.warning(f"⚠️ Scraper browser not started, will retry on first scrape: {str(e)}")
+    yield
+    await browser_pool.stop()
+    await close_http_client()
+
+app = FastAPI(lifespan=lifespan)
 router = APIRouter()
 app.include_router(router)
 
@@ -140,6 +158,9 @@ async def get_memory_stats():
         stats = {
             "memory_entries": len(persistent_autofill_memory),
             "field_usage_entries": len(field_usage_tracker),
+            "option_match_stats": option_matcher.stats,
+            "active_sessions": len(autofill_sessions),
+            "screening_answer_stats": answer_index.stats,
             "memory_keys": list(persistent_autofill_memory.keys()),
             "recent_memory": {
                 k: v for k, v in list(persistent_autofill_memory.items())[-10:]
@@ -176,6 +197,64 @@ async def clear_memory():
         logger.error(f"❌ Failed to clear memory: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to clear memory")
 
+@app.get("/autofill/session/{session_id}")
+async def get_autofill_session(session_id: str):
+    """
+    Inspect the mapping state kept for a multi-page application
+    """
+    session = autofill_sessions.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    
+    return {
+        "session_id": session.session_id,
+        "pages": session.pages,
+        "planned_labels": len(session.label_plan),
+        "group_mappings": {
+            form_id: counters["group_mapping"]
+            for form_id, counters in session.matcher.form_counters.items()
+        },
+        "created_at": session.created_at,
+        "last_used": session.last_used,
+        "expires_in": max(0.0, autofill_sessions.ttl_seconds - (time.time() - session.last_used))
+    }
+
+@app.delete("/autofill/session/{session_id}")
+async def end_autofill_session(session_id: str):
+    """
+    End a multi-page autofill session (e.g. after the application is submitted)
+    """
+    if not autofill_sessions.drop(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"status": "deleted"}
+
+@app.post("/autofill/answers", response_model=ScreeningAnswerOut)
+async def save_screening_answer(payload: ScreeningAnswerIn):
+    """
+    Store an answer the user wrote or accepted so similar questions reuse it
+    """
+    entry = answer_index.add(
+        payload.question, payload.answer, payload.company or "", payload.job_title or "", source="accepted"
+    )
+    return entry
+
+@app.post("/autofill/answers/{answer_id}/accept", response_model=ScreeningAnswerOut)
+async def accept_screening_answer(answer_id: int, payload: ScreeningAnswerAccept):
+    """
+    Accept a generated answer (optionally edited) so similar questions reuse it
+    """
+    entry = answer_index.accept(answer_id, payload.answer)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return entry
+
+@app.get("/autofill/answers", response_model=List[ScreeningAnswerOut])
+async def list_screening_answers():
+    """
+    List stored screening answers, most recent first
+    """
+    return answer_index.list_entries()
+
 @app.get("/autofill/health")
 async def health_check():
     """
@@ -217,7 +296,7 @@ def get_db():
         db.close()
 
 
-parser = JsonOutputParser(pydantic_object=EnrichedProfile)
+profile_enricher = StructuredOutput(get_llm(), EnrichedProfile)
 
 # Text enrichment endpoint
 @app.post("/enrich-text")
@@ -227,31 +306,9 @@ async def enrich_text_endpoint(request: dict):
         if not text.strip():
             return {"error": "No text provided"}
         
-        llm = get_llm()
-        parser = JsonOutputParser()
-        chain = profile_prompt | llm | parser
-        
-        result = chain.invoke({"profile_json": text})
-        
-        # Ensure result is properly formatted
-        if isinstance(result, dict):
-            # Validate required fields exist
-            required_fields = ["fullName", "email", "phone", "location", "linkedin", 
-                             "github", "portfolio", "summary", "education", "experience", 
-                             "projects", "skills", "licenses"]
-            
-            for field in required_fields:
-                if field not in result:
-                    if field in ["education", "experience", "projects", "licenses"]:
-                        result[field] = []
-                    elif field == "skills":
-                        result[field] = []
-                    else:
-                        result[field] = ""
-            
-            return {"enriched": result}
-        else:
-            return {"error": "Invalid response format from LLM"}
+        # Schema defaults fill any field the model left out
+        result = profile_enricher.invoke(profile_prompt.invoke({"profile_json": text}))
+        return {"enriched": result.dict()}
             
     except Exception as e:
         print(f"Error in enrich_text_endpoint: {str(e)}")
@@ -261,33 +318,12 @@ async def enrich_text_endpoint(request: dict):
 @app.post("/enrich-profile")
 async def enrich_profile_endpoint(profile: dict):
     try:
-        llm = get_llm()
-        parser = JsonOutputParser()
-        chain = profile_prompt | llm | parser
-        
         # Convert profile to JSON string for the prompt
         profile_json = json.dumps(profile, indent=2)
-        result = chain.invoke({"profile_json": profile_json})
-        
-        # Ensure result is properly formatted
-        if isinstance(result, dict):
-            # Validate required fields exist
-            required_fields = ["fullName", "email", "phone", "location", "linkedin", 
-                             "github", "portfolio", "summary", "education", "experience", 
-                             "projects", "skills", "licenses"]
-            
-            for field in required_fields:
-                if field not in result:
-                    if field in ["education", "experience", "projects", "licenses"]:
-                        result[field] = []
-                    elif field == "skills":
-                        result[field] = []
-                    else:
-                        result[field] = ""
-            
-            return {"enriched": result}
-        else:
-            return {"error": "Invalid response format from LLM"}
+
+        # Schema defaults fill any field the model left out
+        result = profile_enricher.invoke(profile_prompt.invoke({"profile_json": profile_json}))
+        return {"enriched": result.dict()}
             
     except Exception as e:
         print(f"Error in enrich_profile_endpoint: {str(e)}")
@@ -305,11 +341,52 @@ def submit_feedback(payload: FeedbackIn, db: Session = Depends(get_db)):
 @app.post("/match-score")
 async def get_match_score(payload: MatchScorePayload):
     try:
-        score_result = match_score(payload.dict())
+        score_result = await asyncio.to_thread(match_score, payload.dict())
         return score_result
     except Exception as e:
         return {"error": str(e)}
 
+@app.post("/match-score/rank")
+async def rank_jobs_endpoint(payload: RankJobsPayload, db: Session = Depends(get_db)):
+    """
+    Score one profile against many jobs (inline and/or tracker ids), streamed as NDJSON
+    """
+    jobs = list(payload.jobs)
+    if payload.job_ids:
+        rows = db.query(JobApplication).filter(JobApplication.id.in_(payload.job_ids)).all()
+        for row in rows:
+            job = {}
+            if row.job_snapshot:
+                try:
+                    job = json.loads(row.job_snapshot)
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️ Invalid job snapshot for tracker id {row.id}")
+            # Notes are the user's own, never part of the job's requirements
+            job.update({"id": row.id, "title": job.get("title") or row.title, "company": row.company})
+            jobs.append(job)
+    
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No jobs to rank")
+    
+    async def stream():
+        async for event in rank_jobs(payload.profile, jobs, payload.resume or "", payload.top_k, payload.concurrency):
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/match-score/cache")
+async def get_match_cache_stats():
+    return match_cache.stats()
+
+@app.delete("/match-score/cache")
+async def clear_match_cache():
+    return {"cleared_entries": match_cache.clear()}
+
+@app.get("/structured-output/stats")
+async def get_structured_output_stats():
+    """How often LLM replies needed repair or a field-level retry"""
+    return structured_output_stats
+
 @app.post("/refine-resume")
 async def refine_resume_api(payload: ResumeRefinementPayload):
     job_clean = dict(payload.job)
@@ -404,14 +481,81 @@ async def generate_coverletter_api(payload: ApplicationPayload):
 #Job scraping endpoint
 @app.post("/scrape-job")
 async def scrape_job_endpoint(input: JobURL):
-    jd_text = await fetch_job_description(input.url)
-    parsed = parse_job_posting(jd_text)
-    return parsed
+    # JobPosting structured data comes back already parsed; no LLM round trip needed
+    return await scrape_and_parse(input.url)
+
+@app.post("/scrape-job/batch")
+async def scrape_jobs_endpoint(payload: BatchScrapePayload):
+    """
+    Scrape (and parse) many job URLs concurrently, streamed as NDJSON in completion order
+    """
+    if not any(url.strip() for url in payload.urls):
+        raise HTTPException(status_code=400, detail="No URLs to scrape")
+    
+    async def stream():
+        # aclosing: a client disconnect closes scrape_jobs right away, cancelling its scrapes
+        async with aclosing(scrape_jobs(payload.urls, parse=payload.parse, use_cache=payload.use_cache)) as events:
+            async for event in events:
+                yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/scrape-job/browser")
+async def get_browser_pool_status():
+    return browser_pool.status()
+
+@app.get("/scrape-job/selectors")
+async def get_selector_stats():
+    return site_registry.stats()
+
+@app.post("/scrape-job/selectors/reload")
+async def reload_site_registry():
+    return {"rules": site_registry.reload()}
+
+@app.get("/scrape-job/cache")
+async def get_scrape_cache_stats():
+    return scrape_cache.stats()
+
+@app.delete("/scrape-job/cache")
+async def clear_scrape_cache():
+    return {"cleared_entries": scrape_cache.clear()}
+
+@app.post("/scrape-job/cache/reextract")
+async def reextract_scrape_cache(only_outdated: bool = True):
+    # CPU-bound pass over stored snapshots; keep it off the event loop
+    return await asyncio.to_thread(reextract_cached_pages, only_outdated)
 
 @app.post("/parse-job-text")
 async def parse_job_text(input: JobTextInput):
     return parse_job_posting(input.text)
 
+@app.get("/parse-job/cache")
+async def get_jd_cache_stats():
+    return jd_cache.stats()
+
+@app.delete("/parse-job/cache")
+async def clear_jd_cache():
+    return {"cleared_entries": jd_cache.clear()}
+
+@app.post("/job-duplicates/find")
+async def find_duplicate_postings(input: JobTextInput):
+    """Postings seen before that are copies of a job description"""
+    return {"duplicates": [match.as_dict() for match in jd_cache.find_duplicates(input.text)]}
+
+def _tracker_job_text(db_app: JobApplication) -> str:
+    """Text to fingerprint a tracker entry by: the raw posting if saved, else its parsed fields"""
+    job = {}
+    if db_app.job_snapshot:
+        try:
+            job = json.loads(db_app.job_snapshot)
+        except json.JSONDecodeError:
+            job = {}
+    if job.get("raw"):
+        return job["raw"]
+    parts = [job.get("title") or db_app.title, db_app.company, job.get("experience") or "", job.get("education") or ""]
+    parts += list(job.get("responsibilities") or []) + list(job.get("skills") or [])
+    return "\n".join(str(p) for p in parts if p)
+
 @app.post("/job-tracker/add", response_model=JobApplicationOut)
 def add_job_application(application: JobApplicationIn, db: Session = Depends(get_db)):
     print("Received job:", application)
@@ -419,8 +563,27 @@ def add_job_application(application: JobApplicationIn, db: Session = Depends(get
     db.add(db_app)
     db.commit()
     db.refresh(db_app)
+    
+    # Same posting saved from another board: link it to the first entry
+    duplicate_of = jd_cache.link_tracker(
+        db_app.id, _tracker_job_text(db_app), url=db_app.url, title=db_app.title, company=db_app.company
+    )
+    if duplicate_of:
+        db_app.duplicate_of = duplicate_of
+        db.commit()
+        db.refresh(db_app)
     return db_app
 
+@app.get("/job-tracker/{app_id}/duplicates", response_model=List[JobApplicationOut])
+def list_duplicate_applications(app_id: int, db: Session = Depends(get_db)):
+    db_app = db.query(JobApplication).filter(JobApplication.id == app_id).first()
+    if not db_app:
+        raise HTTPException(status_code=404, detail="Application not found")
+    root = db_app.duplicate_of or db_app.id
+    return db.query(JobApplication).filter(
+        ((JobApplication.id == root) | (JobApplication.duplicate_of == root)) & (JobApplication.id != app_id)
+    ).order_by(JobApplication.id).all()
+
 @app.get("/job-tracker/all", response_model=List[JobApplicationOut])
 def list_job_applications(db: Session = Depends(get_db)):
     return db.query(JobApplication).order_by(JobApplication.timestamp.desc()).all()
@@ -432,6 +595,9 @@ def update_job_application(app_id: int, application: JobApplicationIn, db: Sessi
         raise HTTPException(status_code=404, detail="Application not found")
     
     for key, value in application.dict().items():
+        # The tracker form does not carry the parsed job, keep the stored one
+        if key == "job_snapshot" and value is None:
+            continue
         setattr(db_app, key, value)
     
     db.commit()
@@ -444,6 +610,12 @@ def delete_job_application(app_id: int, db: Session = Depends(get_db)):
     if not db_app:
         raise HTTPException(status_code=404, detail="Application not found")
     
+    # Copies linked to this entry now hang off the oldest remaining one
+    copies = db.query(JobApplication).filter(JobApplication.duplicate_of == app_id).order_by(JobApplication.id).all()
+    for entry in copies:
+        entry.duplicate_of = copies[0].id if entry is not copies[0] else None
+    jd_cache.unlink_tracker(app_id)
+    
     db.delete(db_app)
     db.commit()
     return {"status": "deleted"}
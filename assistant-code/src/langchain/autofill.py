@@ -4,20 +4,25 @@ from src.langchain.models import AutofillRequest, ProfileData, Field
 from langchain_core.output_parsers import JsonOutputParser
 import logging
 import re
-from sentence_transformers import SentenceTransformer
 from sklearn.linear_model import LogisticRegression
 import joblib
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass, field as dataclass_field
 import asyncio
 import time
 from functools import lru_cache
 import os
+import hashlib
+import json
 from sklearn.neighbors import NearestNeighbors
 from src.langchain.train_classifier import training_data
-from src.langchain.main import get_llm
-embedder = SentenceTransformer('all-MiniLM-L6-v2') 
+from src.langchain.fuzzy_matcher import FuzzyLabelMatcher, normalize_text
+from src.langchain.option_matcher import OptionMatcher
+from src.langchain.screening_answers import AnswerIndex, answer_screening_questions
+from src.langchain.main import get_llm, get_embedder
+embedder = get_embedder()
 
 # ================== CONFIGURATION ================== #
 llm = get_llm()
@@ -33,7 +38,7 @@ MEMORY_VALIDATION = True  # Enable memory validation
 
 class EnhancedClassifier:
     def __init__(self):
-        self.embedder = SentenceTransformer('all-MiniLM-L6-v2')
+        self.embedder = get_embedder()
         self.nn = None
         self.training_labels = []
         self.training_categories = []
@@ -53,6 +58,17 @@ class EnhancedClassifier:
 clf = EnhancedClassifier()
 clf.load_training_data(training_data) 
 
+# Cheap n-gram stage so small label variants never reach the embedder
+fuzzy_matcher = FuzzyLabelMatcher()
+fuzzy_matcher.load_training_data(training_data)
+
+# Maps resolved values onto select/radio/combobox options, cached per option list
+option_matcher = OptionMatcher(embedder=clf.embedder)
+
+# Long-answer questions ("Why do you want this job?") are answered from past answers first
+answer_index = AnswerIndex(embedder=clf.embedder)
+LONG_ANSWER_CATEGORY = "cover_letter"
+
 VALID_CATEGORIES = {
     'first_name', 'last_name', 'email', 'phone', 
     'current_company', 'current_title',
@@ -104,12 +120,159 @@ def detect_field_type(label: str, field_id: str = "") -> str:
         
     return 'unknown'
 
+# ================== REPEATED SECTION GROUPS ================== #
+@dataclass
+class SectionGroup:
+    """A repeated form section (experience, education, ...) and how it maps onto the profile"""
+    prefix: str                                  # flattened key prefix, e.g. exp -> exp_0_company
+    profile_attr: str                            # list attribute on ProfileData
+    id_pattern: re.Pattern                       # captures the group number from a field id
+    value_keys: Dict[str, str]                   # profile item key -> flattened key suffix
+    label_rules: List[Tuple[Tuple[str, ...], str]]  # ordered (label keywords, key suffix)
+    date_stems: Dict[str, str] = dataclass_field(default_factory=dict)  # id/label word -> date key stem
+    max_items: int = 15
+
+
+SECTION_GROUPS: List[SectionGroup] = [
+    SectionGroup(
+        prefix="exp",
+        profile_attr="experience",
+        id_pattern=re.compile(r'(?:workExperience|experience|employment)[-_]?(\d+)', re.I),
+        value_keys={"company": "company", "position": "title", "location": "location",
+                    "description": "description", "startDate": "start_date", "endDate": "end_date"},
+        label_rules=[
+            (("start date", "from date"), "start_date"),
+            (("end date", "to date"), "end_date"),
+            (("description", "responsibilities", "duties", "accomplishments", "summary"), "description"),
+            (("company", "employer", "organization"), "company"),
+            (("title", "position", "role", "job"), "title"),
+            (("location", "city", "address"), "location"),
+        ],
+        date_stems={"start": "start", "end": "end"},
+    ),
+    SectionGroup(
+        prefix="edu",
+        profile_attr="education",
+        id_pattern=re.compile(r'(?:education|school)[-_]?(\d+)', re.I),
+        value_keys={"school": "school", "degree": "degree", "field": "field", "gpa": "gpa",
+                    "startDate": "start_date", "endDate": "end_date"},
+        label_rules=[
+            (("start date", "from date"), "start_date"),
+            (("end date", "to date", "graduation"), "end_date"),
+            (("field of study", "major", "discipline", "specialization", "area of study"), "field"),
+            (("degree", "qualification", "diploma"), "degree"),
+            (("school", "university", "college", "institution"), "school"),
+            (("gpa", "grade"), "gpa"),
+        ],
+        # Workday uses firstYearAttended/lastYearAttended ("attended" contains "end")
+        date_stems={"first": "start", "last": "end", "start": "start", "end": "end", "graduat": "end"},
+    ),
+    SectionGroup(
+        prefix="proj",
+        profile_attr="projects",
+        id_pattern=re.compile(r'projects?[-_]?(\d+)', re.I),
+        value_keys={"name": "name", "techStack": "tech_stack", "description": "description", "link": "link"},
+        label_rules=[
+            (("description", "summary", "overview", "details"), "description"),
+            (("technolog", "tech stack", "tools", "stack"), "tech_stack"),
+            (("url", "link", "website", "github"), "link"),
+            (("name", "title", "project"), "name"),
+        ],
+    ),
+    SectionGroup(
+        prefix="lic",
+        profile_attr="licenses",
+        id_pattern=re.compile(r'(?:licen[sc]es?|certifications?)[-_]?(\d+)', re.I),
+        value_keys={"title": "title", "description": "description",
+                    "issueDate": "issue_date", "expiryDate": "expiry_date"},
+        label_rules=[
+            (("expir",), "expiry_date"),
+            (("issue", "earned", "obtained", "awarded"), "issue_date"),
+            (("description", "details", "issuer", "authority"), "description"),
+            (("name", "title", "certification", "license", "credential"), "title"),
+        ],
+        date_stems={"issue": "issue", "expir": "expiry"},
+    ),
+]
+SECTION_GROUPS_BY_PREFIX = {group.prefix: group for group in SECTION_GROUPS}
+
+
+def find_section_group(field_id: str) -> Optional[SectionGroup]:
+    """Repeated section a field belongs to, judged by its id"""
+    for group in SECTION_GROUPS:
+        if group.id_pattern.search(field_id or ""):
+            return group
+    return None
+
+
+def flatten_section(items: List[Dict], group: SectionGroup, user_profile: dict) -> None:
+    """Write items as {prefix}_{i}_{key}, splitting every *_date into _month/_year"""
+    for i, item in enumerate(items[:group.max_items]):
+        for item_key, suffix in group.value_keys.items():
+            value = item.get(item_key, "")
+            if isinstance(value, list):
+                value = ", ".join(str(v) for v in value)
+            value = str(value or "").strip()
+            user_profile[f"{group.prefix}_{i}_{suffix}"] = value
+
+            if suffix.endswith("_date") and value:
+                stem = suffix[:-len("_date")]
+                parts = parse_date(value)
+                user_profile[f"{group.prefix}_{i}_{stem}_month"] = parts['month']
+                user_profile[f"{group.prefix}_{i}_{stem}_year"] = parts['year']
+
+
+def match_section_field(group: SectionGroup, seq_index: int, label: str, field_id: str) -> Optional[str]:
+    """Map a field inside a repeated group onto its flattened profile key"""
+    field_type = detect_field_type(label, field_id)
+    label_lower = label.lower()
+    field_id_lower = field_id.lower()
+
+    if field_type in ['date_month', 'date_year'] and group.date_stems:
+        part = 'month' if field_type == 'date_month' else 'year'
+        for text in (field_id_lower, label_lower):
+            for word, stem in group.date_stems.items():
+                if word in text:
+                    return f"{group.prefix}_{seq_index}_{stem}_{part}"
+        return None
+
+    for keywords, suffix in group.label_rules:
+        if any(keyword in label_lower for keyword in keywords):
+            return f"{group.prefix}_{seq_index}_{suffix}"
+    return None
+
+
 # ================== ENHANCED PROFILE CONVERSION ================== #
 def convert_profile_to_user_format(profile: ProfileData) -> dict:
     """FIXED: Enhanced profile conversion with proper experience deduplication"""
     user_profile = {}
     
-    # ... (basic info code remains the same)
+    # Basic info
+    full_name = (profile.fullName or "").strip()
+    name_parts = full_name.split()
+    user_profile['first_name'] = name_parts[0] if name_parts else ""
+    user_profile['last_name'] = " ".join(name_parts[1:])
+    user_profile['email'] = profile.email or ""
+    user_profile['phone'] = profile.phone or ""
+    user_profile['location'] = profile.location or ""
+    user_profile['linkedin'] = profile.linkedin or ""
+    user_profile['github'] = profile.github or ""
+    user_profile['website'] = profile.portfolio or ""
+    user_profile['summary'] = profile.summary or ""
+    user_profile['skills'] = ", ".join(profile.skills or [])
+    
+    # Education, projects and licenses keep profile order
+    for group in SECTION_GROUPS:
+        if group.prefix == "exp":
+            continue
+        items = [item for item in (getattr(profile, group.profile_attr, []) or []) if any(item.values())]
+        flatten_section(items, group, user_profile)
+    
+    if user_profile.get("edu_0_school"):
+        user_profile['education_school'] = user_profile["edu_0_school"]
+        user_profile['degree'] = " ".join(
+            part for part in (user_profile.get("edu_0_degree"), user_profile.get("edu_0_field")) if part
+        )
     
     # ========== COMPLETELY REWRITTEN EXPERIENCE PROCESSING ========== #
     work_experiences = getattr(profile, 'experience', []) or getattr(profile, 'experiences', [])
@@ -220,33 +383,7 @@ def convert_profile_to_user_format(profile: ProfileData) -> dict:
         unique_experiences.sort(key=get_sort_date, reverse=True)
         
         # Populate experience fields with proper indexing
-        for i, exp in enumerate(unique_experiences[:15]):
-            company = exp.get("company", "").strip()
-            position = exp.get("position", "").strip()
-            location = exp.get("location", "").strip()
-            description = exp.get("description", "").strip()
-            start_date = exp.get("startDate", "").strip()
-            end_date = exp.get("endDate", "").strip()
-            
-            user_profile[f"exp_{i}_company"] = company
-            user_profile[f"exp_{i}_title"] = position
-            user_profile[f"exp_{i}_location"] = location
-            user_profile[f"exp_{i}_description"] = description
-            user_profile[f"exp_{i}_start_date"] = start_date
-            user_profile[f"exp_{i}_end_date"] = end_date
-            
-            # Parse dates into components
-            if start_date:
-                start_parts = parse_date(start_date)
-                user_profile[f"exp_{i}_start_month"] = start_parts['month']
-                user_profile[f"exp_{i}_start_year"] = start_parts['year']
-            
-            if end_date:
-                end_parts = parse_date(end_date)
-                user_profile[f"exp_{i}_end_month"] = end_parts['month']
-                user_profile[f"exp_{i}_end_year"] = end_parts['year']
-            
-            logger.info(f"  exp_{i}: {company} - {position} ({start_date} to {end_date})")
+        flatten_section(unique_experiences, SECTION_GROUPS_BY_PREFIX["exp"], user_profile)
         
         # Current/Previous experience (now properly sorted)
         if len(unique_experiences) > 0:
@@ -264,80 +401,6 @@ def convert_profile_to_user_format(profile: ProfileData) -> dict:
     return user_profile
 
 
-class SmartFieldMatcher:
-    def __init__(self):
-        self.rules = self._build_enhanced_rules()
-        self.form_counters = {}
-        self.field_id_to_exp = {}
-        
-    def rule_based_match(self, label: str, field_id: str, form_id: str = "default") -> Tuple[Optional[str], float]:
-        """FIXED: Enhanced field grouping with better experience mapping"""
-        normalized = self.normalize_label(label)
-        field_type = detect_field_type(label, field_id)
-        
-        # Initialize form tracking
-        if form_id not in self.form_counters:
-            self.form_counters[form_id] = {
-                "exp_group_mapping": {},
-                "next_exp_index": 0
-            }
-        
-        # FIXED: Better experience group extraction
-        exp_group_match = re.search(r'workExperience-(\d+)', field_id)
-        if exp_group_match:
-            exp_group_id = int(exp_group_match.group(1))
-            
-            # FIXED: Map groups to sequential indices consistently
-            if exp_group_id not in self.form_counters[form_id]["exp_group_mapping"]:
-                seq_index = self.form_counters[form_id]["next_exp_index"]
-                self.form_counters[form_id]["exp_group_mapping"][exp_group_id] = seq_index
-                self.form_counters[form_id]["next_exp_index"] += 1
-                logger.info(f"🔗 New experience group: workExperience-{exp_group_id} -> exp_{seq_index}")
-            else:
-                seq_index = self.form_counters[form_id]["exp_group_mapping"][exp_group_id]
-            
-            # Handle different field types for experiences
-            if field_type in ['date_month', 'date_year']:
-                if 'start' in field_id.lower():
-                    suffix = 'start_month' if field_type == 'date_month' else 'start_year'
-                elif 'end' in field_id.lower():
-                    suffix = 'end_month' if field_type == 'date_month' else 'end_year'
-                else:
-                    return None, 0.0
-                
-                profile_key = f"exp_{seq_index}_{suffix}"
-                logger.info(f"🗓️ Date field mapping: {field_id} -> {profile_key}")
-                return profile_key, 0.95
-            
-            elif field_type == 'company':
-                profile_key = f"exp_{seq_index}_company"
-                logger.info(f"🏢 Company field: {label} -> {profile_key}")
-                return profile_key, 0.9
-                
-            elif field_type == 'title':
-                profile_key = f"exp_{seq_index}_title"
-                logger.info(f"💼 Title field: {label} -> {profile_key}")
-                return profile_key, 0.9
-                
-            elif field_type == 'location':
-                profile_key = f"exp_{seq_index}_location"
-                logger.info(f"📍 Location field: {label} -> {profile_key}")
-                return profile_key, 0.9
-                
-            elif field_type == 'description':
-                profile_key = f"exp_{seq_index}_description"
-                logger.info(f"📝 Description field: {label} -> {profile_key}")
-                return profile_key, 0.9
-        
-        # Handle non-experience fields
-        for pattern, profile_key in self.rules.items():
-            if pattern in normalized:
-                logger.info(f"📋 Rule match: {label} -> {profile_key}")
-                return profile_key, 0.9
-        
-        return None, 0.0
-
-
 def parse_date(date_str: str) -> Dict[str, str]:
     """IMPROVED: More robust date parsing"""
     if not date_str:
@@ -452,58 +515,32 @@ class SmartFieldMatcher:
         # Initialize form tracking
         if form_id not in self.form_counters:
             self.form_counters[form_id] = {
-                "exp_group_mapping": {},  # Maps workExperience-X to sequential index
-                "next_exp_index": 0
+                "group_mapping": {group.prefix: {} for group in SECTION_GROUPS},  # Maps e.g. workExperience-X to sequential index
+                "next_index": {group.prefix: 0 for group in SECTION_GROUPS}
             }
+        counters = self.form_counters[form_id]
         
-        # Extract workExperience group ID
-        exp_group_match = re.search(r'workExperience-(\d+)', field_id)
-        if exp_group_match:
-            exp_group_id = int(exp_group_match.group(1))
+        # Fields inside a repeated section map deterministically to that entry
+        for group in SECTION_GROUPS:
+            group_match = group.id_pattern.search(field_id)
+            if not group_match:
+                continue
+            group_id = int(group_match.group(1))
             
-            # Map this group to sequential index if not seen before
-            if exp_group_id not in self.form_counters[form_id]["exp_group_mapping"]:
-                seq_index = self.form_counters[form_id]["next_exp_index"]
-                self.form_counters[form_id]["exp_group_mapping"][exp_group_id] = seq_index
-                self.form_counters[form_id]["next_exp_index"] += 1
-            else:
-                seq_index = self.form_counters[form_id]["exp_group_mapping"][exp_group_id]
+            mapping = counters["group_mapping"][group.prefix]
+            if group_id not in mapping:
+                mapping[group_id] = counters["next_index"][group.prefix]
+                counters["next_index"][group.prefix] += 1
+                logger.info(f"🔗 New {group.prefix} group: {group_match.group(0)} -> {group.prefix}_{mapping[group_id]}")
+            seq_index = mapping[group_id]
             
-            # Handle date fields
-            if field_type in ['date_month', 'date_year']:
-                if 'start' in field_id.lower():
-                    if field_type == 'date_month':
-                        profile_key = f"exp_{seq_index}_start_month"
-                    else:
-                        profile_key = f"exp_{seq_index}_start_year"
-                elif 'end' in field_id.lower():
-                    if field_type == 'date_month':
-                        profile_key = f"exp_{seq_index}_end_month" 
-                    else:
-                        profile_key = f"exp_{seq_index}_end_year"
-                else:
-                    return None, 0.0
-                
-                logger.info(f"🗓️ Date field mapping: {field_id} -> {profile_key}")
+            profile_key = match_section_field(group, seq_index, label, field_id)
+            if profile_key:
+                logger.info(f"🧩 Group field: {label} -> {profile_key}")
                 return profile_key, 0.95
-            
-            # Handle other experience fields
-            elif field_type == 'company':
-                profile_key = f"exp_{seq_index}_company"
-                logger.info(f"🏢 Company field: {label} -> {profile_key}")
-                return profile_key, 0.9
-                
-            elif field_type == 'title':
-                profile_key = f"exp_{seq_index}_title"
-                logger.info(f"💼 Title field: {label} -> {profile_key}")
-                return profile_key, 0.9
-                
-            elif field_type == 'location':
-                profile_key = f"exp_{seq_index}_location"
-                logger.info(f"📍 Location field: {label} -> {profile_key}")
-                return profile_key, 0.9
+            return None, 0.0
         
-        # Direct rule matches for non-experience fields
+        # Direct rule matches for non-group fields
         for pattern, profile_key in self.rules.items():
             if pattern in normalized:
                 return profile_key, 0.9
@@ -581,22 +618,112 @@ def get_profile_value(key: str, user_profile: dict, label: str = "") -> str:
     
     return ""
 
+# ================== AUTOFILL SESSIONS ================== #
+SESSION_TTL_SECONDS = 30 * 60
+MAX_SESSIONS = 500
+
+
+@dataclass
+class AutofillSession:
+    """Mapping state shared by every page of one multi-page application"""
+    session_id: str
+    profile_hash: str
+    user_profile: dict
+    matcher: "SmartFieldMatcher"
+    label_plan: Dict[str, str] = dataclass_field(default_factory=dict)  # normalized label -> profile key ("none" = skip)
+    created_at: float = dataclass_field(default_factory=time.time)
+    last_used: float = dataclass_field(default_factory=time.time)
+    pages: int = 0
+
+
+class AutofillSessionStore:
+    """In-process session store with idle TTL and a size cap"""
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS, max_sessions: int = MAX_SESSIONS):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, AutofillSession] = {}
+
+    @staticmethod
+    def _profile_hash(profile: ProfileData) -> str:
+        return hashlib.sha1(json.dumps(profile.dict(), sort_keys=True, default=str).encode()).hexdigest()
+
+    def _evict_expired(self):
+        now = time.time()
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_used > self.ttl_seconds]
+        for sid in expired:
+            del self._sessions[sid]
+        # Drop the least recently used sessions beyond the cap
+        if len(self._sessions) > self.max_sessions:
+            by_age = sorted(self._sessions.values(), key=lambda s: s.last_used)
+            for session in by_age[:len(self._sessions) - self.max_sessions]:
+                del self._sessions[session.session_id]
+
+    def get_or_create(self, session_id: str, profile: ProfileData) -> AutofillSession:
+        self._evict_expired()
+        profile_hash = self._profile_hash(profile)
+        session = self._sessions.get(session_id)
+
+        if session is None:
+            session = AutofillSession(
+                session_id=session_id,
+                profile_hash=profile_hash,
+                user_profile=convert_profile_to_user_format(profile),
+                matcher=SmartFieldMatcher(),
+            )
+            self._sessions[session_id] = session
+            logger.info(f"🆕 Autofill session {session_id}")
+        elif session.profile_hash != profile_hash:
+            # Values changed but label -> key decisions and group mappings still hold
+            session.user_profile = convert_profile_to_user_format(profile)
+            session.profile_hash = profile_hash
+            logger.info(f"🔄 Profile changed, re-flattened session {session_id}")
+
+        session.last_used = time.time()
+        session.pages += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[AutofillSession]:
+        self._evict_expired()
+        return self._sessions.get(session_id)
+
+    def drop(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+autofill_sessions = AutofillSessionStore()
+
 # ================== MAIN AUTOFILL FUNCTION (FIXED) ================== #
 async def smart_autofill(request: AutofillRequest) -> Dict[str, str]:
     """FIXED: Smart autofill with proper field type handling"""
     logger.info(f"🔍 Processing {len(request.fields)} fields")
     start_time = time.time()
     
-    user_profile = convert_profile_to_user_format(request.profile)
     results = {}
-    stats = {"memory": 0, "rules": 0, "ml": 0, "llm": 0, "unmatched": 0}
-    
-    # Create form-specific matcher
-    form_signature = "|".join([f"{f.field_id}:{f.label}" for f in request.fields])
-    form_id = f"form_{hash(form_signature)}"
-    matcher = SmartFieldMatcher()
+    stats = {"memory": 0, "session": 0, "rules": 0, "fuzzy": 0, "ml": 0, "llm": 0, "answers": 0, "unmatched": 0}
+    
+    if request.session_id:
+        # Multi-page form: reuse the flattened profile, group mappings and label plan
+        session = autofill_sessions.get_or_create(request.session_id, request.profile)
+        user_profile = session.user_profile
+        matcher = session.matcher
+        form_id = f"session_{session.session_id}"
+        label_plan = session.label_plan
+    else:
+        # Create form-specific matcher
+        user_profile = convert_profile_to_user_format(request.profile)
+        form_signature = "|".join([f"{f.field_id}:{f.label}" for f in request.fields])
+        form_id = f"form_{hash(form_signature)}"
+        matcher = SmartFieldMatcher()
+        label_plan = None
     
     logger.info(f"🆔 Processing form: {form_id}")
+    planned_ids = set()  # fields settled by the session plan, never re-classified
+    grouped_ids = set()  # repeated-section fields the group rules could not map
+    question_fields = []  # long-answer questions, handled by the screening answer stage
     
     for field in request.fields:
         if not field.label:
@@ -608,13 +735,27 @@ async def smart_autofill(request: AutofillRequest) -> Dict[str, str]:
         
         logger.info(f"🔎 Processing field: '{label}' (ID: {field_id}, Type: {field_type})")
 
+        # Grouped fields share labels across entries, so label memory would copy one entry everywhere
+        in_group = find_section_group(field_id) is not None
+
         # Memory check with type validation
-        if (cached := get_from_memory(label, field_type)):
+        if not in_group and (cached := get_from_memory(label, field_type)):
             results[field_id] = cached
             stats["memory"] += 1
             logger.info(f"✅ Memory hit: {label} = {cached}")
             continue
 
+        # Labels already classified on an earlier page of this session
+        if label_plan is not None and not in_group and (planned_key := label_plan.get(normalize_text(label))):
+            planned_ids.add(field_id)
+            if planned_key == LONG_ANSWER_CATEGORY and not field.options:
+                question_fields.append(field)
+            elif planned_key != "none" and (value := get_profile_value(planned_key, user_profile, label)):
+                results[field_id] = value
+                stats["session"] += 1
+                logger.info(f"✅ Session plan: {label} -> {planned_key} = {value}")
+            continue
+
         # Rule-based matching
         profile_key, confidence = matcher.rule_based_match(label, field_id, form_id)
 
@@ -623,25 +764,80 @@ async def smart_autofill(request: AutofillRequest) -> Dict[str, str]:
             if value:
                 results[field_id] = value
                 stats["rules"] += 1
-                save_to_memory(label, value, field_type)
+                if not in_group:
+                    save_to_memory(label, value, field_type)
+                    if label_plan is not None:
+                        label_plan[normalize_text(label)] = profile_key
                 logger.info(f"✅ Rule match: {label} -> {profile_key} = {value}")
                 continue
 
+        if in_group:
+            # Global stages only know top-level keys: an entry's "Company" would get the current employer
+            grouped_ids.add(field_id)
+            logger.info(f"🧩 Group field left unmapped: {label}")
+            continue
+
         logger.info(f"❌ No match found for: {label}")
 
+    # Fuzzy n-gram matching before paying for an embedding
+    unresolved = [
+        f for f in request.fields
+        if f.field_id not in results and f.label and f.field_id not in planned_ids and f.field_id not in grouped_ids
+    ]
+    ml_fields = []
+    llm_fields = []
+    for field in unresolved:
+        category, confidence = fuzzy_matcher.match(field.label.strip())
+        if not category:
+            ml_fields.append(field)
+            continue
+        plan_label = label_plan is not None
+
+        if category == "none":
+            if plan_label:
+                label_plan[normalize_text(field.label.strip())] = category
+            logger.info(f"🚫 Fuzzy skip: {field.label} ({confidence:.2f})")
+            continue
+
+        if category == LONG_ANSWER_CATEGORY and not field.options:
+            if plan_label:
+                label_plan[normalize_text(field.label.strip())] = category
+            question_fields.append(field)
+            continue
+
+        value = get_profile_value(category, user_profile, field.label)
+        if value:
+            results[field.field_id] = value
+            stats["fuzzy"] += 1
+            save_to_memory(field.label, value, detect_field_type(field.label, field.field_id))
+            # Only mappings that produced a value are planned; empty ones get retried on later pages
+            if plan_label:
+                label_plan[normalize_text(field.label.strip())] = category
+            logger.info(f"✅ Fuzzy match: {field.label} -> {category} ({confidence:.2f}) = {value}")
+        else:
+            # ML would land on the same category, so only the LLM can still help
+            llm_fields.append(field)
+
     # Process remaining fields with ML/LLM (existing logic)
-    ml_fields = [f for f in request.fields if f.field_id not in results and f.label]
     if ml_fields:
-        ml_results = await _process_ml_batch(ml_fields, user_profile)
+        ml_results = await _process_ml_batch(ml_fields, user_profile, label_plan, question_fields)
         results.update(ml_results)
         stats["ml"] = len(ml_results)
 
-    remaining_fields = [f for f in ml_fields if f.field_id not in results]
+    question_ids = {f.field_id for f in question_fields}
+    remaining_fields = llm_fields + [f for f in ml_fields if f.field_id not in results and f.field_id not in question_ids]
     if remaining_fields:
-        llm_results = await _process_llm_batch(remaining_fields, user_profile)
+        llm_results = await _process_llm_batch(remaining_fields, user_profile, label_plan)
         results.update(llm_results)
         stats["llm"] = len(llm_results)
+
+    if question_fields:
+        answers = await answer_screening_questions(question_fields, request.profile, request.job, answer_index, llm)
+        results.update(answers)
+        stats["answers"] = len(answers)
     
+    _resolve_field_options(request.fields, results)
+
     stats["unmatched"] = len(request.fields) - len(results)
 
     logger.info(f"📊 Final Stats: {stats} | Time: {time.time()-start_time:.2f}s")
@@ -649,8 +845,26 @@ async def smart_autofill(request: AutofillRequest) -> Dict[str, str]:
     
     return results
 
+# ================== OPTION RESOLUTION ================== #
+def _resolve_field_options(fields: List[Field], results: Dict[str, str]) -> None:
+    """Replace values for option fields with the matching option text, in one batched pass"""
+    option_fields = [f for f in fields if f.options and f.field_id in results]
+    if not option_fields:
+        return
+
+    choices = option_matcher.match_many([(results[f.field_id], f.options) for f in option_fields])
+    for field, choice in zip(option_fields, choices):
+        if choice:
+            logger.info(f"🔽 Option match: {field.label}: '{results[field.field_id]}' -> '{choice}'")
+            results[field.field_id] = choice
+        else:
+            # A value that is not one of the options cannot be selected anyway
+            logger.info(f"🔽 No option for {field.label}: '{results[field.field_id]}'")
+            del results[field.field_id]
+
 # ================== ML/LLM PROCESSING (UNCHANGED) ================== #
-async def _process_ml_batch(fields: List[Field], profile: dict) -> Dict[str, str]:
+async def _process_ml_batch(fields: List[Field], profile: dict, label_plan: Optional[Dict[str, str]] = None,
+                            question_fields: Optional[List[Field]] = None) -> Dict[str, str]:
     """Batch process fields using ML with proper embedding handling"""
     results = {}
     batch_labels = [f.label.strip() for f in fields]
@@ -670,17 +884,27 @@ async def _process_ml_batch(fields: List[Field], profile: dict) -> Dict[str, str
                 profile_key = max(set(top_matches), key=top_matches.count)
                 confidence = 0.7
 
+            plan_label = label_plan is not None
+
+            if profile_key == LONG_ANSWER_CATEGORY and question_fields is not None and not field.options:
+                if plan_label:
+                    label_plan[normalize_text(field.label.strip())] = profile_key
+                question_fields.append(field)
+                continue
+
             value = get_profile_value(profile_key, profile, field.label)
             if confidence > 0.5 and value:
                 results[field.field_id] = value
                 save_to_memory(field.label, value)
+                if plan_label:
+                    label_plan[normalize_text(field.label.strip())] = profile_key
 
         except Exception as e:
             logger.warning(f"ML processing failed for '{field.label}': {str(e)}")
 
     return results
 
-async def _process_llm_batch(fields: List[Field], profile: dict) -> Dict[str, str]:
+async def _process_llm_batch(fields: List[Field], profile: dict, label_plan: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """Process remaining fields with LLM guardrails"""
     results = {}
     semaphore = asyncio.Semaphore(5)
@@ -694,6 +918,9 @@ async def _process_llm_batch(fields: List[Field], profile: dict) -> Dict[str, st
                     timeout=4
                 )
                 if llm_key != "none" and (value := get_profile_value(llm_key, profile, label)):
+                    # "none" is also what a failed or timed-out call returns, so only values are planned
+                    if label_plan is not None:
+                        label_plan[normalize_text(label)] = llm_key
                     return field.field_id, value
             except Exception:
                 pass
@@ -0,0 +1,142 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List
+from urllib.parse import urlsplit
+
+from src.langchain.jd_cache import jd_cache
+from src.langchain.jd_parser import parse_job_posting
+from src.langchain.job_scraper import fetch_job_description
+from src.langchain.scrape_cache import canonicalize_url
+
+
+@dataclass
+class BatchScrapeConfig:
+    """Limits for bulk imports; the browser pool still caps concurrent pages on its own"""
+    max_concurrency: int = int(os.getenv("BATCH_SCRAPE_CONCURRENCY", "8"))
+    per_domain_concurrency: int = 2
+    per_domain_interval_seconds: float = float(os.getenv("BATCH_SCRAPE_DOMAIN_INTERVAL", "1.0"))  # between request starts
+    max_urls: int = 100
+
+
+batch_config = BatchScrapeConfig()
+
+
+class DomainLimiter:
+    """Per-domain politeness: bounded concurrency and a minimum gap between request starts"""
+
+    def __init__(self, concurrency: int, interval_seconds: float):
+        self.concurrency = max(1, concurrency)
+        self.interval = max(0.0, interval_seconds)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, domain: str):
+        semaphore = self._semaphores.setdefault(domain, asyncio.Semaphore(self.concurrency))
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+        async with semaphore:
+            async with lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_start.get(domain, 0.0) - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[domain] = loop.time() + self.interval
+            yield
+
+
+async def scrape_and_parse(url: str, use_cache: bool = True) -> Dict[str, Any]:
+    """What /scrape-job returns: structured data as-is, anything else through parse_job_posting"""
+    scraped = await fetch_job_description(url, use_cache=use_cache)
+    raw = scraped.get("raw") or ""
+    if scraped.get("structured"):
+        parsed = dict(scraped)
+    else:
+        # parse_job_posting may call the LLM; keep the event loop free for the other scrapes
+        parsed = await asyncio.to_thread(parse_job_posting, scraped)
+    # The same role copied from another board is flagged, not re-parsed from its copy
+    matches = await asyncio.to_thread(jd_cache.find_duplicates, raw)
+    if matches:
+        parsed["duplicate_of"] = matches[0].as_dict()
+    # Remember where this posting was seen so later copies and tracker entries link to it
+    await asyncio.to_thread(jd_cache.record, raw, url=url, title=parsed.get("title", ""), company=scraped.get("company", ""))
+    return parsed
+
+
+def dedupe_urls(urls: List[str]) -> tuple:
+    """([(index, url)] unique by canonical URL in first-seen order, [duplicate entries]).
+
+    Indexes are positions in the request's urls, so every event maps back to its input.
+    """
+    seen: Dict[str, int] = {}
+    unique, duplicates = [], []
+    for index, url in enumerate(urls):
+        if not url or not url.strip():
+            continue
+        canonical = canonicalize_url(url)
+        if canonical in seen:
+            duplicates.append({"index": index, "url": url, "same_as": seen[canonical]})
+            continue
+        seen[canonical] = index
+        unique.append((index, url.strip()))
+    return unique, duplicates
+
+
+async def scrape_jobs(urls: List[str], parse: bool = True, use_cache: bool = True,
+                      config: BatchScrapeConfig = None) -> AsyncIterator[Dict[str, Any]]:
+    """Scrape many job URLs, yielding one event per URL in completion order.
+
+    URLs are de-duplicated by canonical form, run under a global concurrency cap
+    and per-domain limits, and reuse the single-URL tiers, cache and browser pool.
+    Closing the generator (the client went away) cancels the scrapes still queued or running.
+    """
+    config = config or batch_config
+    unique, duplicates = dedupe_urls(urls)
+    skipped = [{"index": index, "url": url} for index, url in unique[config.max_urls:]]
+    unique = unique[:config.max_urls]
+    yield {"event": "queued", "total": len(unique), "duplicates": duplicates, "skipped": skipped}
+
+    global_limit = asyncio.Semaphore(max(1, config.max_concurrency))
+    domains = DomainLimiter(config.per_domain_concurrency, config.per_domain_interval_seconds)
+
+    async def run(index: int, url: str):
+        domain = urlsplit(canonicalize_url(url)).netloc
+        # Domain slot first, so one busy site queues on itself instead of holding global slots
+        async with domains.slot(domain), global_limit:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                if parse:
+                    job = await scrape_and_parse(url, use_cache=use_cache)
+                else:
+                    job = await fetch_job_description(url, use_cache=use_cache)
+            except Exception as e:
+                return {"event": "scrape_failed", "index": index, "url": url, "error": str(e)}
+            return {
+                "event": "scraped",
+                "index": index,
+                "url": url,
+                "seconds": round(loop.time() - started, 2),
+                "job": job,
+            }
+
+    tasks = [asyncio.create_task(run(index, url)) for index, url in unique]
+    succeeded, failed = 0, 0
+    try:
+        for completed in asyncio.as_completed(tasks):
+            event = await completed
+            if event["event"] == "scraped":
+                succeeded += 1
+            else:
+                failed += 1
+            yield event
+    finally:
+        # Reached early only when the consumer stopped reading; an LLM parse already
+        # running in a worker thread finishes on its own, but nothing new starts
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    yield {"event": "done", "succeeded": succeeded, "failed": failed}
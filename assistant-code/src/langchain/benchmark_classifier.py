@@ -0,0 +1,275 @@
+import argparse
+import time
+import warnings
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+
+from src.langchain.train_classifier import training_data
+
+# Sweep defaults. Production serving is kNN, k=3, all-MiniLM-L6-v2, float32
+# (see autofill.EnhancedClassifier).
+DEFAULT_MODELS = ["all-MiniLM-L6-v2", "paraphrase-MiniLM-L3-v2", "all-mpnet-base-v2"]
+DEFAULT_K_VALUES = [1, 3, 5, 7]
+DEFAULT_QUANTIZATIONS = ["float32", "float16", "int8"]
+
+
+@dataclass
+class BenchmarkResult:
+    classifier: str
+    k: int
+    model: str
+    quantization: str
+    accuracy: float
+    accuracy_std: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    batch_throughput: float  # labels per second
+    index_bytes: int
+    model_bytes: int
+
+
+# ================== QUANTIZATION ================== #
+class EmbeddingQuantizer:
+    """Scalar quantizer for L2-normalized embeddings, calibrated on the training fold"""
+
+    def __init__(self, level: str):
+        if level not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unsupported quantization level: {level}")
+        self.level = level
+        self.scale = None
+
+    def fit(self, X: np.ndarray) -> "EmbeddingQuantizer":
+        if self.level == "int8":
+            # Symmetric per-dimension range so dot products stay centred on zero
+            self.scale = np.maximum(np.abs(X).max(axis=0), 1e-6) / 127.0
+        return self
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        if self.level == "float16":
+            return X.astype(np.float16)
+        if self.level == "int8":
+            return np.clip(np.round(X / self.scale), -127, 127).astype(np.int8)
+        return X.astype(np.float32)
+
+    def dequantize(self, Xq: np.ndarray) -> np.ndarray:
+        if self.level == "int8":
+            return Xq.astype(np.float32) * self.scale
+        return Xq.astype(np.float32)
+
+
+# ================== CLASSIFIERS ================== #
+class KNNFieldClassifier:
+    """Cosine kNN with the same voting rule as autofill.EnhancedClassifier"""
+
+    def __init__(self, k: int, quantization: str):
+        self.k = k
+        self.quantizer = EmbeddingQuantizer(quantization)
+        self.index = None
+        self.categories = None
+
+    def fit(self, X: np.ndarray, y: List[str]) -> "KNNFieldClassifier":
+        X = _normalize(X)
+        self.quantizer.fit(X)
+        self.index = self.quantizer.transform(X)
+        self.categories = np.asarray(y)
+        return self
+
+    def predict(self, X: np.ndarray) -> List[str]:
+        Q = self.quantizer.transform(_normalize(X))
+        if self.quantizer.level == "int8":
+            # Both sides share the per-dimension scale, so fold it into the query once
+            scores = (Q.astype(np.float32) * self.quantizer.scale ** 2) @ self.index.astype(np.float32).T
+        else:
+            scores = Q.astype(np.float32) @ self.index.astype(np.float32).T
+        k = min(self.k, self.index.shape[0])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        predictions = []
+        for row in top:
+            matches = list(self.categories[row])
+            predictions.append(max(set(matches), key=matches.count))
+        return predictions
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.index.nbytes)
+
+
+class LogisticFieldClassifier:
+    """LogisticRegression as in train_classifier, with quantized weights"""
+
+    def __init__(self, quantization: str):
+        self.quantizer = EmbeddingQuantizer(quantization)
+        self.clf = LogisticRegression(max_iter=1000, random_state=42)
+        self.coef = None
+
+    def fit(self, X: np.ndarray, y: List[str]) -> "LogisticFieldClassifier":
+        self.clf.fit(X, y)
+        self.quantizer.fit(self.clf.coef_)
+        self.coef = self.quantizer.transform(self.clf.coef_)
+        return self
+
+    def predict(self, X: np.ndarray) -> List[str]:
+        scores = X.astype(np.float32) @ self.quantizer.dequantize(self.coef).T + self.clf.intercept_
+        return list(self.clf.classes_[np.argmax(scores, axis=1)])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.coef.nbytes + self.clf.intercept_.nbytes)
+
+
+def _normalize(X: np.ndarray) -> np.ndarray:
+    X = np.asarray(X, dtype=np.float32)
+    return X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+
+
+def _build_classifier(kind: str, k: int, quantization: str):
+    if kind == "knn":
+        return KNNFieldClassifier(k, quantization)
+    if kind == "logistic":
+        return LogisticFieldClassifier(quantization)
+    raise ValueError(f"Unknown classifier type: {kind}")
+
+
+def _model_bytes(model: SentenceTransformer) -> int:
+    return int(sum(p.numel() * p.element_size() for p in model.parameters()))
+
+
+# ================== BENCHMARK ================== #
+def benchmark_configuration(
+    kind: str,
+    k: int,
+    model_name: str,
+    model: SentenceTransformer,
+    quantization: str,
+    texts: List[str],
+    labels: List[str],
+    embeddings: np.ndarray,
+    folds: List[Tuple[np.ndarray, np.ndarray]],
+    latency_samples: int = 50,
+) -> BenchmarkResult:
+    """Cross-validated accuracy plus serving latency for one configuration"""
+    labels_arr = np.asarray(labels)
+    fold_accuracies = []
+    classifier = None
+
+    for train_idx, test_idx in folds:
+        classifier = _build_classifier(kind, k, quantization).fit(embeddings[train_idx], list(labels_arr[train_idx]))
+        predictions = classifier.predict(embeddings[test_idx])
+        fold_accuracies.append(float(np.mean(np.asarray(predictions) == labels_arr[test_idx])))
+
+    # Serving latency: encode + predict for one label at a time, as _process_ml_batch
+    # would see it for a single-field page, using the last fold's model
+    sample = texts[:latency_samples]
+    latencies = []
+    for text in sample:
+        start = time.perf_counter()
+        classifier.predict(model.encode([text]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Batch throughput: one encode + predict call over every label
+    start = time.perf_counter()
+    classifier.predict(model.encode(texts))
+    batch_seconds = time.perf_counter() - start
+
+    return BenchmarkResult(
+        classifier=kind,
+        k=k if kind == "knn" else 0,
+        model=model_name,
+        quantization=quantization,
+        accuracy=round(float(np.mean(fold_accuracies)), 4),
+        accuracy_std=round(float(np.std(fold_accuracies)), 4),
+        latency_p50_ms=round(float(np.percentile(latencies, 50)), 3),
+        latency_p99_ms=round(float(np.percentile(latencies, 99)), 3),
+        batch_throughput=round(len(texts) / batch_seconds, 1),
+        index_bytes=classifier.nbytes,
+        model_bytes=_model_bytes(model),
+    )
+
+
+def run_benchmark(
+    models: List[str] = None,
+    k_values: List[int] = None,
+    quantizations: List[str] = None,
+    classifiers: List[str] = None,
+    n_splits: int = 5,
+    include_none: bool = True,
+    latency_samples: int = 50,
+) -> pd.DataFrame:
+    """Sweep classifier type, k, embedding model and quantization over CV splits of training_data"""
+    models = models or DEFAULT_MODELS
+    k_values = k_values or DEFAULT_K_VALUES
+    quantizations = quantizations or DEFAULT_QUANTIZATIONS
+    classifiers = classifiers or ["knn", "logistic"]
+
+    df = pd.DataFrame(training_data, columns=['label', 'category'])
+    if not include_none:
+        df = df[df['category'] != 'none']
+    texts = df['label'].tolist()
+    labels = df['category'].tolist()
+
+    print(f"📊 Benchmark data: {len(df)} samples, {df['category'].nunique()} categories, {n_splits} folds")
+
+    # Categories with fewer members than n_splits only appear in some test folds
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        folds = list(splitter.split(np.zeros(len(labels)), labels))
+
+    results: List[BenchmarkResult] = []
+    for model_name in models:
+        print(f"🔄 Loading embedding model {model_name}...")
+        model = SentenceTransformer(model_name)
+        # Embeddings are computed once per model; folds only re-fit the classifier
+        embeddings = np.asarray(model.encode(texts), dtype=np.float32)
+
+        for kind in classifiers:
+            for k in (k_values if kind == "knn" else [0]):
+                for quantization in quantizations:
+                    result = benchmark_configuration(
+                        kind, k, model_name, model, quantization,
+                        texts, labels, embeddings, folds, latency_samples
+                    )
+                    results.append(result)
+                    print(
+                        f"  {kind:<8} k={result.k:<2} {quantization:<7} "
+                        f"acc={result.accuracy:.3f}±{result.accuracy_std:.3f} "
+                        f"p50={result.latency_p50_ms:.2f}ms p99={result.latency_p99_ms:.2f}ms "
+                        f"batch={result.batch_throughput:.0f}/s index={result.index_bytes}B"
+                    )
+
+        del model
+
+    return pd.DataFrame([asdict(r) for r in results])
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark field classifier configurations")
+    arg_parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    arg_parser.add_argument("--k", nargs="+", type=int, default=DEFAULT_K_VALUES)
+    arg_parser.add_argument("--quantization", nargs="+", default=DEFAULT_QUANTIZATIONS)
+    arg_parser.add_argument("--classifiers", nargs="+", default=["knn", "logistic"])
+    arg_parser.add_argument("--folds", type=int, default=5)
+    arg_parser.add_argument("--exclude-none", action="store_true", help="Drop 'none' labels like train_classifier does")
+    arg_parser.add_argument("--output", default="classifier_benchmark.csv")
+    args = arg_parser.parse_args()
+
+    report = run_benchmark(
+        models=args.models,
+        k_values=args.k,
+        quantizations=args.quantization,
+        classifiers=args.classifiers,
+        n_splits=args.folds,
+        include_none=not args.exclude_none,
+    )
+
+    print("\n🏁 Best configurations by accuracy, then p99 latency:")
+    print(report.sort_values(["accuracy", "latency_p99_ms"], ascending=[False, True]).head(10).to_string(index=False))
+
+    report.to_csv(args.output, index=False)
+    print(f"✅ Results saved to {args.output}")
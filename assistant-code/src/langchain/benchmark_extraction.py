@@ -0,0 +1,129 @@
+import argparse
+import glob
+import os
+import re
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from src.langchain.html_extractor import extract_page
+from src.langchain.job_scraper import extract_main_text, extract_company_name, extract_from_meta
+from src.langchain.jsonld_extractor import find_jsonld_posting
+from src.langchain.scrape_cache import scrape_cache
+from src.langchain.site_registry import site_registry, SiteRule
+
+
+@dataclass
+class PageBenchmark:
+    page: str
+    size_kb: float
+    bs4_p50_ms: float
+    lxml_p50_ms: float
+    speedup: float
+    text_overlap: float  # token Jaccard between the two main-text outputs
+    same_title: bool
+    same_jsonld: bool
+
+
+# ================== EXTRACTION PATHS ================== #
+def extract_with_beautifulsoup(html: str, rule: Optional[SiteRule]) -> Dict[str, object]:
+    """The html.parser path job_scraper used before the lxml engine"""
+    soup = BeautifulSoup(html, 'html.parser')
+    has_posting = find_jsonld_posting(soup) is not None
+    title = soup.title.string.strip() if soup.title and soup.title.string else "Untitled"
+    company = extract_company_name(soup) or extract_from_meta(soup, "og:site_name") or "Unknown Company"
+    text = None
+    for selector in (rule.description if rule else []):
+        node = soup.select_one(selector)
+        if node:
+            text = node.get_text(separator="\n", strip=True)
+            break
+    return {"title": title, "company": company, "text": text if text is not None else extract_main_text(soup), "jsonld": has_posting}
+
+
+def extract_with_lxml(html: str, rule: Optional[SiteRule]) -> Dict[str, object]:
+    content = extract_page(html, rule)
+    has_posting = any("JobPosting" in str(block) for block in content.jsonld)
+    return {"title": content.title or "Untitled", "company": content.company or "Unknown Company", "text": content.main_text, "jsonld": has_posting}
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r"\w+", (text or "").lower()))
+
+
+def _time(fn: Callable, html: str, rule: Optional[SiteRule], repeat: int) -> Tuple[float, Dict[str, object]]:
+    latencies, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(html, rule)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(latencies, 50)), result
+
+
+# ================== PAGES ================== #
+def load_pages(pages_dir: Optional[str], from_cache: bool, site: Optional[str]) -> List[Tuple[str, str, Optional[SiteRule]]]:
+    """(name, html, site rule) from a directory of saved .html files and/or the scrape cache snapshots"""
+    site_rule = next((r for r in site_registry.rules if r.name == site), None) if site else None
+    pages = []
+    if pages_dir:
+        for path in sorted(glob.glob(os.path.join(pages_dir, "*.htm*"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read(), site_rule))
+    if from_cache:
+        for snapshot in scrape_cache.snapshots():
+            pages.append((snapshot["url"], snapshot["html"], site_rule or site_registry.rule_for(snapshot["url"])))
+    return pages
+
+
+def run_benchmark(pages: List[Tuple[str, str, Optional[SiteRule]]], repeat: int = 5) -> pd.DataFrame:
+    results: List[PageBenchmark] = []
+    for name, html, rule in pages:
+        bs4_ms, bs4_result = _time(extract_with_beautifulsoup, html, rule, repeat)
+        lxml_ms, lxml_result = _time(extract_with_lxml, html, rule, repeat)
+        a, b = _tokens(bs4_result["text"]), _tokens(lxml_result["text"])
+        result = PageBenchmark(
+            page=name,
+            size_kb=round(len(html.encode("utf-8")) / 1024, 1),
+            bs4_p50_ms=round(bs4_ms, 2),
+            lxml_p50_ms=round(lxml_ms, 2),
+            speedup=round(bs4_ms / lxml_ms, 1) if lxml_ms else 0.0,
+            text_overlap=round(len(a & b) / len(a | b), 3) if a | b else 1.0,
+            same_title=bs4_result["title"] == lxml_result["title"],
+            same_jsonld=bs4_result["jsonld"] == lxml_result["jsonld"],
+        )
+        results.append(result)
+        print(
+            f"  {name[:60]:<60} {result.size_kb:>8.1f}KB "
+            f"bs4={result.bs4_p50_ms:.1f}ms lxml={result.lxml_p50_ms:.1f}ms "
+            f"x{result.speedup} overlap={result.text_overlap:.2f}"
+        )
+    return pd.DataFrame([asdict(r) for r in results])
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark the lxml extraction engine against the BeautifulSoup path")
+    arg_parser.add_argument("--pages", help="Directory of saved .html pages")
+    arg_parser.add_argument("--from-cache", action="store_true", help="Also use the scrape cache HTML snapshots")
+    arg_parser.add_argument("--site", help="Apply this site registry rule to --pages (e.g. workday)")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--output", default="extraction_benchmark.csv")
+    args = arg_parser.parse_args()
+
+    saved_pages = load_pages(args.pages, args.from_cache, args.site)
+    if not saved_pages:
+        arg_parser.error("No pages found; pass --pages DIR and/or --from-cache")
+
+    print(f"📊 Benchmarking {len(saved_pages)} pages, {args.repeat} runs each")
+    report = run_benchmark(saved_pages, repeat=args.repeat)
+
+    print(
+        f"\n🏁 Median speedup x{report['speedup'].median():.1f}, "
+        f"total bs4={report['bs4_p50_ms'].sum():.0f}ms lxml={report['lxml_p50_ms'].sum():.0f}ms, "
+        f"median text overlap {report['text_overlap'].median():.2f}"
+    )
+    report.to_csv(args.output, index=False)
+    print(f"✅ Results saved to {args.output}")
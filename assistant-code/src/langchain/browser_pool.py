@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+@dataclass
+class BrowserPoolConfig:
+    """Limits for the shared scraping browser"""
+    max_contexts: int = int(os.getenv("SCRAPER_MAX_CONTEXTS", "4"))  # concurrent scrapes
+    max_uses_per_context: int = 25  # recycle contexts so memory and state don't build up
+    headless: bool = True
+    user_agent: str = USER_AGENT
+
+
+class _PooledContext:
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.uses = 0
+
+
+class BrowserPool:
+    """One long-lived Chromium shared by all scrapes.
+
+    Leases hand out a fresh page inside a pooled browser context; at most
+    max_contexts leases run at once. Contexts are cleared between leases and
+    replaced after a failed lease, when a site left localStorage behind, or after
+    max_uses_per_context; a disconnected browser is relaunched on the next lease.
+    """
+
+    def __init__(self, config: BrowserPoolConfig = None):
+        self.config = config or BrowserPoolConfig()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._idle: List[_PooledContext] = []
+        self._semaphore = asyncio.Semaphore(self.config.max_contexts)
+        self._lock = asyncio.Lock()
+        self.stats = {"launches": 0, "leases": 0, "contexts_created": 0, "contexts_recycled": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self):
+        async with self._lock:
+            if self.running:
+                return
+            await self._close_browser()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.config.headless)
+            self.stats["launches"] += 1
+            logger.info("🌐 Scraper browser launched")
+
+    async def stop(self):
+        async with self._lock:
+            await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            logger.info("🌐 Scraper browser stopped")
+
+    async def _close_browser(self):
+        for pooled in self._idle:
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+        self._idle.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    async def _acquire_context(self) -> _PooledContext:
+        # Health check: a crashed or disconnected browser is relaunched here
+        if not self.running:
+            await self.start()
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.uses < self.config.max_uses_per_context:
+                return pooled
+            await self._retire(pooled)
+        context = await self._browser.new_context(user_agent=self.config.user_agent)
+        self.stats["contexts_created"] += 1
+        return _PooledContext(context)
+
+    async def _release_context(self, pooled: _PooledContext, healthy: bool):
+        if not healthy or not self.running or pooled.uses >= self.config.max_uses_per_context:
+            await self._retire(pooled)
+            return
+        try:
+            # Isolation between scrapes: nothing carries over but the warm process.
+            # sessionStorage went with the closed page; localStorage can only be
+            # cleared per origin from inside a page, so a context holding any is replaced.
+            await pooled.context.clear_cookies()
+            state = await pooled.context.storage_state()
+        except Exception:
+            await self._retire(pooled)
+            return
+        if state.get("origins"):
+            await self._retire(pooled)
+            return
+        self._idle.append(pooled)
+
+    async def _retire(self, pooled: _PooledContext):
+        self.stats["contexts_recycled"] += 1
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Lease a new page; waits while max_contexts scrapes are already running"""
+        async with self._semaphore:
+            pooled = await self._acquire_context()
+            pooled.uses += 1
+            self.stats["leases"] += 1
+            page = await pooled.context.new_page()
+            healthy = True
+            try:
+                yield page
+            except Exception:
+                # A page error can leave the context half-navigated or wedged; don't reuse it
+                healthy = False
+                raise
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    healthy = False
+                await self._release_context(pooled, healthy)
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "idle_contexts": len(self._idle),
+            "max_contexts": self.config.max_contexts,
+            **self.stats,
+        }
+
+
+browser_pool = BrowserPool()
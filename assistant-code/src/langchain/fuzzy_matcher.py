@@ -0,0 +1,136 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Common abbreviations seen on application forms, expanded before comparison
+ABBREVIATIONS = {
+    "addr": "address",
+    "no": "number",
+    "num": "number",
+    "#": "number",
+    "tel": "telephone",
+    "mob": "mobile",
+    "org": "organization",
+    "univ": "university",
+    "yrs": "years",
+    "exp": "experience",
+    "dob": "date of birth",
+    "url": "url",
+}
+
+# Filler words that never change which profile key a label refers to
+STOPWORDS = {"your", "the", "a", "an", "please", "enter", "optional", "required", "of"}
+
+
+@lru_cache(maxsize=4096)
+def normalize_text(text: str, expand_abbreviations: bool = True) -> str:
+    """Lowercase, drop filler/punctuation and expand abbreviations.
+
+    Option values are normalized without expansion: "No" on a Yes/No
+    dropdown is an answer, not "number".
+    """
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r'\((optional|required)\)', ' ', text)
+    text = text.replace('#', ' # ')
+    # "E-mail" and "e.mail" should compare equal to "email"
+    text = re.sub(r'(?<=\w)[-.](?=\w)', '', text)
+    text = re.sub(r'[^\w#\s]', ' ', text)
+    tokens = text.split()
+    if expand_abbreviations:
+        tokens = [ABBREVIATIONS.get(tok, tok) for tok in tokens]
+    tokens = [tok for tok in tokens if tok not in STOPWORDS]
+    return " ".join(tokens)
+
+
+@lru_cache(maxsize=4096)
+def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    """Character n-grams of a normalized string, padded so short words still produce grams"""
+    padded = f" {text} "
+    if len(padded) < n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+def ngram_similarity(a: str, b: str, n: int = 3) -> float:
+    """Dice coefficient over character n-grams of two normalized strings"""
+    grams_a, grams_b = char_ngrams(a, n), char_ngrams(b, n)
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def token_set_ratio(a: str, b: str) -> float:
+    """1.0 when both strings use the same words regardless of order/duplicates"""
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return 2 * len(tokens_a & tokens_b) / (len(tokens_a) + len(tokens_b))
+
+
+class FuzzyLabelMatcher:
+    """Cheap fuzzy stage between rule matching and embeddings.
+
+    Keeps an inverted character n-gram index over the normalized training labels,
+    so a lookup only scores labels that share at least one n-gram with the query.
+    """
+
+    def __init__(self, n: int = 3, threshold: float = 0.82, margin: float = 0.05):
+        self.n = n
+        self.threshold = threshold
+        self.margin = margin
+        self.labels: List[str] = []
+        self.categories: List[str] = []
+        self.gram_counts: List[int] = []
+        self.exact: Dict[str, str] = {}
+        self.index: Dict[str, List[int]] = defaultdict(list)
+
+    def load_training_data(self, training_data):
+        for label, category in training_data:
+            normalized = normalize_text(label)
+            if not normalized or normalized in self.exact:
+                continue
+            self.exact[normalized] = category
+            idx = len(self.labels)
+            self.labels.append(normalized)
+            self.categories.append(category)
+            grams = char_ngrams(normalized, self.n)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.index[gram].append(idx)
+
+    def match(self, label: str) -> Tuple[Optional[str], float]:
+        """Return (category, confidence) or (None, best_score) when not confident"""
+        normalized = normalize_text(label)
+        if not normalized:
+            return None, 0.0
+
+        if normalized in self.exact:
+            return self.exact[normalized], 1.0
+
+        grams = char_ngrams(normalized, self.n)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for idx in self.index.get(gram, ()):
+                shared[idx] += 1
+        if not shared:
+            return None, 0.0
+
+        # Best score per category, so near-ties between categories can be rejected
+        best_by_category: Dict[str, float] = {}
+        for idx, overlap in shared.items():
+            score = 2 * overlap / (len(grams) + self.gram_counts[idx])
+            score = max(score, token_set_ratio(normalized, self.labels[idx]))
+            category = self.categories[idx]
+            if score > best_by_category.get(category, 0.0):
+                best_by_category[category] = score
+
+        ranked = sorted(best_by_category.items(), key=lambda item: item[1], reverse=True)
+        category, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        if score >= self.threshold and score - runner_up >= self.margin:
+            return category, round(score, 3)
+        return None, round(score, 3)
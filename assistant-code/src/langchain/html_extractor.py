@@ -0,0 +1,165 @@
+import json
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from src.langchain.site_registry import SiteRule
+
+# Never part of the description (same set extract_main_text decomposes, plus a few)
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "iframe", "button"}
+CANDIDATE_TAGS = {"div", "article", "section", "main", "td", "body"}
+CONTENT_HINT_RE = re.compile(r"description|posting|job|content|main|article", re.I)
+
+# The main block is the deepest candidate holding this share of the page's non-link text
+MAIN_CONTENT_SHARE = 0.6
+HINTED_CONTENT_SHARE = 0.4  # class/id says description/content/job
+MAX_LINK_DENSITY = 0.5
+
+_PARSER = lxml_html.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True)
+
+
+@dataclass
+class PageContent:
+    title: str = ""
+    meta: Dict[str, str] = field(default_factory=dict)  # og:*/name -> content
+    jsonld: List[Any] = field(default_factory=list)      # parsed ld+json blocks
+    has_microdata_posting: bool = False
+    company: str = ""
+    main_text: str = ""
+    matched_selector: Optional[str] = None  # site rule description selector that matched
+
+
+@lru_cache(maxsize=256)
+def _compile(selector: str) -> CSSSelector:
+    return CSSSelector(selector, translator="html")
+
+
+def _select_first(root, selectors: List[str]):
+    for selector in selectors:
+        try:
+            found = _compile(selector)(root)
+        except Exception:
+            continue
+        if found:
+            return found[0], selector
+    return None, None
+
+
+def text_content(element) -> str:
+    """get_text(separator="\\n", strip=True) equivalent that leaves out SKIP_TAGS subtrees"""
+    pieces = []
+    walker = etree.iterwalk(element, events=("start", "end"))
+    for event, el in walker:
+        skipped = not isinstance(el.tag, str) or el.tag in SKIP_TAGS
+        if event == "start":
+            if skipped:
+                walker.skip_subtree()
+            elif el.text:
+                pieces.append(el.text)
+        elif el is not element and el.tail:
+            pieces.append(el.tail)
+    return "\n".join(s for s in (p.strip() for p in pieces) if s)
+
+
+def extract_page(html: str, rule: Optional[SiteRule] = None) -> PageContent:
+    """Title, meta, JSON-LD and the main content block from one lxml parse.
+
+    A single walk over the tree collects head data and per-element text and
+    link-text lengths; the main block is then chosen from those counts without
+    touching the tree again.
+    """
+    page = PageContent()
+    if not html or not html.strip():
+        return page
+    try:
+        root = lxml_html.document_fromstring(html.encode("utf-8", "replace"), parser=_PARSER)
+    except (etree.ParserError, ValueError):
+        return page
+
+    nodes, parents, depths = [], [], []
+    own_text, own_links = [], []
+    skipped, in_link = [], []
+    index_of = {}
+
+    for el in root.iter():
+        tag = el.tag if isinstance(el.tag, str) else ""
+        parent = el.getparent()
+        p = index_of.get(parent, -1) if parent is not None else -1
+
+        if tag == "title" and not page.title:
+            page.title = (el.text or "").strip()
+        elif tag == "meta":
+            key = el.get("property") or el.get("name")
+            if key and el.get("content") and key not in page.meta:
+                page.meta[key] = el.get("content").strip()
+        elif tag == "script" and "ld+json" in (el.get("type") or "").lower():
+            try:
+                page.jsonld.append(json.loads((el.text or "").strip(), strict=False))
+            except ValueError:
+                pass
+        if not page.has_microdata_posting and "JobPosting" in (el.get("itemtype") or ""):
+            page.has_microdata_posting = True
+
+        i = len(nodes)
+        index_of[el] = i
+        nodes.append(el)
+        parents.append(p)
+        depths.append(depths[p] + 1 if p >= 0 else 0)
+        is_skipped = (p >= 0 and skipped[p]) or not tag or tag in SKIP_TAGS
+        is_link = (p >= 0 and in_link[p]) or tag == "a"
+        skipped.append(is_skipped)
+        in_link.append(is_link)
+
+        length = 0 if is_skipped else len((el.text or "").strip())
+        own_text.append(length)
+        own_links.append(length if is_link else 0)
+        # A tail is text of the parent, outside this element
+        if el.tail and p >= 0 and not skipped[p]:
+            tail_length = len(el.tail.strip())
+            own_text[p] += tail_length
+            if in_link[p]:
+                own_links[p] += tail_length
+
+    # Children come after their parents, so one reverse sweep gives subtree totals
+    totals, links = own_text[:], own_links[:]
+    for i in range(len(nodes) - 1, 0, -1):
+        p = parents[i]
+        if p >= 0:
+            totals[p] += totals[i]
+            links[p] += links[i]
+
+    if rule is not None:
+        title_node, _ = _select_first(root, rule.title)
+        if title_node is not None:
+            page.title = text_content(title_node) or page.title
+        company_node, _ = _select_first(root, rule.company)
+        page.company = text_content(company_node) if company_node is not None else ""
+        description_node, page.matched_selector = _select_first(root, rule.description)
+        if description_node is not None:
+            page.main_text = text_content(description_node)
+    page.company = page.company or page.meta.get("og:site_name") or page.meta.get("og:title") or ""
+    if page.matched_selector:
+        return page
+
+    page_text = totals[0] - links[0] if nodes else 0
+    if page_text <= 0:
+        return page
+    best, best_key = None, None
+    for i, el in enumerate(nodes):
+        if skipped[i] or el.tag not in CANDIDATE_TAGS or not totals[i]:
+            continue
+        text = totals[i] - links[i]
+        if links[i] / totals[i] > MAX_LINK_DENSITY:
+            continue
+        hinted = el.tag in ("article", "main") or CONTENT_HINT_RE.search(f"{el.get('class', '')} {el.get('id', '')}")
+        if text < page_text * (HINTED_CONTENT_SHARE if hinted else MAIN_CONTENT_SHARE):
+            continue
+        key = (depths[i], text)
+        if best_key is None or key > best_key:
+            best, best_key = el, key
+    page.main_text = text_content(best if best is not None else root)
+    return page
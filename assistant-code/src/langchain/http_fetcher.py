@@ -0,0 +1,278 @@
+import html
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from bs4 import BeautifulSoup
+
+from src.langchain.browser_pool import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT_SECONDS = 8.0
+
+# Page text shorter than this is treated as a client-rendered shell
+MIN_SERVER_RENDERED_CHARS = 500
+CLIENT_RENDERED_MARKERS = re.compile(
+    r"enable javascript|you need to enable javascript|<noscript>[^<]*javascript|"
+    r"<div id=\"(root|app|__next)\"[^>]*>\s*</div>",
+    re.I
+)
+
+
+@dataclass
+class AtsEndpoints:
+    """Public posting APIs; override the bases to point at a local fixture server"""
+    greenhouse: str = os.getenv("GREENHOUSE_API_BASE", "https://boards-api.greenhouse.io/v1/boards")
+    lever: str = os.getenv("LEVER_API_BASE", "https://api.lever.co/v0/postings")
+    smartrecruiters: str = os.getenv("SMARTRECRUITERS_API_BASE", "https://api.smartrecruiters.com/v1/companies")
+
+
+endpoints = AtsEndpoints()
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared client so connections (and TLS sessions) are reused across scrapes"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def html_to_text(fragment: str) -> str:
+    if not fragment:
+        return ""
+    return BeautifulSoup(fragment, "html.parser").get_text(separator="\n", strip=True)
+
+
+# ================== ATS ADAPTERS ================== #
+GREENHOUSE_URL = re.compile(r"(?:job-)?boards(?:\.eu)?\.greenhouse\.io/([\w-]+)/jobs/(\d+)", re.I)
+GREENHOUSE_EMBED_URL = re.compile(r"greenhouse\.io/embed/job_app\?.*?for=([\w-]+).*?token=(\d+)", re.I)
+LEVER_URL = re.compile(r"jobs\.(?:eu\.)?lever\.co/([\w.-]+)/([0-9a-f-]{36})", re.I)
+SMARTRECRUITERS_URL = re.compile(r"(?:jobs|careers)\.smartrecruiters\.com/([\w-]+)/(\d+)", re.I)
+
+
+async def _get_json(url: str) -> Optional[Any]:
+    response = await get_http_client().get(url, headers={"Accept": "application/json"})
+    if response.status_code != 200:
+        logger.info(f"ATS API {response.status_code} for {url}")
+        return None
+    return response.json()
+
+
+async def _greenhouse(board: str, job_id: str) -> Optional[Dict[str, str]]:
+    data = await _get_json(f"{endpoints.greenhouse}/{board}/jobs/{job_id}")
+    if not data:
+        return None
+    # Greenhouse returns the description as escaped HTML
+    return {
+        "title": data.get("title", ""),
+        "company": data.get("company_name") or board.replace("-", " ").title(),
+        "text": html_to_text(html.unescape(data.get("content", ""))),
+    }
+
+
+async def _lever(company: str, posting_id: str) -> Optional[Dict[str, str]]:
+    data = await _get_json(f"{endpoints.lever}/{company}/{posting_id}")
+    if not data:
+        return None
+    parts = [data.get("descriptionPlain") or html_to_text(data.get("description", ""))]
+    for item in data.get("lists", []) or []:
+        parts.append(item.get("text", ""))
+        parts.append(html_to_text(item.get("content", "")))
+    parts.append(data.get("additionalPlain") or html_to_text(data.get("additional", "")))
+    return {
+        "title": data.get("text", ""),
+        "company": company.replace("-", " ").title(),
+        "text": "\n".join(p for p in parts if p),
+    }
+
+
+async def _smartrecruiters(company: str, posting_id: str) -> Optional[Dict[str, str]]:
+    data = await _get_json(f"{endpoints.smartrecruiters}/{company}/postings/{posting_id}")
+    if not data:
+        return None
+    sections = (data.get("jobAd") or {}).get("sections") or {}
+    parts = []
+    for key in ("jobDescription", "qualifications", "additionalInformation"):
+        section = sections.get(key) or {}
+        if section.get("text"):
+            parts.append(section.get("title", ""))
+            parts.append(html_to_text(section["text"]))
+    return {
+        "title": data.get("name", ""),
+        "company": (data.get("company") or {}).get("name") or company,
+        "text": "\n".join(p for p in parts if p),
+    }
+
+
+ATS_ADAPTERS = [
+    (GREENHOUSE_URL, _greenhouse),
+    (GREENHOUSE_EMBED_URL, _greenhouse),
+    (LEVER_URL, _lever),
+    (SMARTRECRUITERS_URL, _smartrecruiters),
+]
+
+
+async def fetch_ats_posting(url: str) -> Optional[Dict[str, str]]:
+    """title/company/text from a known ATS JSON endpoint, or None"""
+    for pattern, adapter in ATS_ADAPTERS:
+        match = pattern.search(url)
+        if not match:
+            continue
+        try:
+            posting = await adapter(*match.groups())
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"ATS adapter {adapter.__name__} failed for {url}: {str(e)}")
+            return None
+        if posting and posting["text"].strip():
+            return posting
+        return None
+    return None
+
+
+# ================== PLAIN HTTP ================== #
+@dataclass
+class FetchedPage:
+    html: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False  # 304 for a conditional request: the cached snapshot is current
+
+
+async def fetch_html(url: str, etag: str = None, last_modified: str = None) -> Optional[FetchedPage]:
+    """Server-rendered HTML for url, or None when the request fails.
+
+    Passing the validators of a cached snapshot makes this a conditional request.
+    """
+    headers = {"Accept": "text/html,application/xhtml+xml"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        response = await get_http_client().get(url, headers=headers)
+    except httpx.HTTPError as e:
+        logger.info(f"HTTP tier failed for {url}: {str(e)}")
+        return None
+    if response.status_code == 304:
+        return FetchedPage(etag=etag, last_modified=last_modified, not_modified=True)
+    if response.status_code != 200 or "html" not in response.headers.get("content-type", "html"):
+        logger.info(f"HTTP tier got {response.status_code} {response.headers.get('content-type')} for {url}")
+        return None
+    return FetchedPage(
+        html=response.text,
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+    )
+
+
+def looks_client_rendered(raw_html: str, main_text: str) -> bool:
+    """True when the description only appears after JavaScript runs"""
+    length = len(main_text or "")
+    if length < MIN_SERVER_RENDERED_CHARS:
+        return True
+    # A "please enable JavaScript" shell can still carry some navigation text
+    return length < 3 * MIN_SERVER_RENDERED_CHARS and bool(CLIENT_RENDERED_MARKERS.search(raw_html[:200000]))
+
+
+# ================== FIXTURE CHECK ================== #
+# `python -m src.langchain.http_fetcher` runs every adapter, the conditional
+# request path and the shell detection against an in-process MockTransport.
+_LEVER_ID = "0f9c6b2e-3c1d-4f5a-9b7e-2d8a1c4e6f00"
+_PAGE_URL = "https://careers.example.com/jobs/1"
+_PAGE_HTML = "<html><body><main><h1>Support Engineer</h1><p>Help customers</p></main></body></html>"
+_FIXTURES = {
+    f"{endpoints.greenhouse}/acme/jobs/123": {
+        "title": "Backend Engineer", "company_name": "Acme",
+        "content": "&lt;p&gt;Build APIs in Python&lt;/p&gt;&lt;ul&gt;&lt;li&gt;PostgreSQL&lt;/li&gt;&lt;/ul&gt;",
+    },
+    f"{endpoints.lever}/acme-corp/{_LEVER_ID}": {
+        "text": "Data Engineer", "descriptionPlain": "Own the pipelines",
+        "lists": [{"text": "Requirements", "content": "<li>SQL</li><li>Airflow</li>"}],
+        "additional": "<p>Remote friendly</p>",
+    },
+    f"{endpoints.smartrecruiters}/acme/postings/744000012345678": {
+        "name": "QA Analyst", "company": {"name": "Acme Inc"},
+        "jobAd": {"sections": {
+            "jobDescription": {"title": "Job Description", "text": "<p>Test releases</p>"},
+            "qualifications": {"title": "Qualifications", "text": ""},
+        }},
+    },
+}
+_EXPECTED_POSTINGS = {
+    "https://boards.greenhouse.io/acme/jobs/123": {
+        "title": "Backend Engineer", "company": "Acme", "text": "Build APIs in Python\nPostgreSQL"},
+    "https://boards.greenhouse.io/embed/job_app?for=acme&token=123": {
+        "title": "Backend Engineer", "company": "Acme", "text": "Build APIs in Python\nPostgreSQL"},
+    f"https://jobs.lever.co/acme-corp/{_LEVER_ID}": {
+        "title": "Data Engineer", "company": "Acme Corp",
+        "text": "Own the pipelines\nRequirements\nSQL\nAirflow\nRemote friendly"},
+    "https://jobs.smartrecruiters.com/acme/744000012345678": {
+        "title": "QA Analyst", "company": "Acme Inc", "text": "Job Description\nTest releases"},
+    "https://boards.greenhouse.io/acme/jobs/404": None,
+}
+
+
+def _fixture_handler(request: httpx.Request) -> httpx.Response:
+    url = str(request.url)
+    if url == _PAGE_URL:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html=_PAGE_HTML, headers={"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"})
+    if _FIXTURES.get(url) is not None:
+        return httpx.Response(200, json=_FIXTURES[url])
+    return httpx.Response(404, json={"error": "not found"})
+
+
+async def _fixture_check() -> int:
+    global _client
+    _client = httpx.AsyncClient(transport=httpx.MockTransport(_fixture_handler), follow_redirects=True)
+    failures = []
+
+    def check(name: str, actual, expected):
+        if actual != expected:
+            failures.append(name)
+            print(f"❌ {name}: expected {expected!r}, got {actual!r}")
+
+    try:
+        for url, expected in _EXPECTED_POSTINGS.items():
+            check(url, await fetch_ats_posting(url), expected)
+
+        page = await fetch_html(_PAGE_URL)
+        check("200 page", (page.html, page.etag, page.not_modified), (_PAGE_HTML, '"v1"', False))
+        cached = await fetch_html(_PAGE_URL, etag=page.etag, last_modified=page.last_modified)
+        check("304 page", (cached.not_modified, cached.etag, cached.last_modified, cached.html),
+              (True, page.etag, page.last_modified, ""))
+        check("404 page", await fetch_html("https://careers.example.com/missing"), None)
+
+        check("empty shell", looks_client_rendered('<div id="root"></div>', "Loading"), True)
+        check("javascript notice", looks_client_rendered("<noscript>Please enable JavaScript</noscript>", "x" * 800), True)
+        check("server rendered", looks_client_rendered(_PAGE_HTML, "x" * 800), False)
+    finally:
+        await close_http_client()
+
+    print("✅ All HTTP fetcher checks passed" if not failures else f"❌ {len(failures)} HTTP fetcher checks failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    import asyncio
+    raise SystemExit(asyncio.run(_fixture_check()))
@@ -0,0 +1,396 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from src.Database.Database import SessionLocal
+from src.langchain.main import ACTIVE_MODEL
+from src.langchain.models import ParsedJobCache
+from src.langchain.scrape_cache import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Bump when the JD prompt or schema changes so old parses are not served
+PARSER_VERSION = "2"
+
+SHINGLE_WORDS = 5
+NEAR_DUPLICATE_THRESHOLD = 0.9  # a cached parse is reused for a repost this similar
+DUPLICATE_THRESHOLD = 0.8       # copies of one role on different boards: linked, never reused as a parse
+
+NUM_PERM = 128
+LSH_BANDS = 16           # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+LSH_ROWS = NUM_PERM // LSH_BANDS
+MIN_SHINGLES = 20        # shorter texts (a title and two bullets) are too generic to call duplicates
+MINHASH_SEED = 42        # fixed so persisted signatures stay comparable across restarts
+
+_rng = np.random.default_rng(MINHASH_SEED)
+# Multiply-shift hashing: odd 64-bit multipliers, wrap-around arithmetic, top 32 bits kept
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+
+# Lines that differ between reposts of the same job but never change the parse
+BOILERPLATE_PATTERNS = [
+    r"equal (employment )?opportunity",
+    r"\beeo\b",
+    r"reasonable accommodation",
+    r"without regard to (race|age|sex|gender)",
+    r"^(apply|apply now|save|share|share this job|back to jobs|easy apply)$",
+    r"^posted\b|\bdays? ago$|^job (id|number|requisition)\b|^req(uisition)? ?(id|#)",
+    r"cookies?\b.*\b(accept|policy|consent)",
+    r"privacy (policy|notice)",
+    r"^©|all rights reserved",
+]
+BOILERPLATE_RE = re.compile("|".join(f"(?:{p})" for p in BOILERPLATE_PATTERNS), re.I)
+
+
+def normalize_jd_text(text: str) -> str:
+    """Lowercased, whitespace-collapsed JD text without boilerplate lines"""
+    lines = []
+    for line in (text or "").splitlines():
+        line = re.sub(r"\s+", " ", line).strip()
+        if line and not BOILERPLATE_RE.search(line):
+            lines.append(line.lower())
+    return "\n".join(lines)
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def word_shingles(normalized: str) -> set:
+    words = re.findall(r"\w+", normalized)
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def shingle_hashes(normalized: str) -> List[int]:
+    return [_hash64(s) for s in word_shingles(normalized)]
+
+
+def minhash_signature(normalized: str) -> Optional[np.ndarray]:
+    """NUM_PERM uint32 MinHash values over word shingles, or None for short texts"""
+    hashes = shingle_hashes(normalized)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    values = np.asarray(hashes, dtype=np.uint64)[:, None]
+    with np.errstate(over="ignore"):
+        permuted = (values * _MULTIPLIERS + _OFFSETS) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Share of equal MinHash values, an estimate of shingle Jaccard similarity"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+@dataclass
+class DuplicateMatch:
+    entry_id: int
+    similarity: float
+    url: Optional[str] = None
+    tracker_id: Optional[int] = None
+    title: str = ""
+    company: str = ""
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class JDParseCache:
+    """Persistent cache of parse_job_posting results, and the index of postings seen.
+
+    Every posting text gets one row, keyed by a hash of its normalized text.
+    A row holds the parse (served while its parser version is current) and
+    where the posting was seen: URL, company and tracker entry. Near-duplicates
+    are found through MinHash signatures and LSH buckets rebuilt from the table
+    on first use. Reposts at NEAR_DUPLICATE_THRESHOLD reuse the cached parse;
+    copies at DUPLICATE_THRESHOLD (same role, another board's layout) are only
+    linked, since postings for different roles at one company can share that much text.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD, duplicate_threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.duplicate_threshold = duplicate_threshold
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._buckets: Dict[tuple, List[int]] = defaultdict(list)
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.duplicates_found = 0
+
+    @staticmethod
+    def version() -> str:
+        return f"{ACTIVE_MODEL}:{PARSER_VERSION}"
+
+    @staticmethod
+    def key(normalized: str) -> str:
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _bands(signature: np.ndarray):
+        for band in range(LSH_BANDS):
+            yield band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+
+    def _remember(self, row_id: int, signature: np.ndarray):
+        self._signatures[row_id] = signature
+        for bucket in self._bands(signature):
+            self._buckets[bucket].append(row_id)
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            db = SessionLocal()
+            try:
+                rows = db.query(ParsedJobCache.id, ParsedJobCache.signature).filter(ParsedJobCache.signature.isnot(None))
+                for row_id, signature in rows.all():
+                    self._remember(row_id, np.frombuffer(signature, dtype=np.uint32))
+            finally:
+                db.close()
+            self._loaded = True
+        logger.info(f"🗂️ Loaded {len(self._signatures)} job posting signatures")
+
+    def _candidates(self, signature: np.ndarray, threshold: float, exclude: Optional[int] = None) -> List[tuple]:
+        """(row id, similarity) at or above threshold, most similar first"""
+        with self._lock:
+            candidates = {row_id for bucket in self._bands(signature) for row_id in self._buckets.get(bucket, ())}
+            candidates.discard(exclude)
+            scored = [(row_id, signature_similarity(signature, self._signatures[row_id])) for row_id in candidates]
+        return sorted((c for c in scored if c[1] >= threshold), key=lambda c: c[1], reverse=True)
+
+    def _matches(self, db, signature: np.ndarray, threshold: float, exclude_hash: str = None,
+                 exclude: Optional[int] = None) -> List[tuple]:
+        """(similarity, row) for near-duplicates; exclude_hash drops the identical text"""
+        candidates = self._candidates(signature, threshold, exclude)
+        if not candidates:
+            return []
+        rows = {row.id: row for row in db.query(ParsedJobCache).filter(ParsedJobCache.id.in_([c[0] for c in candidates])).all()}
+        return [
+            (similarity, rows[row_id]) for row_id, similarity in candidates
+            if row_id in rows and rows[row_id].text_hash != exclude_hash
+        ]
+
+    def _current_parse(self, row: ParsedJobCache) -> Optional[Dict[str, Any]]:
+        if row.parser_version != self.version():
+            return None
+        return json.loads(row.result or "null")
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        normalized = normalize_jd_text(text)
+        if not normalized:
+            return None
+        self._ensure_loaded()
+        db = SessionLocal()
+        try:
+            row = db.query(ParsedJobCache).filter(ParsedJobCache.text_hash == self.key(normalized)).first()
+            result = self._current_parse(row) if row is not None else None
+            if result is None:
+                row = None
+                signature = minhash_signature(normalized)
+                for score, candidate in (self._matches(db, signature, self.threshold) if signature is not None else []):
+                    result = self._current_parse(candidate)
+                    if result is not None:
+                        row = candidate
+                        logger.info(f"🗂️ JD cache near-duplicate hit ({score:.2f})")
+                        break
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.near_hits += 1
+            else:
+                self.hits += 1
+            row.hits = (row.hits or 0) + 1
+            row.last_hit = datetime.utcnow()
+            db.commit()
+            return result
+        finally:
+            db.close()
+
+    def _upsert(self, text: str, update) -> Optional[int]:
+        """Create or update the row for text with update(row); safe against concurrent inserts"""
+        normalized = normalize_jd_text(text)
+        if not normalized:
+            return None
+        self._ensure_loaded()
+        text_hash = self.key(normalized)
+        db = SessionLocal()
+        try:
+            row = db.query(ParsedJobCache).filter(ParsedJobCache.text_hash == text_hash).first()
+            if row is not None:
+                update(row)
+                db.commit()
+                return row.id
+            signature = minhash_signature(normalized)
+            row = ParsedJobCache(
+                text_hash=text_hash,
+                signature=signature.tobytes() if signature is not None else None,
+                result="null",
+            )
+            update(row)
+            db.add(row)
+            try:
+                db.commit()
+            except IntegrityError:
+                # The batch endpoint parses in worker threads; another one stored this text first
+                db.rollback()
+                row = db.query(ParsedJobCache).filter(ParsedJobCache.text_hash == text_hash).first()
+                update(row)
+                db.commit()
+                return row.id
+            db.refresh(row)
+            if signature is not None:
+                with self._lock:
+                    self._remember(row.id, signature)
+            return row.id
+        finally:
+            db.close()
+
+    def put(self, text: str, result: Dict[str, Any]):
+        stored = json.dumps({k: v for k, v in result.items() if k not in ("raw", "duplicate_of")})
+
+        def update(row: ParsedJobCache):
+            row.result = stored
+            row.parser_version = self.version()
+            row.title = row.title or result.get("title") or ""
+
+        self._upsert(text, update)
+
+    def record(self, text: str, url: str = None, title: str = "", company: str = "",
+               tracker_id: int = None) -> Optional[int]:
+        """Remember where a posting was seen; later sightings fill gaps, never overwrite"""
+        def update(row: ParsedJobCache):
+            row.url = row.url or (canonicalize_url(url) if url else None)
+            row.title = row.title or title
+            row.company = row.company or company
+            row.tracker_id = row.tracker_id or tracker_id
+
+        return self._upsert(text, update)
+
+    @staticmethod
+    def _to_match(similarity: float, row: ParsedJobCache) -> DuplicateMatch:
+        return DuplicateMatch(
+            entry_id=row.id,
+            similarity=round(similarity, 3),
+            url=row.url,
+            tracker_id=row.tracker_id,
+            title=row.title or "",
+            company=row.company or "",
+        )
+
+    def find_duplicates(self, text: str) -> List[DuplicateMatch]:
+        """Postings seen before (other than text itself) that are copies of text"""
+        normalized = normalize_jd_text(text)
+        signature = minhash_signature(normalized)
+        if signature is None:
+            return []
+        self._ensure_loaded()
+        db = SessionLocal()
+        try:
+            matches = [
+                self._to_match(similarity, row)
+                for similarity, row in self._matches(db, signature, self.duplicate_threshold, exclude_hash=self.key(normalized))
+            ]
+        finally:
+            db.close()
+        if matches:
+            self.duplicates_found += 1
+        return matches
+
+    def link_tracker(self, tracker_id: int, text: str, url: str = None, title: str = "", company: str = "") -> Optional[int]:
+        """Register a tracker entry; returns the tracker id of an earlier copy of the same posting"""
+        self._ensure_loaded()
+        linked = []
+        db = SessionLocal()
+        try:
+            # A scraped URL already has a row for the full description
+            row = db.query(ParsedJobCache).filter(ParsedJobCache.url == canonicalize_url(url)).first() if url else None
+            if row is not None:
+                if row.tracker_id and row.tracker_id != tracker_id:
+                    linked.append(row.tracker_id)  # same URL saved before
+                row.tracker_id = row.tracker_id or tracker_id
+                db.commit()
+                row_id, signature = row.id, row.signature
+        finally:
+            db.close()
+        if row is None:
+            row_id = self.record(text, url=url, title=title, company=company, tracker_id=tracker_id)
+            if row_id is None:
+                return None
+            db = SessionLocal()
+            try:
+                existing, signature = db.query(ParsedJobCache.tracker_id, ParsedJobCache.signature).filter(ParsedJobCache.id == row_id).one()
+            finally:
+                db.close()
+            if existing and existing != tracker_id:
+                linked.append(existing)  # identical text saved before
+        if signature is not None:
+            db = SessionLocal()
+            try:
+                linked += [
+                    match.tracker_id
+                    for _, match in self._matches(db, np.frombuffer(signature, dtype=np.uint32), self.duplicate_threshold, exclude=row_id)
+                    if match.tracker_id and match.tracker_id != tracker_id
+                ]
+            finally:
+                db.close()
+        if linked:
+            self.duplicates_found += 1
+        # The earliest entry is the canonical one
+        return min(linked) if linked else None
+
+    def unlink_tracker(self, tracker_id: int):
+        db = SessionLocal()
+        try:
+            db.query(ParsedJobCache).filter(ParsedJobCache.tracker_id == tracker_id).update({"tracker_id": None})
+            db.commit()
+        finally:
+            db.close()
+
+    def clear(self) -> int:
+        db = SessionLocal()
+        try:
+            count = db.query(ParsedJobCache).delete()
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            self._signatures.clear()
+            self._buckets.clear()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        self._ensure_loaded()
+        db = SessionLocal()
+        try:
+            entries = db.query(func.count(ParsedJobCache.id)).scalar() or 0
+            parsed = db.query(func.count(ParsedJobCache.id)).filter(ParsedJobCache.parser_version == self.version()).scalar() or 0
+        finally:
+            db.close()
+        total = self.hits + self.near_hits + self.misses
+        return {
+            "entries": entries,
+            "parsed_entries": parsed,
+            "signatures": len(self._signatures),
+            "hits": self.hits,
+            "near_duplicate_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.near_hits) / total, 3) if total else 0.0,
+            "duplicates_found": self.duplicates_found,
+            "threshold": self.threshold,
+            "duplicate_threshold": self.duplicate_threshold,
+        }
+
+
+jd_cache = JDParseCache()
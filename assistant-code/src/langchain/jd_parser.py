@@ -1,8 +1,12 @@
 from langdetect import detect
 from langchain.prompts import PromptTemplate
-from langchain_core.runnables import Runnable
 from langchain_core.output_parsers import PydanticOutputParser
 from src.langchain.main import get_llm
+from src.langchain.structured_output import StructuredOutput
+from src.langchain.jd_cache import jd_cache
+from src.langchain.jd_rules import extract_with_rules, segment_sections, is_boilerplate, RULES_CONFIDENCE_THRESHOLD
+from src.langchain.skill_gazetteer import get_skill_gazetteer
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel
 import re
 import os
@@ -57,10 +61,9 @@ JSON Output:
   "education": "Bachelor's degree in Computer Science or related field", 
   "responsibilities": [
     "Develop APIs",
-    "Collaborate in agile teams", 
+    "Collaborate in agile teams",
     "Build scalable backend systems"
-    "requirements": ["Excellent communication", "Team collaboration", "Full-time availability"
-  
+  ]
 }}
 
 Now analyze the following:
@@ -70,8 +73,94 @@ Job Description:
     partial_variables={"format_instructions": parser.get_format_instructions()}
 )
 
-# Step 5: Create Chain
-chain: Runnable = prompt | llm | parser
+# Step 5: Structured output (native JSON mode where available, repair otherwise)
+structured_llm = StructuredOutput(llm, JobDescriptionSchema)
+
+# Postings longer than this are parsed section by section
+LONG_JD_CHARS = 6000
+CHUNK_CHARS = 3000
+MAX_PARALLEL_CHUNKS = 4
+
+def _result_to_dict(result: JobDescriptionSchema) -> dict:
+    return {
+        "title": result.title,
+        "skills": result.skills,
+        "experience": result.experience,
+        "education": result.education,
+        "responsibilities": result.responsibilities,
+    }
+
+def _chunk_relevant_sections(jd_text: str) -> list[str]:
+    """Drop boilerplate sections and pack the rest into chunks of up to CHUNK_CHARS"""
+    chunks, current = [], ""
+    for section in segment_sections(jd_text):
+        if is_boilerplate(section):
+            continue
+        text = section.text
+        if current and len(text) > CHUNK_CHARS:
+            # Flush first so chunks stay in posting order (the intro, with the title, comes first)
+            chunks.append(current)
+            current = ""
+        while len(text) > CHUNK_CHARS:
+            # One oversized section: cut at a line boundary
+            cut = text.rfind("\n", 0, CHUNK_CHARS)
+            cut = cut if cut > 0 else CHUNK_CHARS
+            chunks.append(text[:cut])
+            text = text[cut:].strip()
+        if current and len(current) + len(text) > CHUNK_CHARS:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{text}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _merge_chunk_results(results: list[dict], title: str | None = None) -> dict:
+    gazetteer = get_skill_gazetteer()
+    skills = gazetteer.normalize_list(skill for r in results for skill in r["skills"])
+
+    def unique(items):
+        seen, kept = set(), []
+        for item in items:
+            key = item.strip().lower().rstrip(".")
+            if key and key not in seen:
+                seen.add(key)
+                kept.append(item.strip())
+        return kept
+
+    return {
+        "title": title if title is not None else next((r["title"] for r in results if r["title"].strip()), ""),
+        "skills": unique(skills),
+        "experience": "; ".join(unique(r["experience"] for r in results)),
+        "education": "; ".join(unique(r["education"] for r in results)),
+        "responsibilities": unique(item for r in results for item in r["responsibilities"]),
+    }
+
+def _parse_long_posting(jd_text: str) -> tuple[dict | None, bool]:
+    """Map-reduce: parse relevant chunks concurrently, then merge and de-duplicate.
+
+    Returns (merged, complete); complete is False when any chunk failed to parse.
+    """
+    chunks = _chunk_relevant_sections(jd_text)
+    if not chunks:
+        return None, False
+    print(f"Parsing long job description in {len(chunks)} chunks ({len(jd_text)} chars)")
+
+    def parse_chunk(chunk: str):
+        try:
+            return _result_to_dict(structured_llm.invoke(prompt.format(job_text=chunk)))
+        except Exception as e:
+            print("Chunk parsing failed:", str(e))
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_CHUNKS, len(chunks))) as pool:
+        ordered = list(pool.map(parse_chunk, chunks))
+    results = [r for r in ordered if r]
+    if not results:
+        return None, False
+    # The first chunk holds the intro, so its title counts even when empty; later chunks have none to report
+    merged = _merge_chunk_results(results, title=ordered[0]["title"] if ordered[0] else None)
+    return merged, len(results) == len(chunks)
 
 # Step 6: Main Parsing Function
 def parse_job_posting(jd_text: str | dict) -> dict:
@@ -84,19 +173,31 @@ def parse_job_posting(jd_text: str | dict) -> dict:
     if not jd_text.strip():
         return {"title": "", "skills": [], "responsibilities": [], "raw": jd_text}
 
-    # Retry logic: try 3 times if LLM parsing fails
-    for _ in range(3):
-        try:
-            result = chain.invoke({"job_text": jd_text})
-            return {
-                "title": result.title,
-                "skills": result.skills,
-                "responsibilities": result.responsibilities,
-                "raw": jd_text
-            }
-        except Exception as e:
-            print("Retrying due to LLM parsing failure:", str(e))
-            continue
+    # Same (or reposted) posting parsed before, by anyone
+    cached = jd_cache.get(jd_text)
+    if cached is not None:
+        return {**cached, "raw": jd_text}
+
+    # Postings with clear headings and bullets parse in milliseconds without the LLM
+    rules_result, confidence = extract_with_rules(jd_text)
+    if (confidence >= RULES_CONFIDENCE_THRESHOLD
+            and all(rules_result[key] for key in ("title", "skills", "responsibilities"))):
+        return {**rules_result, "raw": jd_text}
+
+    # Invalid fields are re-requested on their own instead of re-running the whole parse
+    try:
+        if len(jd_text) > LONG_JD_CHARS:
+            merged, complete = _parse_long_posting(jd_text)
+        else:
+            merged, complete = _result_to_dict(structured_llm.invoke(prompt.format(job_text=jd_text))), True
+        if merged:
+            parsed = {**merged, "raw": jd_text}
+            # A parse missing failed chunks is served once but never shared through the cache
+            if complete:
+                jd_cache.put(jd_text, parsed)
+            return parsed
+    except Exception as e:
+        print("LLM parsing failed:", str(e))
 
     # Final fallback
     return {
@@ -0,0 +1,162 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.langchain.skill_gazetteer import get_skill_gazetteer
+
+# Heading text (lowercased, punctuation stripped) -> section key. "other" covers
+# company blurbs, benefits and legal text that never feed JobDescriptionSchema.
+HEADING_PATTERNS: List[Tuple[str, str]] = [
+    ("responsibilities", r"(key |main |core |job )?(responsibilities|duties)|what you('ll| will) (do|be doing)|the role|your role|role overview|day to day|in this role|key tasks|your impact|what you('ll| will) work on"),
+    ("requirements", r"(minimum |basic |required |preferred |desired |additional )?(requirements|qualifications)|what you('ll| will)? bring|who you are|what we('re| are) looking for|must haves?|nice to haves?|about you|you have|you bring|ideal candidate"),
+    ("skills", r"(required |key |technical |core )?skills( required)?|tech(nology|nical)? stack|tools( and technologies)?|competencies"),
+    ("experience", r"(required |relevant )?(work )?experience"),
+    ("education", r"education( requirements)?|academic (background|qualifications)|certifications?"),
+    ("other", r"about (us|the company|the team|[a-z]+)|benefits|perks|what we offer|why (join us|work here|you('ll| will) love)|compensation|salary|pay (range|transparency)|equal (employment )?opportunity|eeo|diversity|accommodations?|how to apply|location|work environment|our (values|culture|mission)"),
+]
+HEADING_RES = [(key, re.compile(rf"^(?:{pattern})$", re.I)) for key, pattern in HEADING_PATTERNS]
+
+BULLET_RE = re.compile(r"^\s*(?:[•·▪◦●‣○■□➢➤✓✔\-\*–—]|\d{1,2}[.)])\s+")
+INLINE_BULLET_RE = re.compile(r"\s*[•·▪●]\s*")
+YEARS_RE = re.compile(r"\d+\s*\+?\s*(?:-\s*\d+\s*)?(?:years?|yrs)", re.I)
+DEGREE_RE = re.compile(r"\b(bachelor|master|phd|ph\.d|doctorate|degree|diploma|b\.?sc|m\.?sc|mba|graduate|certification|certified|licen[sc]e)", re.I)
+TITLE_RES = [
+    re.compile(r"^(?:job )?title\s*[:\-]\s*(.+)$", re.I),
+    re.compile(r"(?:seeking|looking for|hiring)\s+(?:an?|our(?: next)?)\s+(.+?)\s+(?:to|who|that|with|for|in)\b", re.I),
+]
+
+# Words that dominate benefits, company and legal paragraphs but rarely requirements
+BOILERPLATE_WORDS = {
+    "benefits", "insurance", "dental", "vision", "401k", "401(k)", "pto", "vacation", "holidays", "pension",
+    "parental", "wellness", "perks", "equity", "bonus", "salary", "compensation", "equal", "opportunity",
+    "employer", "race", "religion", "gender", "orientation", "disability", "veteran", "accommodation",
+    "applicants", "discrimination", "privacy", "cookies", "mission", "founded", "headquartered", "award",
+    "culture", "values", "inclusive", "diversity",
+}
+BOILERPLATE_DENSITY = 0.08
+
+# Rules result is trusted at or above this; below it the LLM parses the posting
+RULES_CONFIDENCE_THRESHOLD = 0.7
+
+
+@dataclass
+class JDSection:
+    key: str                     # section key from HEADING_PATTERNS, "intro" or "unknown"
+    heading: str
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(([self.heading] if self.heading else []) + self.lines)
+
+
+def classify_heading(line: str) -> Optional[str]:
+    """Section key when the line is a heading, else None"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 60 or BULLET_RE.match(stripped):
+        return None
+    ends_with_colon = stripped.endswith(":")
+    core = re.sub(r"^#+\s*|[:\-–—]+$", "", stripped).strip()
+    core = re.sub(r"[^\w\s'&/]", "", core).strip()
+    for key, pattern in HEADING_RES:
+        if pattern.match(core):
+            return key
+    # Unknown short line ending in ":" or written in capitals still starts a section
+    words = core.split()
+    if words and len(words) <= 6 and (ends_with_colon or (core.isupper() and len(core) > 3)):
+        return "unknown"
+    return None
+
+
+def split_bullets(line: str) -> List[str]:
+    """'• a • b' -> ['a', 'b']; '- a' -> ['a']; plain text -> [text]"""
+    parts = [p.strip() for p in INLINE_BULLET_RE.split(line)]
+    parts = [BULLET_RE.sub("", p).strip() for p in parts if p.strip()]
+    return [p.rstrip(";.").strip() for p in parts if p]
+
+
+def segment_sections(text: str) -> List[JDSection]:
+    """Split a posting into sections at recognized headings"""
+    sections = [JDSection(key="intro", heading="")]
+    for raw_line in (text or "").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        key = classify_heading(line)
+        if key:
+            sections.append(JDSection(key=key, heading=line))
+        else:
+            sections[-1].lines.append(line)
+    return [s for s in sections if s.lines or s.heading]
+
+
+def is_boilerplate(section: JDSection) -> bool:
+    """Cheap relevance check: known boilerplate heading, or benefits/legal vocabulary"""
+    if section.key == "other":
+        return True
+    if section.key not in ("intro", "unknown"):
+        return False
+    words = re.findall(r"[a-z0-9()]+", section.text.lower())
+    if not words:
+        return True
+    return sum(1 for w in words if w in BOILERPLATE_WORDS) / len(words) >= BOILERPLATE_DENSITY
+
+
+def _extract_title(text: str, sections: List[JDSection]) -> str:
+    for line in text.splitlines()[:5]:
+        match = TITLE_RES[0].match(line.strip())
+        if match:
+            return match.group(1).strip()
+    intro = sections[0].lines if sections and sections[0].key == "intro" else []
+    # A short first line without sentence punctuation is usually the title
+    if intro and len(intro[0]) <= 80 and len(intro[0].split()) <= 10 and not intro[0].endswith((".", "!", "?")):
+        return intro[0].strip()
+    for line in intro[:3]:
+        match = TITLE_RES[1].search(line)
+        if match and len(match.group(1).split()) <= 8:
+            return match.group(1).strip(" ,")
+    return ""
+
+
+def extract_with_rules(text: str) -> Tuple[Dict[str, Any], float]:
+    """Parse a well-structured posting without an LLM.
+
+    Returns JobDescriptionSchema-shaped fields and a 0-1 confidence based on how
+    many fields came from recognized sections.
+    """
+    sections = segment_sections(text)
+    gazetteer = get_skill_gazetteer()
+    by_key: Dict[str, List[str]] = {}
+    for section in sections:
+        items = [item for line in section.lines for item in split_bullets(line)]
+        by_key.setdefault(section.key, []).extend(items)
+
+    requirements = by_key.get("requirements", [])
+    responsibilities = by_key.get("responsibilities", [])
+
+    skills = gazetteer.normalize_list(by_key.get("skills", []))
+    skills += [s for s in gazetteer.extract("\n".join(requirements + by_key.get("experience", []))) if s not in skills]
+
+    experience_lines = by_key.get("experience", []) + [
+        line for line in requirements if YEARS_RE.search(line) or "experience" in line.lower()
+    ]
+    education_lines = by_key.get("education", []) + [
+        line for line in requirements if DEGREE_RE.search(line) and line not in by_key.get("education", [])
+    ]
+
+    result = {
+        "title": _extract_title(text, sections),
+        "skills": skills,
+        "experience": "; ".join(dict.fromkeys(experience_lines)),
+        "education": "; ".join(dict.fromkeys(education_lines)),
+        "responsibilities": responsibilities,
+    }
+
+    confidence = (
+        0.15 * bool(result["title"])
+        + 0.30 * min(len(responsibilities), 3) / 3
+        + 0.30 * min(len(skills), 3) / 3
+        + 0.15 * bool(result["experience"])
+        + 0.10 * bool(result["education"] or requirements)
+    )
+    return result, round(confidence, 3)
@@ -1,12 +1,21 @@
-from typing import Dict, Any, List
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, AsyncIterator
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from collections import OrderedDict
 from langchain.prompts import PromptTemplate
-from langchain.schema import StrOutputParser
-from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
 import logging
-from src.langchain.main import get_llm
+import re
+import threading
+import numpy as np
+from src.langchain.main import get_llm, get_embedder, ACTIVE_MODEL
+from src.langchain.structured_output import StructuredOutput, parse_json_output
+from src.langchain.skill_gazetteer import get_skill_gazetteer
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,10 @@ class SectionScore(BaseModel):
     gaps: List[str] = Field(description="Key gaps or missing elements")
     missing_keywords: List[str] = Field(description="Important missing keywords/skills")
 
+class SectionAnalysis(SectionScore):
+    """One section scored on its own (mode="sections")"""
+    recommendations: List[str] = Field(default=[], description="1-2 recommendations for this section")
+
 class MatchScoreResult(BaseModel):
     """Complete LLM-based matching results"""
     overall_score: float = Field(description="Overall match score from 0-100")
@@ -37,13 +50,125 @@ class LLMMatchConfig:
     temperature: float = 0.3  # Lower for more consistent scoring
     max_retries: int = 3
 
+def to_legacy_format(llm_result: dict, config: LLMMatchConfig, matching_method: str = "llm_based") -> Dict[str, Any]:
+    """Convert section results (LLM or computed) to the backward-compatible response shape"""
+    header = "🔍 LLM-Powered Analysis" if matching_method == "llm_based" else "⚡ Fast Embedding Analysis"
+    return {
+        "overall_score": round(llm_result["overall_score"], 2),
+        "section_scores": {
+            "skills": round(llm_result["skills_score"]["score"], 2),
+            "experience": round(llm_result["experience_score"]["score"], 2),
+            "education": round(llm_result["education_score"]["score"], 2)
+        },
+        "missing": {
+            "skills": llm_result["skills_score"]["missing_keywords"],
+            "experience_keywords": llm_result["experience_score"]["missing_keywords"],
+            "education_keywords": llm_result["education_score"]["missing_keywords"]
+        },
+        "feedback": [
+            header,
+            "",
+            "💡 Overall Assessment",
+            llm_result["overall_reasoning"],
+            "",
+            f"🧠 Skills Match — {llm_result['skills_score']['score']}%",
+            llm_result["skills_score"]["reasoning"],
+            "",
+            f"🛠️ Experience Match — {llm_result['experience_score']['score']}%",
+            llm_result["experience_score"]["reasoning"],
+            "",
+            f"🎓 Education Match — {llm_result['education_score']['score']}%",
+            llm_result["education_score"]["reasoning"],
+            "",
+            "✅ Recommendations",
+            *[f"- {rec}" for rec in llm_result["recommendations"]],
+            "",
+            f"📈 Application Fit Prediction: {llm_result['application_probability']}"
+        ],
+        "llm_analysis": {
+            "detailed_scores": {
+                "skills": {
+                    "score": llm_result["skills_score"]["score"],
+                    "reasoning": llm_result["skills_score"]["reasoning"],
+                    "strengths": llm_result["skills_score"]["strengths"],
+                    "gaps": llm_result["skills_score"]["gaps"]
+                },
+                "experience": {
+                    "score": llm_result["experience_score"]["score"],
+                    "reasoning": llm_result["experience_score"]["reasoning"],
+                    "strengths": llm_result["experience_score"]["strengths"],
+                    "gaps": llm_result["experience_score"]["gaps"]
+                },
+                "education": {
+                    "score": llm_result["education_score"]["score"],
+                    "reasoning": llm_result["education_score"]["reasoning"],
+                    "strengths": llm_result["education_score"]["strengths"],
+                    "gaps": llm_result["education_score"]["gaps"]
+                }
+            },
+            "recommendations": llm_result["recommendations"],
+            "application_probability": llm_result["application_probability"],
+            "overall_reasoning": llm_result["overall_reasoning"]
+        },
+        "metadata": {
+            "matching_method": matching_method,
+            "model_config": config.__dict__,
+            "analysis_version": "1.0"
+        }
+    }
+
+
+# ================== SECTION PROMPTS ================== #
+SECTION_RESUME_CHARS = 2000
+
+SECTION_PROMPTS = {
+    "skills": """You are an expert HR analyst. Score how well the candidate's skills cover the job's required skills (0-100).
+Count close equivalents (e.g. PostgreSQL for SQL) as covered and name exact missing skills.
+
+Candidate skills: {profile_text}
+Resume excerpt: {resume_text}
+Required skills: {job_text}
+""",
+    "experience": """You are an expert HR analyst. Score how well the candidate's work experience fits the job's experience
+requirements and responsibilities (0-100). Consider years, seniority, domain and the tools used in each role.
+
+Candidate experience: {profile_text}
+Resume excerpt: {resume_text}
+Required experience and responsibilities: {job_text}
+""",
+    "education": """You are an expert HR analyst. Score how well the candidate's education meets the job's education
+requirements (0-100). Consider degree level, field of study and any certifications.
+
+Candidate education: {profile_text}
+Resume excerpt: {resume_text}
+Required education: {job_text}
+""",
+}
+
+SECTION_OUTPUT_FORMAT = """
+Be specific: reference tools and terms from both sides. Give 1-2 practical recommendations for this section only.
+Return ONLY valid JSON, no markdown:
+{"score": float, "reasoning": string, "strengths": [string], "gaps": [string], "missing_keywords": [string], "recommendations": [string]}"""
+
+
+def apply_skill_gap(result: Dict[str, Any], profile: Dict[str, Any], job: Dict[str, Any],
+                    profile_experience: str = "") -> Dict[str, Any]:
+    """Replace the LLM's missing skills with the deterministic gazetteer gap"""
+    job_skills = _job_skill_list(job)
+    if job_skills:
+        _, missing = get_skill_gazetteer().skill_gap(profile.get("skills", []) or [], job_skills, profile_experience)
+        result["skills_score"]["missing_keywords"] = missing
+    return result
+
+
 class LLMJobMatcher:
     """LLM-based job matching system with structured output"""
     
     def __init__(self, config: LLMMatchConfig = None):
         self.config = config or LLMMatchConfig()
         self.llm = get_llm()
-        self.parser = PydanticOutputParser(pydantic_object=MatchScoreResult)
+        self.structured_llm = StructuredOutput(self.llm, MatchScoreResult)
+        self.section_llm = StructuredOutput(self.llm, SectionAnalysis)
         self._setup_prompt()
         
     def _setup_prompt(self):
@@ -121,10 +246,9 @@ Do not include example values. Fill in all fields with real analysis based on th
                 "education_weight": int(self.config.education_weight * 100)
             }
         )
-        
-        self.llm_chain = self.match_prompt | self.llm | StrOutputParser()
 
-    def _prepare_profile_text(self, profile: Dict[str, Any]) -> Dict[str, str]:
+    @staticmethod
+    def _prepare_profile_text(profile: Dict[str, Any]) -> Dict[str, str]:
         """Convert structured profile data to text for LLM analysis"""
         
         # Skills (already a list)
@@ -190,104 +314,116 @@ Do not include example values. Fill in all fields with real analysis based on th
             if not any([job_skills, job_experience, job_education]):
                 raise ValueError("Job requirements appear to be empty")
             
-            # Retry logic for LLM analysis
-            for attempt in range(self.config.max_retries):
-                try:
-                    result_str = self.llm_chain.invoke({
-                        "profile_skills": profile_text["skills"],
-                        "profile_experience": profile_text["experience"],
-                        "profile_education": profile_text["education"],
-                        "resume_text": resume or "No resume provided.",
-                        "job_skills": job_skills,
-                        "job_experience": job_experience,
-                        "job_education": job_education
-                    })
-                    
-                    # Parse JSON manually
-                    result_dict = json.loads(result_str)
-                    
-                    # Convert to backward-compatible format
-                    return self._convert_to_legacy_format(result_dict, profile, job)
-                    
-                except Exception as e:
-                    logger.warning(f"LLM analysis attempt {attempt + 1} failed: {e}")
-                    if attempt == self.config.max_retries - 1:
-                        raise
-                    continue
-                    
+            # Invalid fields are re-requested on their own; no whole-reply retries
+            result = self.structured_llm.invoke(self.match_prompt.format(
+                profile_skills=profile_text["skills"],
+                profile_experience=profile_text["experience"],
+                profile_education=profile_text["education"],
+                resume_text=resume or "No resume provided.",
+                job_skills=job_skills,
+                job_experience=job_experience,
+                job_education=job_education
+            ))
+
+            result_dict = apply_skill_gap(result.dict(), profile, job, profile_text["experience"])
+
+            # Convert to backward-compatible format
+            return self._convert_to_legacy_format(result_dict, profile, job)
+
         except Exception as e:
             logger.error(f"LLM match analysis failed: {e}")
             return self._create_fallback_response(str(e))
 
-    def _convert_to_legacy_format(self, llm_result: dict, profile: Dict, job: Dict) -> Dict[str, Any]:
-     """Convert LLM results to backward-compatible format"""
+    def _score_section(self, section: str, profile_text: str, job_text: str, resume: str) -> Dict[str, Any]:
+        """Score one section with its own small prompt; StructuredOutput retries only bad fields"""
+        prompt = SECTION_PROMPTS[section].format(
+            profile_text=profile_text,
+            job_text=job_text or "No specific requirement stated.",
+            resume_text=(resume or "No resume provided.")[:SECTION_RESUME_CHARS],
+        ) + SECTION_OUTPUT_FORMAT
+        return self.section_llm.invoke(prompt).dict()
 
-     return {
-        "overall_score": round(llm_result["overall_score"], 2),
-        "section_scores": {
-            "skills": round(llm_result["skills_score"]["score"], 2),
-            "experience": round(llm_result["experience_score"]["score"], 2),
-            "education": round(llm_result["education_score"]["score"], 2)
-        },
-        "missing": {
-            "skills": llm_result["skills_score"]["missing_keywords"],
-            "experience_keywords": llm_result["experience_score"]["missing_keywords"],
-            "education_keywords": llm_result["education_score"]["missing_keywords"]
-        },
-        "feedback": [
-            "🔍 LLM-Powered Analysis",
-            "",
-            "💡 Overall Assessment",
-            llm_result["overall_reasoning"],
-            "",
-            f"🧠 Skills Match — {llm_result['skills_score']['score']}%",
-            llm_result["skills_score"]["reasoning"],
-            "",
-            f"🛠️ Experience Match — {llm_result['experience_score']['score']}%",
-            llm_result["experience_score"]["reasoning"],
-            "",
-            f"🎓 Education Match — {llm_result['education_score']['score']}%",
-            llm_result["education_score"]["reasoning"],
-            "",
-            "✅ Recommendations",
-            *[f"- {rec}" for rec in llm_result["recommendations"]],
-            "",
-            f"📈 Application Fit Prediction: {llm_result['application_probability']}"
-        ],
-        "llm_analysis": {
-            "detailed_scores": {
-                "skills": {
-                    "score": llm_result["skills_score"]["score"],
-                    "reasoning": llm_result["skills_score"]["reasoning"],
-                    "strengths": llm_result["skills_score"]["strengths"],
-                    "gaps": llm_result["skills_score"]["gaps"]
-                },
-                "experience": {
-                    "score": llm_result["experience_score"]["score"],
-                    "reasoning": llm_result["experience_score"]["reasoning"],
-                    "strengths": llm_result["experience_score"]["strengths"],
-                    "gaps": llm_result["experience_score"]["gaps"]
-                },
-                "education": {
-                    "score": llm_result["education_score"]["score"],
-                    "reasoning": llm_result["education_score"]["reasoning"],
-                    "strengths": llm_result["education_score"]["strengths"],
-                    "gaps": llm_result["education_score"]["gaps"]
+    def analyze_match_sections(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Score skills, experience and education with three concurrent small prompts.
+
+        overall_score is computed locally from the config weights, so no section
+        depends on another and a malformed reply only retries its own section.
+        """
+        try:
+            profile = payload.get("profile", {})
+            resume = payload.get("resume", "")
+            job = payload.get("job", {})
+            profile_text = self._prepare_profile_text(profile)
+            job_text = {
+                "skills": ", ".join(_job_skill_list(job)),
+                "experience": " ".join(
+                    [str(job.get("experience", ""))] + [str(r) for r in job.get("responsibilities", []) or []]
+                ).strip(),
+                "education": str(job.get("education", "")),
+            }
+            if not any(job_text.values()):
+                raise ValueError("Job requirements appear to be empty")
+
+            with ThreadPoolExecutor(max_workers=len(SECTION_PROMPTS)) as pool:
+                futures = {
+                    section: pool.submit(self._score_section, section, profile_text[section], job_text[section], resume)
+                    for section in SECTION_PROMPTS
                 }
-            },
-            "recommendations": llm_result["recommendations"],
-            "application_probability": llm_result["application_probability"],
-            "overall_reasoning": llm_result["overall_reasoning"]
-        },
-        "metadata": {
-            "matching_method": "llm_based",
-            "model_config": self.config.__dict__,
-            "analysis_version": "1.0"
+            sections, degraded = {}, []
+            for section, future in futures.items():
+                try:
+                    sections[section] = future.result()
+                except Exception as e:
+                    logger.error(f"LLM {section} scoring failed, using embedding score: {e}")
+                    degraded.append(section)
+
+            if degraded:
+                # One bad section falls back to the embedding score instead of failing the match
+                fast = _get_fast_scorer().score(profile, job)
+                for section in degraded:
+                    sections[section] = {**fast[f"{section}_score"], "recommendations": []}
+
+            result = apply_skill_gap(self._combine_sections(sections), profile, job, profile_text["experience"])
+            legacy = self._convert_to_legacy_format(result, profile, job, matching_method="llm_sections")
+            if degraded:
+                legacy["metadata"]["degraded_sections"] = degraded
+            return legacy
+
+        except Exception as e:
+            logger.error(f"Sectioned match analysis failed: {e}")
+            return self._create_fallback_response(str(e))
+
+    def _combine_sections(self, sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        weights = {
+            "skills": self.config.skills_weight,
+            "experience": self.config.experience_weight,
+            "education": self.config.education_weight,
+        }
+        overall = sum(sections[name]["score"] * weight for name, weight in weights.items())
+        recommendations = list(dict.fromkeys(
+            rec for name in weights for rec in sections[name].pop("recommendations", [])
+        ))[:5]
+        strongest = max(weights, key=lambda name: sections[name]["score"])
+        weakest = min(weights, key=lambda name: sections[name]["score"])
+        return {
+            "overall_score": float(overall),
+            **{f"{name}_score": sections[name] for name in weights},
+            "overall_reasoning": (
+                f"Weighted fit of {overall:.0f}%. Strongest area is {strongest} "
+                f"({sections[strongest]['score']:.0f}); weakest is {weakest} ({sections[weakest]['score']:.0f})."
+            ),
+            "recommendations": recommendations,
+            "application_probability": _probability_label(overall),
         }
-    }
 
+    def _convert_to_legacy_format(self, llm_result: dict, profile: Dict, job: Dict,
+                                  matching_method: str = "llm_based") -> Dict[str, Any]:
+        """Convert LLM results to backward-compatible format"""
+        return to_legacy_format(llm_result, self.config, matching_method)
 
-    def _create_fallback_response(self, error_message: str) -> Dict[str, Any]:
+
+    @staticmethod
+    def _create_fallback_response(error_message: str) -> Dict[str, Any]:
         """Create fallback response when LLM analysis fails"""
         return {
             "overall_score": 0.0,
@@ -302,11 +438,445 @@ Do not include example values. Fill in all fields with real analysis based on th
             "metadata": {"matching_method": "fallback", "status": "failed"}
         }
 
+# ================== FAST EMBEDDING MATCHING ================== #
+DEGREE_LEVELS = [
+    (5, r"ph\.?d|doctor"),
+    (4, r"master|m\.?sc|mba|m\.?eng|graduate degree"),
+    (3, r"bachelor|b\.?sc|b\.?a\b|b\.?eng|undergraduate|university degree"),
+    (2, r"associate|diploma|college"),
+    (1, r"high school|secondary|ged"),
+]
+STOPWORDS = {
+    "and", "or", "the", "a", "an", "of", "in", "to", "for", "with", "on", "at", "by", "is", "are",
+    "be", "as", "experience", "years", "year", "related", "field", "strong", "ability", "work",
+    "working", "plus", "preferred", "required", "including", "etc", "degree", "knowledge",
+}
+SKILL_MATCH_THRESHOLD = 0.65
+
+
+def _degree_level(text: str) -> int:
+    text = (text or "").lower()
+    for level, pattern in DEGREE_LEVELS:
+        if re.search(pattern, text):
+            return level
+    return 0
+
+
+def _required_years(text: str) -> Optional[int]:
+    match = re.search(r'(\d+)\s*\+?\s*(?:-\s*\d+\s*)?years?', (text or "").lower())
+    return int(match.group(1)) if match else None
+
+
+def _profile_years(profile: Dict[str, Any]) -> float:
+    """Rough total years across experience entries (overlaps are not merged)"""
+    total = 0.0
+    now = datetime.now().year
+    for exp in profile.get("experience", []) or []:
+        if not isinstance(exp, dict):
+            continue
+        start = re.search(r'(19|20)\d{2}', str(exp.get("startDate", "")))
+        end_raw = str(exp.get("endDate", "")).lower()
+        end = re.search(r'(19|20)\d{2}', end_raw)
+        if not start:
+            continue
+        end_year = int(end.group()) if end else now if end_raw in ("", "present", "current", "now") else None
+        if end_year:
+            total += max(0, end_year - int(start.group()))
+    return total
+
+
+def _keywords(text: str) -> List[str]:
+    tokens = re.findall(r'[a-zA-Z][a-zA-Z+#.\-]{1,}', (text or "").lower())
+    seen = []
+    for tok in tokens:
+        tok = tok.strip(".-")
+        if tok not in STOPWORDS and len(tok) > 2 and tok not in seen:
+            seen.append(tok)
+    return seen
+
+
+def _job_skill_list(job: Dict[str, Any]) -> List[str]:
+    skills = job.get("skills", [])
+    if isinstance(skills, str):
+        skills = [s.strip() for s in re.split(r'[,;\n•]', skills)]
+    return [str(s).strip() for s in skills if str(s).strip()]
+
+
+def _similarity_to_score(similarity: float, low: float = 0.15, high: float = 0.75) -> float:
+    return float(np.clip((similarity - low) / (high - low), 0.0, 1.0) * 100)
+
+
+def _probability_label(score: float) -> str:
+    if score >= 80:
+        return "High"
+    if score >= 60:
+        return "Moderate"
+    if score >= 40:
+        return "Low"
+    return "Very Low"
+
+
+class EmbeddingMatchScorer:
+    """Section scores from embedding similarity and keyword overlap, no LLM.
+
+    All texts for a profile and any number of jobs are encoded in one call and
+    compared with matrix products, so scoring N jobs costs one encode.
+    """
+
+    def __init__(self, config: LLMMatchConfig = None, embedder=None):
+        self.config = config or LLMMatchConfig()
+        self._embedder = embedder
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def score(self, profile: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+        return self.score_many(profile, [job])[0]
+
+    def score_many(self, profile: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return one LLM-shaped result dict per job (see MatchScoreResult)"""
+        profile_text = LLMJobMatcher._prepare_profile_text(profile)
+        profile_skills = [str(s).strip() for s in profile.get("skills", []) or [] if str(s).strip()]
+        job_skills = [_job_skill_list(job) for job in jobs]
+        job_exp_texts = [
+            " ".join([str(job.get("experience", ""))] + [str(r) for r in job.get("responsibilities", []) or []]).strip()
+            for job in jobs
+        ]
+        job_edu_texts = [str(job.get("education", "")) for job in jobs]
+
+        # One encode over every distinct text
+        texts = list(dict.fromkeys(
+            profile_skills + [profile_text["experience"], profile_text["education"]]
+            + [s for skills in job_skills for s in skills] + job_exp_texts + job_edu_texts
+        ))
+        position = {t: i for i, t in enumerate(texts)}
+        vectors = np.asarray(self.embedder.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+        def rows(items: List[str]) -> np.ndarray:
+            return vectors[[position[t] for t in items]] if items else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+        # Skills: every job skill of every job against the profile skills, in one product
+        flat_job_skills = [s for skills in job_skills for s in skills]
+        if flat_job_skills and profile_skills:
+            best_skill_sim = (rows(flat_job_skills) @ rows(profile_skills).T).max(axis=1)
+        else:
+            best_skill_sim = np.zeros(len(flat_job_skills), dtype=np.float32)
+
+        exp_sim = rows(job_exp_texts) @ vectors[position[profile_text["experience"]]]
+        edu_sim = rows(job_edu_texts) @ vectors[position[profile_text["education"]]]
+
+        profile_keywords = set(_keywords(" ".join(profile_skills) + " " + profile_text["experience"]))
+        gazetteer = get_skill_gazetteer()
+        profile_skill_keys = {s.lower() for s in gazetteer.normalize_list(profile_skills)}
+        profile_skill_keys.update(s.lower() for s in gazetteer.extract(profile_text["experience"]))
+        profile_years = _profile_years(profile)
+        profile_degree = _degree_level(profile_text["education"])
+
+        results = []
+        offset = 0
+        for j, job in enumerate(jobs):
+            skills = job_skills[j]
+            sims = best_skill_sim[offset:offset + len(skills)]
+            offset += len(skills)
+            results.append(self._build_result(
+                skills, sims, float(exp_sim[j]), float(edu_sim[j]), job_exp_texts[j], job_edu_texts[j],
+                profile_keywords, profile_skill_keys, profile_years, profile_degree
+            ))
+        return results
+
+    def _build_result(self, skills, skill_sims, exp_sim, edu_sim, job_exp_text, job_edu_text,
+                      profile_keywords, profile_skill_keys, profile_years, profile_degree) -> Dict[str, Any]:
+        # Skills
+        gazetteer = get_skill_gazetteer()
+        matched = [
+            s for s, sim in zip(skills, skill_sims)
+            if sim >= SKILL_MATCH_THRESHOLD or (gazetteer.normalize(s) or s).lower() in profile_skill_keys
+        ]
+        missing_skills = [s for s in skills if s not in matched]
+        if skills:
+            skills_score = 100.0 * len(matched) / len(skills)
+            skills_reasoning = f"Matched {len(matched)} of {len(skills)} listed skills."
+        else:
+            skills_score = _similarity_to_score(exp_sim)
+            skills_reasoning = "The posting lists no explicit skills; scored from overall experience similarity."
+
+        # Experience
+        experience_score = _similarity_to_score(exp_sim) if job_exp_text else 70.0
+        required = _required_years(job_exp_text)
+        years_note = ""
+        if required:
+            if profile_years < required:
+                experience_score *= max(0.4, profile_years / required)
+                years_note = f" Requires {required}+ years; profile shows about {profile_years:.0f}."
+            else:
+                years_note = f" Meets the {required}+ year requirement (about {profile_years:.0f} years)."
+        missing_exp = [k for k in _keywords(job_exp_text) if k not in profile_keywords][:8]
+        experience_reasoning = f"Experience similarity to the role is {exp_sim:.2f}.{years_note}".strip()
+
+        # Education
+        required_degree = _degree_level(job_edu_text)
+        if not job_edu_text.strip():
+            education_score = 85.0
+            education_reasoning = "No specific education requirement found."
+        elif required_degree and profile_degree < required_degree:
+            education_score = 40.0 + 0.3 * _similarity_to_score(edu_sim)
+            education_reasoning = "Profile degree level is below the stated requirement."
+        else:
+            education_score = 70.0 + 0.3 * _similarity_to_score(edu_sim)
+            education_reasoning = "Degree level meets the requirement; score reflects field similarity."
+        missing_edu = [k for k in _keywords(job_edu_text) if k not in profile_keywords][:5] if education_score < 70 else []
+
+        overall = (
+            skills_score * self.config.skills_weight
+            + experience_score * self.config.experience_weight
+            + education_score * self.config.education_weight
+        )
+
+        recommendations = []
+        if missing_skills:
+            recommendations.append(f"Highlight or build experience with: {', '.join(missing_skills[:5])}")
+        if required and profile_years < required:
+            recommendations.append("Emphasize the scope and impact of your most relevant roles to offset fewer years")
+        if required_degree and profile_degree < required_degree:
+            recommendations.append("Mention certifications or coursework that substitute for the required degree")
+        if not recommendations:
+            recommendations.append("Tailor your resume summary to the responsibilities listed in the posting")
+
+        def section(score, reasoning, strengths, missing):
+            return {
+                "score": round(float(score), 1),
+                "reasoning": reasoning,
+                "strengths": strengths,
+                "gaps": missing[:5],
+                "missing_keywords": missing,
+            }
+
+        return {
+            "overall_score": float(overall),
+            "skills_score": section(skills_score, skills_reasoning, matched, missing_skills),
+            "experience_score": section(experience_score, experience_reasoning, [], missing_exp),
+            "education_score": section(education_score, education_reasoning, [], missing_edu),
+            "overall_reasoning": (
+                f"Estimated {overall:.0f}% fit from skills ({skills_score:.0f}), "
+                f"experience ({experience_score:.0f}) and education ({education_score:.0f})."
+            ),
+            "recommendations": recommendations,
+            "application_probability": _probability_label(overall),
+        }
+
+
+_fast_scorer = None
+
+
+def _get_fast_scorer() -> EmbeddingMatchScorer:
+    global _fast_scorer
+    if _fast_scorer is None:
+        _fast_scorer = EmbeddingMatchScorer()
+    return _fast_scorer
+
+
+def explain_match(result: Dict[str, Any], profile_text: Dict[str, str], job: Dict[str, Any]) -> Dict[str, Any]:
+    """Ask the LLM only for reasoning/recommendations text on top of computed scores"""
+    prompt = f"""You are a career advisor. Scores below were already computed; do not change them.
+Explain the fit in 2-3 sentences and give 3-5 specific, actionable recommendations.
+
+Candidate skills: {profile_text["skills"]}
+Candidate experience: {profile_text["experience"][:1500]}
+Candidate education: {profile_text["education"]}
+Job: {job.get("title", "")}
+Required skills: {", ".join(_job_skill_list(job))}
+Required experience: {job.get("experience", "")}
+Required education: {job.get("education", "")}
+
+Scores: overall {result["overall_score"]:.0f}, skills {result["skills_score"]["score"]},
+experience {result["experience_score"]["score"]}, education {result["education_score"]["score"]}
+Missing skills: {", ".join(result["skills_score"]["missing_keywords"])}
+
+Return ONLY JSON: {{"overall_reasoning": string, "recommendations": [string]}}"""
+    try:
+        response = get_llm().invoke(prompt)
+        explanation = parse_json_output(response.content)
+        result["overall_reasoning"] = explanation.get("overall_reasoning") or result["overall_reasoning"]
+        result["recommendations"] = explanation.get("recommendations") or result["recommendations"]
+    except Exception as e:
+        logger.warning(f"Match explanation failed, keeping computed text: {e}")
+    return result
+
+
+def fast_match_score(payload: Dict[str, Any], explain: bool = False) -> Dict[str, Any]:
+    """Millisecond match score in the legacy response shape; LLM text only when explain=True"""
+    scorer = _get_fast_scorer()
+    profile = payload.get("profile", {})
+    job = payload.get("job", {})
+    try:
+        result = scorer.score(profile, job)
+        if explain:
+            result = explain_match(result, LLMJobMatcher._prepare_profile_text(profile), job)
+        return to_legacy_format(result, scorer.config, matching_method="embedding")
+    except Exception as e:
+        logger.error(f"Fast match failed: {e}")
+        return LLMJobMatcher._create_fallback_response(str(e))
+
+
+# ================== RESULT CACHE ================== #
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip()
+    if isinstance(value, list):
+        return [_normalize_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize_value(v) for k, v in value.items()}
+    return value
+
+
+class MatchScoreCache:
+    """LRU cache of match results keyed on a fingerprint of every scoring input.
+
+    The key covers the normalized profile text, resume, job requirements, weights,
+    model and mode, so any change to those produces a new key and old entries
+    simply age out.
+    """
+
+    JOB_FIELDS = ("title", "skills", "experience", "education", "responsibilities")
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()  # rank_jobs calls match_score from worker threads
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def fingerprint(cls, payload: Dict[str, Any], config: LLMMatchConfig) -> str:
+        job = payload.get("job", {}) or {}
+        material = {
+            "profile": LLMJobMatcher._prepare_profile_text(payload.get("profile", {}) or {}),
+            "resume": payload.get("resume", "") or "",
+            "job": {field: job.get(field) for field in cls.JOB_FIELDS},
+            "config": asdict(config),
+            "model": ACTIVE_MODEL,
+            "mode": payload.get("mode") or "llm",
+            "explain": bool(payload.get("explain")),
+        }
+        encoded = json.dumps(_normalize_value(material), sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]):
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+match_cache = MatchScoreCache()
+
+
 def match_score(payload: Dict[str, Any]) -> Dict[str, Any]:
-    matcher = LLMJobMatcher()
-    return matcher.analyze_match({
-        "profile": payload.get("profile", {}),
-        "resume": payload.get("resume", ""),
-        "job": payload.get("job", {})
-    })
+    key = MatchScoreCache.fingerprint(payload, LLMMatchConfig())
+    if (cached := match_cache.get(key)) is not None:
+        cached.setdefault("metadata", {})["cache"] = "hit"
+        return cached
+
+    if payload.get("mode") == "fast":
+        result = fast_match_score(payload, explain=bool(payload.get("explain")))
+    elif payload.get("mode") == "sections":
+        result = LLMJobMatcher().analyze_match_sections(payload)
+    else:
+        matcher = LLMJobMatcher()
+        result = matcher.analyze_match({
+            "profile": payload.get("profile", {}),
+            "resume": payload.get("resume", ""),
+            "job": payload.get("job", {})
+        })
+
+    # Failed analyses, and ones where a section fell back to embeddings, are not cached so the next view retries
+    if "error" not in result and not result.get("metadata", {}).get("degraded_sections"):
+        match_cache.put(key, result)
+    return result
+
+
+
+# ================== BULK RANKING ================== #
+async def rank_jobs(profile: Dict[str, Any], jobs: List[Dict[str, Any]], resume: str = "",
+                    top_k: int = 5, concurrency: int = 3) -> AsyncIterator[Dict[str, Any]]:
+    """Rank many jobs for one profile, yielding events as they become available.
+
+    All jobs are scored together by the embedding scorer (one encode, one matrix
+    product per section), then only the top_k are re-scored by the full LLM
+    analysis under bounded concurrency, streamed in completion order.
+    """
+    if not jobs:
+        yield {"event": "done", "ranking": []}
+        return
+
+    scores = await asyncio.to_thread(_get_fast_scorer().score_many, profile, jobs)
+    ranked = sorted(range(len(jobs)), key=lambda i: scores[i]["overall_score"], reverse=True)
+
+    def summary(i: int, result: Dict[str, Any], stage: str) -> Dict[str, Any]:
+        return {
+            "index": i,
+            "id": jobs[i].get("id"),
+            "title": jobs[i].get("title", ""),
+            "company": jobs[i].get("company", ""),
+            "stage": stage,
+            "overall_score": round(float(result["overall_score"]), 2),
+            "section_scores": result.get("section_scores") or {
+                "skills": result["skills_score"]["score"],
+                "experience": result["experience_score"]["score"],
+                "education": result["education_score"]["score"],
+            },
+        }
+
+    final = {i: summary(i, scores[i], "embedding") for i in ranked}
+    yield {"event": "embedding_ranking", "ranking": [final[i] for i in ranked]}
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def rerank(i: int):
+        async with semaphore:
+            payload = {"profile": profile, "job": jobs[i], "resume": resume}
+            return i, await asyncio.to_thread(match_score, payload)
+
+    for completed in asyncio.as_completed([rerank(i) for i in ranked[:max(0, top_k)]]):
+        i, result = await completed
+        if "error" in result:
+            yield {"event": "rerank_failed", "index": i, "id": jobs[i].get("id"), "error": result["error"]}
+            continue
+        final[i] = summary(i, result, "llm")
+        yield {"event": "reranked", **final[i], "result": result}
 
+    # LLM-scored jobs lead, in LLM order; the rest keep their embedding order
+    reranked = sorted((i for i in final if final[i]["stage"] == "llm"), key=lambda i: final[i]["overall_score"], reverse=True)
+    rest = [i for i in ranked if final[i]["stage"] != "llm"]
+    yield {"event": "done", "ranking": [final[i] for i in reranked + rest]}
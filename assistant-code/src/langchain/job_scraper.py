@@ -1,85 +1,256 @@
 import asyncio
-from playwright.async_api import async_playwright
+import os
+from functools import lru_cache
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from src.langchain.browser_pool import browser_pool
+from src.langchain.http_fetcher import fetch_ats_posting, fetch_html, looks_client_rendered
+from src.langchain.html_extractor import extract_page, PageContent
+from src.langchain.jsonld_extractor import extract_job_posting, job_from_posting_node, posting_node
+from src.langchain.scrape_cache import scrape_cache
+from src.langchain.site_registry import site_registry, SiteRule
 from bs4 import BeautifulSoup
 import re
 import spacy
+from spacy.pipeline import Sentencizer
+from src.langchain.skill_gazetteer import get_skill_gazetteer
 
-nlp = spacy.load("en_core_web_sm")
+RESPONSIBILITY_CUES = ["responsibilit", "duties", "you will", "key tasks"]
 
-async def fetch_job_description(url: str) -> dict:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        # Set user agent to avoid blocking
-        await page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        await page.goto(url, timeout=60000)
+# Batch sentence splitting only starts worker processes for batches at least this big per process
+MIN_TEXTS_PER_PROCESS = 8
+
+# Bump when extraction changes so stored snapshots get re-extracted
+EXTRACTOR_VERSION = "2"
+
+# Whole scrape (navigation + readiness + extraction) must fit in this budget
+SCRAPE_BUDGET_SECONDS = float(os.getenv("SCRAPE_BUDGET_SECONDS", "12"))
+
+# Only the document, its scripts and XHR matter for the description text
+BLOCKED_RESOURCE_TYPES = {"image", "imageset", "media", "font", "stylesheet", "texttrack", "manifest", "beacon", "ping"}
+BLOCKED_HOSTS = re.compile(
+    r"google-analytics|googletagmanager|doubleclick|facebook\.(net|com)/tr|hotjar|segment\.(io|com)|"
+    r"optimizely|newrelic|nr-data|fullstory|clarity\.ms|adsystem|adservice|px\.ads|bat\.bing|onetrust|cookielaw",
+    re.I
+)
+
+async def _block_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_HOSTS.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _wait_until_ready(page, selectors: list, timeout_ms: float) -> tuple:
+    """Race the description selectors against network idle.
+
+    Returns (first selector to appear or None, ms until it appeared, selectors
+    known to be present or absent). A race win says nothing about the selectors
+    still pending, so only the winner counts as checked.
+    """
+    if timeout_ms <= 0:
+        return None, None, []
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    selector_tasks = {
+        asyncio.create_task(page.wait_for_selector(selector, state="attached", timeout=timeout_ms)): selector
+        for selector in selectors
+    }
+    idle_task = asyncio.create_task(page.wait_for_load_state("networkidle", timeout=timeout_ms))
+    pending = set(selector_tasks) | {idle_task}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is idle_task:
+                    # Nothing else is loading: whatever selector exists now is all we get
+                    for i, selector in enumerate(selectors):
+                        if await page.query_selector(selector):
+                            return selector, (loop.time() - started) * 1000, selectors[:i + 1]
+                    return None, None, list(selectors)
+                if task.exception() is None:
+                    return selector_tasks[task], (loop.time() - started) * 1000, [selector_tasks[task]]
+        # Every selector timed out and the network never went idle
+        return None, None, list(selectors)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+def build_job_result(title: str, company: str, text: str, source: str) -> dict:
+    """Same result shape whichever tier fetched the page"""
+    cleaned_text = clean_text(text)
+    skills, responsibilities = extract_skills_and_responsibilities(cleaned_text)
+    return _job_result(title, company, cleaned_text, skills, responsibilities, source)
+
+def _job_result(title: str, company: str, cleaned_text: str, skills: list, responsibilities: list, source: str) -> dict:
+    return {
+        "title": title,
+        "company": company,
+        "raw": cleaned_text,
+        "skills": skills,
+        "responsibilities": responsibilities,
+        "source": source
+    }
+
+def _structured_from_page(content: PageContent, html: str, source: str) -> dict | None:
+    """Fully parsed job from schema.org JobPosting markup, or None when the page has none"""
+    posting = job_from_posting_node(posting_node(content.jsonld))
+    if posting is None and content.has_microdata_posting:
+        # Microdata is rare enough that the BeautifulSoup walk is fine
+        posting = extract_job_posting(BeautifulSoup(html, 'html.parser'))
+    if not posting:
+        return None
+    posting["company"] = posting["company"] or "Unknown Company"
+    return {**posting, "source": source, "structured": True}
+
+def _structured_result(html: str, source: str) -> dict | None:
+    if "JobPosting" not in html:
+        return None
+    return _structured_from_page(extract_page(html), html, source)
+
+def _page_fields(content: PageContent) -> tuple:
+    """(title, company, main text, matched site selector)"""
+    return content.title or "Untitled", content.company or "Unknown Company", content.main_text, content.matched_selector
+
+def _extract_from_html(html: str, rule: SiteRule | None) -> tuple:
+    return _page_fields(extract_page(html, rule))
+
+async def fetch_job_description(url: str, use_cache: bool = True) -> dict:
+    """Cheapest tier first: scrape cache, ATS JSON API, then plain HTTP, then the browser"""
+    cached = scrape_cache.get(url) if use_cache else None
+    if cached and cached.fresh:
+        return {**cached.result, "cached": True}
+    
+    posting = await fetch_ats_posting(url)
+    if posting:
+        result = build_job_result(posting["title"], posting["company"], posting["text"], source="ats_api")
+        scrape_cache.put(url, result, extractor_version=EXTRACTOR_VERSION)
+        return result
+    
+    # App-shell sites never have the description in server HTML; don't spend a request finding out
+    rule = site_registry.rule_for(url)
+    if rule and rule.render == "browser":
+        page = None
+    else:
+        # A stale entry with validators costs one conditional request if the page hasn't changed
+        validators = cached if cached and cached.revalidatable else None
+        page = await fetch_html(url, etag=validators and validators.etag, last_modified=validators and validators.last_modified)
+    if page and page.not_modified:
+        scrape_cache.mark_validated(url)
+        return {**cached.result, "cached": True}
+    if page:
+        # One parse serves both the JobPosting check and the page-text fallback;
+        # job boards publish JobPosting JSON-LD for search engines, even on JS-heavy pages
+        content = extract_page(page.html, rule)
+        result = _structured_from_page(content, page.html, source="http")
+        if not result:
+            title, company, text, matched = _page_fields(content)
+            site_registry.record_lookup(rule, site_registry.checked_in_order(rule, matched), matched)
+            # A known site without its description container served a login wall or an app shell
+            if (matched or not rule) and not looks_client_rendered(page.html, text):
+                result = build_job_result(title, company, text, source="http")
+        if result:
+            scrape_cache.put(url, result, html=page.html, etag=page.etag, last_modified=page.last_modified,
+                             extractor_version=EXTRACTOR_VERSION)
+            return result
+        print(f"Page looks client-rendered, escalating to browser: {url}")
+    
+    # Rendered DOM is stored without validators: an unchanged app shell says nothing about its content
+    result, html, complete = await fetch_with_browser(url)
+    if complete:
+        scrape_cache.put(url, result, html=html, extractor_version=EXTRACTOR_VERSION)
+    else:
+        # A cut-off page, login wall or bare app shell must not be served as cached for hours
+        print(f"Browser result looks incomplete, not caching: {url}")
+    return result
+
+def reextract_cached_pages(only_outdated: bool = True, batch_size: int = 32, n_process: int = 1) -> dict:
+    """Re-run extraction over every stored snapshot without refetching.
+
+    Keep n_process at 1 inside the API server; see extract_skills_and_responsibilities_batch.
+    """
+    updated, failed = 0, 0
+    batch = []
+
+    def flush():
+        nonlocal updated, failed
+        # Pages without JobPosting markup share one batched sentence-splitting pass
+        pending = []
+        for snapshot in batch:
+            try:
+                source = snapshot["source"] or "http"
+                content = extract_page(snapshot["html"], site_registry.rule_for(snapshot["url"]))
+                result = _structured_from_page(content, snapshot["html"], source)
+                if result:
+                    scrape_cache.update_result(snapshot["id"], result, extractor_version=EXTRACTOR_VERSION)
+                    updated += 1
+                    continue
+                title, company, text, _ = _page_fields(content)
+                pending.append((snapshot, title, company, clean_text(text), source))
+            except Exception as e:
+                print(f"Re-extraction failed for {snapshot['url']}: {e}")
+                failed += 1
+        extracted = extract_skills_and_responsibilities_batch([text for _, _, _, text, _ in pending], n_process=n_process)
+        for (snapshot, title, company, text, source), (skills, responsibilities) in zip(pending, extracted):
+            result = _job_result(title, company, text, skills, responsibilities, source)
+            scrape_cache.update_result(snapshot["id"], result, extractor_version=EXTRACTOR_VERSION)
+            updated += 1
+        batch.clear()
+
+    for snapshot in scrape_cache.snapshots(exclude_version=EXTRACTOR_VERSION if only_outdated else None):
+        batch.append(snapshot)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return {"updated": updated, "failed": failed, "extractor_version": EXTRACTOR_VERSION}
+
+async def fetch_with_browser(url: str) -> tuple:
+    """(result, rendered html, complete) from the shared browser.
+
+    complete is False for pages cut off by the budget or that only rendered a
+    shell (no site selector matched and the text is too thin to be a posting).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SCRAPE_BUDGET_SECONDS
+
+    def remaining_ms() -> float:
+        return max(0.0, (deadline - loop.time()) * 1000)
+
+    # Pages come from the shared browser; the pool sets the user agent per context
+    async with browser_pool.page() as page:
+        await page.route("**/*", _block_resources)
         
-        # Wait a bit for dynamic content
-        await asyncio.sleep(3)
+        partial = False
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=max(remaining_ms(), 1))
+        except PlaywrightTimeoutError:
+            partial = True
+            print(f"Navigation hit the {SCRAPE_BUDGET_SECONDS}s budget, using partial page: {url}")
         
         html = await page.content()
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        title = soup.title.string.strip() if soup.title else "Untitled"
-        company = extract_company_name(soup) or extract_from_meta(soup, "og:site_name") or "Unknown Company"
-        text = extract_main_text(soup)
+        structured = _structured_result(html, source="browser")
+        if structured:
+            return structured, html, True
         
-        # Try site-specific selectors
-        try:
-            if "linkedin.com" in url:
-                await page.wait_for_selector("div.description__text", timeout=10000)
-                text = await page.locator("div.description__text").inner_text()
-            elif "myworkdayjobs.com" in url or "workday.com" in url:
-                # Try multiple Workday selectors
-                selectors = [
-                    'div[data-automation-id="jobPostingDescription"]',
-                    'div[data-automation-id="job-posting-description"]',
-                    'div.css-1t92pv'
-                ]
-                for selector in selectors:
-                    try:
-                        await page.wait_for_selector(selector, timeout=8000)
-                        text = await page.locator(selector).inner_text()
-                        break
-                    except:
-                        continue
-            elif "greenhouse.io" in url:
-                await page.wait_for_selector("div#content", timeout=10000)
-                text = await page.locator("div#content").inner_text()
-            elif "lever.co" in url:
-                await page.wait_for_selector("div.posting-content", timeout=10000)
-                text = await page.locator("div.posting-content").inner_text()
-            elif "smartrecruiters.com" in url:
-                await page.wait_for_selector("div.job-description", timeout=10000)
-                text = await page.locator("div.job-description").inner_text()
-            elif "taleo.net" in url:
-                await page.wait_for_selector("div.jobdescription", timeout=10000)
-                text = await page.locator("div.jobdescription").inner_text()
-            elif "icims.com" in url:
-                await page.wait_for_selector("div.iCIMS_JobContent", timeout=10000)
-                text = await page.locator("div.iCIMS_JobContent").inner_text()
-        except Exception as e:
-            print(f"Selector failed, using fallback: {e}")
-            # Keep the soup text as fallback
-            pass
+        # Ready as soon as any candidate container exists; candidates race instead of queueing
+        rule = site_registry.rule_for(url)
+        selectors = rule.description if rule else []
+        ready_selector, latency_ms, checked = await _wait_until_ready(page, selectors, remaining_ms())
+        site_registry.record_lookup(rule, checked, ready_selector, latency_ms)
         
-        await browser.close()
+        html = await page.content()
+        title, company, text, _ = _extract_from_html(html, rule)
         
-        # Clean and extract structured data
-        cleaned_text = clean_text(text)
-        skills, responsibilities = extract_skills_and_responsibilities(cleaned_text)
+        if ready_selector:
+            try:
+                text = await page.locator(ready_selector).first.inner_text(timeout=max(remaining_ms(), 1000))
+            except Exception as e:
+                print(f"Selector failed, using fallback: {e}")
+        elif selectors:
+            print(f"No site selector matched for {url}, using page text")
         
-        return {
-            "title": title,
-            "company": company,
-            "raw": cleaned_text,
-            "skills": skills,
-            "responsibilities": responsibilities
-        }
+    complete = bool(ready_selector) or (not partial and not looks_client_rendered(html, text))
+    return build_job_result(title, company, text, source="browser"), html, complete
 
 def extract_main_text(soup):
     # Remove unwanted elements
@@ -109,6 +280,26 @@ def clean_text(text):
         return ""
     return re.sub(r'\n+', '\n', text).strip()
 
+@lru_cache(maxsize=1)
+def get_sentencizer():
+    """Tokenizer + rule-based sentencizer, loaded on first use.
+
+    Responsibilities only need sentence boundaries; the tagger, parser, NER and
+    lemmatizer of a trained pipeline would dominate scrape CPU and startup.
+    """
+    nlp = spacy.blank("en")
+    # Bullet lines rarely end in punctuation, so a line break also ends a sentence
+    nlp.add_pipe("sentencizer", config={"punct_chars": Sentencizer.default_punct_chars + ["\n"]})
+    return nlp
+
+def _responsibility_sentences(doc) -> list:
+    responsibilities = []
+    for sent in doc.sents:
+        s = sent.text.lower()
+        if any(k in s for k in RESPONSIBILITY_CUES):
+            responsibilities.append(sent.text.strip())
+    return responsibilities[:10]
+
 def extract_skills_and_responsibilities(text):
     skills = []
     responsibilities = []
@@ -116,21 +307,42 @@ def extract_skills_and_responsibilities(text):
     if not text:
         return skills, responsibilities
     
+    # Normalized skill names from the gazetteer, not whole requirement sentences
+    skills = get_skill_gazetteer().extract(text)
+    
     try:
-        doc = nlp(text)
-        for sent in doc.sents:
-            s = sent.text.lower()
-            if any(k in s for k in ["responsibilit", "duties", "you will", "key tasks"]):
-                responsibilities.append(sent.text.strip())
-            if any(k in s for k in ["skills", "requirements", "qualifications", "must have", "experience with"]):
-                skills.append(sent.text.strip())
+        responsibilities = _responsibility_sentences(get_sentencizer()(text))
     except Exception as e:
         print(f"NLP error: {e}")
     
-    return skills[:10], responsibilities[:10]
+    return skills[:30], responsibilities
+
+def extract_skills_and_responsibilities_batch(texts: list, n_process: int = 1) -> list:
+    """extract_skills_and_responsibilities for many pages, splitting sentences with nlp.pipe.
+
+    n_process > 1 forks worker processes, which is only safe from a standalone
+    script: forking the API server would copy its uvicorn, Playwright and httpx
+    threads in an undefined state.
+    """
+    if not texts:
+        return []
+    gazetteer = get_skill_gazetteer()
+    if len(texts) < MIN_TEXTS_PER_PROCESS * n_process:
+        n_process = 1
+    try:
+        docs = get_sentencizer().pipe((text or "" for text in texts), n_process=n_process, batch_size=16)
+        responsibilities = [_responsibility_sentences(doc) for doc in docs]
+    except Exception as e:
+        print(f"NLP error: {e}")
+        responsibilities = [[] for _ in texts]
+    return [(gazetteer.extract(text)[:30] if text else [], resp) for text, resp in zip(texts, responsibilities)]
 
 # Test
 if __name__ == "__main__":
     url = "https://canadagoose.wd3.myworkdayjobs.com/en-US/CanadaGooseCareers/job/Toronto%2C-Ontario%2C-CAN/JR-HR-Business-Partner_R15050"
-    data = asyncio.run(fetch_job_description(url))
-    print(data)
\ No newline at end of file
+    async def main():
+        try:
+            print(await fetch_job_description(url))
+        finally:
+            await browser_pool.stop()
+    asyncio.run(main())
\ No newline at end of file
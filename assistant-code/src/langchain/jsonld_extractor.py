@@ -0,0 +1,137 @@
+import html
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.langchain.jd_rules import extract_with_rules, split_bullets
+from src.langchain.skill_gazetteer import get_skill_gazetteer
+
+
+def _html_text(value: Any) -> str:
+    """schema.org text fields are often HTML (sometimes escaped twice)"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "\n".join(_html_text(v) for v in value)
+    if isinstance(value, dict):
+        return _html_text(value.get("name") or value.get("description") or value.get("credentialCategory") or "")
+    text = html.unescape(str(value))
+    if "<" in text:
+        text = BeautifulSoup(text, "html.parser").get_text(separator="\n", strip=True)
+    return re.sub(r"\n\s*\n+", "\n", text).strip()
+
+
+def _as_list(value: Any) -> List[str]:
+    """Lists, comma lists and bulleted HTML all become a flat list of items"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [item for v in value for item in _as_list(v)]
+    text = _html_text(value)
+    items = [item for line in text.splitlines() for item in split_bullets(line)]
+    if len(items) == 1 and "," in items[0] and len(items[0]) < 300:
+        items = [part.strip() for part in items[0].split(",")]
+    return [item for item in items if item]
+
+
+def _experience_text(value: Any) -> str:
+    if isinstance(value, dict) and value.get("monthsOfExperience"):
+        years = round(float(value["monthsOfExperience"]) / 12, 1)
+        return f"{years:g}+ years of experience"
+    return _html_text(value)
+
+
+def _iter_jsonld_nodes(data: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_jsonld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        for key in ("@graph", "mainEntity", "itemListElement"):
+            if key in data:
+                yield from _iter_jsonld_nodes(data[key])
+
+
+def _is_job_posting(node: Dict[str, Any]) -> bool:
+    node_type = node.get("@type")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return any(str(t).endswith("JobPosting") for t in types if t)
+
+
+def posting_node(jsonld_blocks: Iterable[Any]) -> Optional[Dict[str, Any]]:
+    """First JobPosting among already-parsed ld+json blocks"""
+    for data in jsonld_blocks:
+        for node in _iter_jsonld_nodes(data):
+            if _is_job_posting(node):
+                return node
+    return None
+
+
+def find_jsonld_posting(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+    blocks = []
+    for script in soup.find_all("script", type=re.compile(r"application/ld\+json", re.I)):
+        raw = script.string or script.get_text() or ""
+        try:
+            blocks.append(json.loads(raw.strip(), strict=False))
+        except json.JSONDecodeError:
+            continue
+    return posting_node(blocks)
+
+
+def find_microdata_posting(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+    scope = soup.find(attrs={"itemtype": re.compile(r"schema\.org/JobPosting", re.I)})
+    if scope is None:
+        return None
+    node: Dict[str, Any] = {}
+    for prop in scope.find_all(attrs={"itemprop": True}):
+        name = prop["itemprop"]
+        if name == "hiringOrganization":
+            org_name = prop.find(attrs={"itemprop": "name"})
+            node[name] = {"name": (org_name.get("content") or org_name.get_text(strip=True)) if org_name else prop.get_text(strip=True)}
+        elif name == "description" and name not in node:
+            # Keep the markup so list items still split into bullets
+            node[name] = prop.get("content") or str(prop)
+        elif name not in node:
+            node[name] = prop.get("content") or prop.get_text(separator="\n", strip=True)
+    return node or None
+
+
+def extract_job_posting(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+    """parse_job_posting-shaped job from schema.org JobPosting data, or None.
+
+    Fields the markup leaves out are filled by the rule-based extractor and
+    skill gazetteer over the description, so no LLM call is needed.
+    """
+    return job_from_posting_node(find_jsonld_posting(soup) or find_microdata_posting(soup))
+
+
+def job_from_posting_node(node: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not node or not node.get("description"):
+        return None
+
+    description = _html_text(node.get("description"))
+    rules_result, _ = extract_with_rules(description)
+    gazetteer = get_skill_gazetteer()
+
+    skills = gazetteer.normalize_list(_as_list(node.get("skills")))
+    qualifications = _as_list(node.get("qualifications"))
+    skills += [s for s in gazetteer.extract("\n".join(qualifications)) if s not in skills]
+    skills += [s for s in rules_result["skills"] if s not in skills]
+    if not skills:
+        # No skills field and no recognizable requirements section
+        skills = gazetteer.extract(description)
+
+    organization = node.get("hiringOrganization")
+    company = organization.get("name", "") if isinstance(organization, dict) else str(organization or "")
+
+    return {
+        "title": _html_text(node.get("title")) or rules_result["title"],
+        "company": company,
+        "skills": skills,
+        "experience": _experience_text(node.get("experienceRequirements")) or rules_result["experience"],
+        "education": _html_text(node.get("educationRequirements")) or rules_result["education"],
+        "responsibilities": _as_list(node.get("responsibilities")) or rules_result["responsibilities"],
+        "raw": description,
+    }
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -7,6 +8,7 @@ from langchain_together import ChatTogether
 load_dotenv()
 
 ACTIVE_MODEL = "llama"  # change as needed
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 
 def get_llm():
     if ACTIVE_MODEL == "openai":
@@ -38,3 +40,9 @@ def get_llm():
     else:
         raise ValueError("Invalid ACTIVE_MODEL")
 
+
+@lru_cache(maxsize=1)
+def get_embedder():
+    """The one sentence embedder per process, shared by autofill and job matching"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, LargeBinary, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, conint
 
 Base = declarative_base()
 
@@ -34,6 +34,67 @@ class JobApplication(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
     applied_at = Column(DateTime, nullable=True)  
+    job_snapshot = Column(Text, nullable=True)  # Parsed job JSON (skills, experience, ...) for ranking
+    duplicate_of = Column(Integer, nullable=True)  # earlier tracker entry for the same posting (near-duplicate text)
+
+class ScreeningAnswer(Base):
+    __tablename__ = "screening_answers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    question = Column(Text, nullable=False)
+    answer = Column(Text, nullable=False)
+    embedding = Column(Text, nullable=True)  # JSON list, normalized
+    company = Column(String, nullable=True)  # what the answer was written for, used to adapt it
+    job_title = Column(String, nullable=True)
+    source = Column(String, default="generated")  # "generated" or "accepted"
+    uses = Column(Integer, default=0)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+class ParsedJobCache(Base):
+    __tablename__ = "parsed_job_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text_hash = Column(String, unique=True, index=True, nullable=False)  # sha256 of normalized JD text
+    parser_version = Column(String, nullable=True)  # "<model>:<version>" of result; older parses are not served
+    signature = Column(LargeBinary, nullable=True)  # MinHash signature (uint32 values), none for very short texts
+    result = Column(Text, nullable=False)  # JSON parse result without "raw"; "null" until the text is parsed
+    url = Column(Text, index=True, nullable=True)  # canonical URL the posting was scraped from
+    tracker_id = Column(Integer, index=True, nullable=True)  # job_applications.id saved for this posting
+    title = Column(String, nullable=True)
+    company = Column(String, nullable=True)
+    hits = Column(Integer, default=0)
+    timestamp = Column(DateTime, default=datetime.utcnow)
+    last_hit = Column(DateTime, nullable=True)
+
+class ScrapeCache(Base):
+    __tablename__ = "scrape_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url_hash = Column(String, unique=True, index=True, nullable=False)  # sha256 of the canonical URL
+    url = Column(Text, nullable=False)  # canonical URL
+    domain = Column(String, index=True, nullable=True)
+    source = Column(String, nullable=True)  # tier that fetched it: ats_api / http / browser
+    html = Column(LargeBinary, nullable=True)  # zlib-compressed page snapshot (none for ATS API results)
+    result = Column(Text, nullable=False)  # JSON scraper result
+    extractor_version = Column(String, nullable=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    hits = Column(Integer, default=0)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    validated_at = Column(DateTime, default=datetime.utcnow)  # last full fetch or 304 revalidation
+
+class SelectorStat(Base):
+    __tablename__ = "selector_stats"
+    __table_args__ = (UniqueConstraint("site", "selector"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    site = Column(String, nullable=False)  # site registry rule name
+    selector = Column(Text, nullable=False)
+    attempts = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    total_latency_ms = Column(Float, default=0.0)
+    timed_hits = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
 
     # Models
 class Field(BaseModel):
@@ -42,6 +103,7 @@ class Field(BaseModel):
     type: Optional[str] = "text"
     name: Optional[str] = ""
     placeholder: Optional[str] = ""
+    options: Optional[List[str]] = []  # select/radio/combobox choices, in page order
 
 class ProfileData(BaseModel):
     fullName: Optional[str] = ""
@@ -62,6 +124,8 @@ class AutofillRequest(BaseModel):
     fields: List[Field]
     profile: ProfileData
     memory: Optional[Dict[str, str]] = {}  # Added
+    session_id: Optional[str] = None  # Shared by every page of a multi-page application
+    job: Optional[Dict[str, Any]] = None  # title/company/description, used for screening answers
 
 class JobApplicationIn(BaseModel):
     title: str
@@ -71,10 +135,12 @@ class JobApplicationIn(BaseModel):
     notes: Optional[str] = None
     reminder_date: Optional[datetime] = None
     feedback: Optional[str] = None
+    job_snapshot: Optional[str] = None
 
 class JobApplicationOut(JobApplicationIn):
     id: int
     timestamp: datetime
+    duplicate_of: Optional[int] = None
 
 class GenericInput(BaseModel):
     data: Any
@@ -82,6 +148,11 @@ class GenericInput(BaseModel):
 class JobURL(BaseModel):
     url: str
 
+class BatchScrapePayload(BaseModel):
+    urls: List[str]
+    parse: bool = True       # run parse_job_posting on pages without JobPosting data
+    use_cache: bool = True
+
 class JobTextInput(BaseModel):
     text: str
 
@@ -106,6 +177,31 @@ class CoverLetterRefinementPayload(BaseModel):
 class MatchScorePayload(BaseModel):
     profile: Dict[str, Any]
     job: Dict[str, Any]
+    mode: Optional[str] = "llm"  # "llm", "sections" (one small prompt per section) or "fast" (embedding + keyword scores)
+    explain: Optional[bool] = False  # fast mode: ask the LLM for reasoning text too
+
+class ScreeningAnswerIn(BaseModel):
+    question: str
+    answer: str
+    company: Optional[str] = ""
+    job_title: Optional[str] = ""
+
+class ScreeningAnswerAccept(BaseModel):
+    answer: Optional[str] = None  # the user's edited text, if they changed it
+
+class ScreeningAnswerOut(ScreeningAnswerIn):
+    id: int
+    source: str
+    uses: int
+    timestamp: datetime
+
+class RankJobsPayload(BaseModel):
+    profile: Dict[str, Any]
+    jobs: List[Dict[str, Any]] = []  # inline parsed jobs
+    job_ids: List[int] = []          # job tracker ids
+    resume: Optional[str] = ""
+    top_k: conint(ge=0, le=20) = 5         # how many to rerank with the full LLM analysis
+    concurrency: conint(ge=1, le=5) = 3    # parallel LLM analyses
 
 class FeedbackIn(BaseModel):
     profile_snapshot: str | None = None
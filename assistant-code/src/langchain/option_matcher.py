@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.langchain.fuzzy_matcher import normalize_text, ngram_similarity
+
+logger = logging.getLogger(__name__)
+
+# Placeholder entries that are never a real answer
+PLACEHOLDER_PATTERN = re.compile(r'^(select|choose|please select|pick|none selected|--+|-)\b', re.I)
+
+# Values that are spelled differently by profiles and dropdowns but mean the same thing
+ALIAS_GROUPS = [
+    {"united states", "united states of america", "usa", "us", "america"},
+    {"united kingdom", "uk", "great britain", "england", "britain"},
+    {"canada", "ca", "can"},
+    {"united arab emirates", "uae"},
+    {"yes", "y", "true"},
+    {"no", "n", "false"},
+    {"bachelor", "bachelors", "bachelor s", "bachelor s degree", "bachelors degree", "undergraduate", "bsc", "bs", "ba", "beng"},
+    {"master", "masters", "master s", "master s degree", "masters degree", "graduate", "msc", "ms", "ma", "meng", "mba"},
+    {"doctorate", "phd", "doctoral", "doctor of philosophy"},
+    {"high school", "secondary school", "high school diploma", "ged"},
+    {"associate", "associates", "associate s degree", "associate degree"},
+]
+
+# State/province dropdowns list either names or postal codes, profiles hold either
+REGION_CODES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "district of columbia": "dc",
+    "florida": "fl", "georgia": "ga", "hawaii": "hi", "idaho": "id", "illinois": "il",
+    "indiana": "in", "iowa": "ia", "kansas": "ks", "kentucky": "ky", "louisiana": "la",
+    "maine": "me", "maryland": "md", "massachusetts": "ma", "michigan": "mi", "minnesota": "mn",
+    "mississippi": "ms", "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv",
+    "new hampshire": "nh", "new jersey": "nj", "new mexico": "nm", "new york": "ny",
+    "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or",
+    "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc", "south dakota": "sd",
+    "tennessee": "tn", "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va",
+    "washington": "wa", "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy",
+    "alberta": "ab", "british columbia": "bc", "manitoba": "mb", "new brunswick": "nb",
+    "newfoundland and labrador": "nl", "nova scotia": "ns", "northwest territories": "nt",
+    "nunavut": "nu", "ontario": "on", "prince edward island": "pe", "quebec": "qc",
+    "saskatchewan": "sk", "yukon": "yt",
+}
+_TAKEN = {alias for group in ALIAS_GROUPS for alias in group}
+# "ca", "ma" and "ms" already mean Canada/master's; a bare code that is ambiguous stays unaliased
+ALIAS_GROUPS += [{name, code} if code not in _TAKEN else {name} for name, code in REGION_CODES.items()]
+ALIASES: Dict[str, int] = {
+    normalize_text(alias, expand_abbreviations=False): i for i, group in enumerate(ALIAS_GROUPS) for alias in group
+}
+
+
+class _OptionIndex:
+    """Precomputed lookup structures for one option list"""
+
+    def __init__(self, options: Sequence[str]):
+        self.options = [opt for opt in options if opt and opt.strip() and not PLACEHOLDER_PATTERN.match(opt.strip())]
+        self.normalized = [normalize_text(opt, expand_abbreviations=False) for opt in self.options]
+        self.exact = {}
+        self.alias = {}
+        for i, norm in enumerate(self.normalized):
+            self.exact.setdefault(norm, i)
+            if norm in ALIASES:
+                self.alias.setdefault(ALIASES[norm], i)
+        self.embeddings: Optional[np.ndarray] = None
+
+
+class OptionMatcher:
+    """Choose the dropdown/radio option that best represents a resolved profile value.
+
+    Stages run cheapest first: normalized exact, alias group, whole-token containment,
+    character n-gram similarity, and finally embedding similarity. Option lists are
+    indexed once per content hash; the embedding stage encodes every pending value
+    and every uncached option list in a single batch.
+    """
+
+    def __init__(self, embedder=None, fuzzy_threshold: float = 0.75,
+                 embedding_threshold: float = 0.6, max_cached_lists: int = 256):
+        self.embedder = embedder
+        self.fuzzy_threshold = fuzzy_threshold
+        self.embedding_threshold = embedding_threshold
+        self.max_cached_lists = max_cached_lists
+        self._cache: "OrderedDict[str, _OptionIndex]" = OrderedDict()
+        self.stats = {"exact": 0, "alias": 0, "contains": 0, "fuzzy": 0, "embedding": 0, "unmatched": 0}
+
+    @staticmethod
+    def options_hash(options: Sequence[str]) -> str:
+        return hashlib.sha1("\x1f".join(options).encode("utf-8")).hexdigest()
+
+    def _get_index(self, options: Sequence[str]) -> _OptionIndex:
+        key = self.options_hash(options)
+        index = self._cache.get(key)
+        if index is None:
+            index = _OptionIndex(options)
+            self._cache[key] = index
+            if len(self._cache) > self.max_cached_lists:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return index
+
+    def _match_lexical(self, value: str, index: _OptionIndex) -> Tuple[Optional[int], str]:
+        norm = normalize_text(value, expand_abbreviations=False)
+        if not norm or not index.options:
+            return None, "unmatched"
+
+        if norm in index.exact:
+            return index.exact[norm], "exact"
+
+        # Whole value first, then its leading word ("Bachelor of Science" -> bachelor)
+        for alias_key in (norm, norm.split()[0]):
+            if alias_key in ALIASES and ALIASES[alias_key] in index.alias:
+                return index.alias[ALIASES[alias_key]], "alias"
+
+        # "Toronto, Ontario, Canada" -> "Canada"; "Bachelor" -> "Bachelor's Degree"
+        padded_value = f" {norm} "
+        inside_value = [i for i, opt in enumerate(index.normalized) if len(opt) >= 3 and f" {opt} " in padded_value]
+        if inside_value:
+            return max(inside_value, key=lambda i: len(index.normalized[i])), "contains"
+        around_value = [i for i, opt in enumerate(index.normalized) if padded_value in f" {opt} "]
+        if around_value:
+            return min(around_value, key=lambda i: len(index.normalized[i])), "contains"
+
+        scores = [ngram_similarity(norm, opt) for opt in index.normalized]
+        best = int(np.argmax(scores))
+        if scores[best] >= self.fuzzy_threshold:
+            return best, "fuzzy"
+
+        return None, "unmatched"
+
+    def match_many(self, requests: Sequence[Tuple[str, Sequence[str]]]) -> List[Optional[str]]:
+        """Resolve many (value, options) pairs, batching every embedding lookup"""
+        results: List[Optional[str]] = [None] * len(requests)
+        pending: List[Tuple[int, _OptionIndex]] = []
+
+        for i, (value, options) in enumerate(requests):
+            index = self._get_index(list(options))
+            choice, stage = self._match_lexical(str(value), index)
+            if choice is not None:
+                results[i] = index.options[choice]
+                self.stats[stage] += 1
+            elif index.options and value:
+                pending.append((i, index))
+            else:
+                self.stats["unmatched"] += 1
+
+        if pending and self.embedder is not None:
+            self._match_embeddings(requests, pending, results)
+        else:
+            self.stats["unmatched"] += len(pending)
+
+        return results
+
+    def match(self, value: str, options: Sequence[str]) -> Optional[str]:
+        return self.match_many([(value, options)])[0]
+
+    def _match_embeddings(self, requests, pending, results):
+        # Encode all option lists that have never been embedded in one call
+        uncached = []
+        for _, index in pending:
+            if index.embeddings is None and all(index is not u for u in uncached):
+                uncached.append(index)
+        if uncached:
+            all_options = [opt for index in uncached for opt in index.options]
+            matrix = self.embedder.encode(all_options, normalize_embeddings=True)
+            offset = 0
+            for index in uncached:
+                index.embeddings = np.asarray(matrix[offset:offset + len(index.options)])
+                offset += len(index.options)
+
+        values = [str(requests[i][0]) for i, _ in pending]
+        value_embeddings = self.embedder.encode(values, normalize_embeddings=True)
+
+        for (i, index), emb in zip(pending, value_embeddings):
+            scores = index.embeddings @ emb
+            best = int(np.argmax(scores))
+            if scores[best] >= self.embedding_threshold:
+                results[i] = index.options[best]
+                self.stats["embedding"] += 1
+            else:
+                self.stats["unmatched"] += 1
+                logger.info(f"🔽 No option close to '{requests[i][0]}' (best {scores[best]:.2f})")
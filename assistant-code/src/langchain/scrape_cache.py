@@ -0,0 +1,231 @@
+import hashlib
+import json
+import logging
+import os
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from src.Database.Database import SessionLocal
+from src.langchain.models import ScrapeCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = float(os.getenv("SCRAPE_CACHE_TTL_HOURS", "12"))
+
+# Boards that edit or close postings quickly get shorter TTLs than ATS pages
+DOMAIN_TTL_HOURS = {
+    "linkedin.com": 6,
+    "indeed.com": 6,
+    "glassdoor.com": 6,
+    "greenhouse.io": 24,
+    "lever.co": 24,
+    "smartrecruiters.com": 24,
+    "myworkdayjobs.com": 24,
+    "icims.com": 24,
+    "taleo.net": 24,
+}
+
+# Query parameters that never change which posting a URL points at
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "referrer", "refid", "trk", "trackingid",
+    "src", "source", "sourcetype", "origin", "lipi", "gh_src", "lever-source", "lever-origin", "iis", "iisn",
+}
+
+SNAPSHOT_COMPRESSION_LEVEL = 6
+
+
+def canonicalize_url(url: str) -> str:
+    """Lowercased scheme/host, no fragment, tracking parameters dropped, query sorted"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+def ttl_for(domain: str) -> timedelta:
+    for suffix, hours in DOMAIN_TTL_HOURS.items():
+        if domain == suffix or domain.endswith("." + suffix):
+            return timedelta(hours=hours)
+    return timedelta(hours=DEFAULT_TTL_HOURS)
+
+
+@dataclass
+class CachedScrape:
+    url: str
+    result: Dict[str, Any]
+    fresh: bool  # within the domain TTL; stale entries need revalidation or a refetch
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    extractor_version: Optional[str] = None
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+class ScrapeResultCache:
+    """Persistent scrape results keyed on canonical URL.
+
+    Each entry keeps the extracted result, the zlib-compressed HTML it came from
+    and the HTTP validators, so stale entries can be revalidated with a
+    conditional request and the stored pages can be re-extracted offline.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def key(canonical_url: str) -> str:
+        return hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedScrape]:
+        canonical = canonicalize_url(url)
+        db = SessionLocal()
+        try:
+            row = db.query(ScrapeCache).filter(ScrapeCache.url_hash == self.key(canonical)).first()
+            if row is None:
+                self.misses += 1
+                return None
+            fresh = datetime.utcnow() - (row.validated_at or row.fetched_at) < ttl_for(row.domain or "")
+            if fresh:
+                self.hits += 1
+                row.hits = (row.hits or 0) + 1
+                db.commit()
+            else:
+                self.stale += 1
+            return CachedScrape(
+                url=canonical,
+                result=json.loads(row.result),
+                fresh=fresh,
+                etag=row.etag,
+                last_modified=row.last_modified,
+                extractor_version=row.extractor_version,
+            )
+        finally:
+            db.close()
+
+    def put(self, url: str, result: Dict[str, Any], html: Optional[str] = None, etag: str = None,
+            last_modified: str = None, extractor_version: str = None):
+        canonical = canonicalize_url(url)
+        snapshot = zlib.compress(html.encode("utf-8"), SNAPSHOT_COMPRESSION_LEVEL) if html else None
+        now = datetime.utcnow()
+        url_hash = self.key(canonical)
+
+        def write(db, row: ScrapeCache):
+            row.source = result.get("source")
+            row.result = json.dumps(result)
+            row.html = snapshot
+            row.etag = etag
+            row.last_modified = last_modified
+            row.extractor_version = extractor_version
+            row.fetched_at = now
+            row.validated_at = now
+            db.commit()
+
+        db = SessionLocal()
+        try:
+            row = db.query(ScrapeCache).filter(ScrapeCache.url_hash == url_hash).first()
+            if row is not None:
+                write(db, row)
+                return
+            try:
+                row = ScrapeCache(url_hash=url_hash, url=canonical, domain=urlsplit(canonical).hostname)
+                db.add(row)
+                write(db, row)
+            except IntegrityError:
+                # A concurrent scrape of the same URL inserted first; overwrite its row instead
+                db.rollback()
+                write(db, db.query(ScrapeCache).filter(ScrapeCache.url_hash == url_hash).first())
+        finally:
+            db.close()
+
+    def mark_validated(self, url: str):
+        """304 from the origin: the snapshot is current for another TTL"""
+        db = SessionLocal()
+        try:
+            row = db.query(ScrapeCache).filter(ScrapeCache.url_hash == self.key(canonicalize_url(url))).first()
+            if row is not None:
+                row.validated_at = datetime.utcnow()
+                row.hits = (row.hits or 0) + 1
+                db.commit()
+                self.revalidated += 1
+        finally:
+            db.close()
+
+    def snapshots(self, exclude_version: str = None) -> Iterator[Dict[str, Any]]:
+        """Stored pages for offline re-extraction, loaded one row at a time"""
+        db = SessionLocal()
+        try:
+            query = db.query(ScrapeCache.id).filter(ScrapeCache.html.isnot(None))
+            if exclude_version:
+                query = query.filter((ScrapeCache.extractor_version != exclude_version) | ScrapeCache.extractor_version.is_(None))
+            row_ids = [row_id for (row_id,) in query.all()]
+        finally:
+            db.close()
+        # No read cursor stays open, so callers can write results back while iterating
+        for row_id in row_ids:
+            db = SessionLocal()
+            try:
+                row = db.query(ScrapeCache).filter(ScrapeCache.id == row_id).first()
+                snapshot = row and {"id": row.id, "url": row.url, "source": row.source, "html": zlib.decompress(row.html).decode("utf-8")}
+            finally:
+                db.close()
+            if snapshot:
+                yield snapshot
+
+    def update_result(self, row_id: int, result: Dict[str, Any], extractor_version: str = None):
+        db = SessionLocal()
+        try:
+            row = db.query(ScrapeCache).filter(ScrapeCache.id == row_id).first()
+            if row is not None:
+                row.result = json.dumps(result)
+                row.extractor_version = extractor_version
+                db.commit()
+        finally:
+            db.close()
+
+    def clear(self) -> int:
+        db = SessionLocal()
+        try:
+            count = db.query(ScrapeCache).delete()
+            db.commit()
+        finally:
+            db.close()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            entries, snapshot_bytes = db.query(func.count(ScrapeCache.id), func.sum(func.length(ScrapeCache.html))).one()
+        finally:
+            db.close()
+        total = self.hits + self.revalidated + self.misses + self.stale
+        return {
+            "entries": entries,
+            "snapshot_bytes": snapshot_bytes or 0,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "stale": self.stale,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.revalidated) / total, 3) if total else 0.0,
+        }
+
+
+scrape_cache = ScrapeResultCache()
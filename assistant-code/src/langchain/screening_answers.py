@@ -0,0 +1,257 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import HumanMessage
+
+from src.Database.Database import SessionLocal
+from src.langchain.models import ScreeningAnswer, ProfileData, Field
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_THRESHOLD = 0.85   # cosine similarity for "same question, different wording"
+GENERATION_TIMEOUT = 25
+
+
+class AnswerIndex:
+    """Embedding index over screening answers the user already gave or accepted.
+
+    Rows live in the screening_answers table; the normalized embedding matrix is
+    rebuilt lazily from the table on first use and appended to in memory afterwards.
+    Generated answers are stored for review but only retrieved once accepted.
+    """
+
+    def __init__(self, embedder, threshold: float = RETRIEVAL_THRESHOLD):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.entries: List[Dict[str, Any]] = []
+        self.matrix: Optional[np.ndarray] = None
+        self._loaded = False
+        self.stats = {"retrieved": 0, "generated": 0}
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.embedder.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        db = SessionLocal()
+        try:
+            rows = db.query(ScreeningAnswer).order_by(ScreeningAnswer.id).all()
+            self.entries = [self._row_to_entry(row) for row in rows]
+            missing = [i for i, row in enumerate(rows) if not row.embedding]
+            vectors = [json.loads(row.embedding) if row.embedding else None for row in rows]
+            if missing:
+                # Answers imported without an embedding get one now, once
+                encoded = self._encode([rows[i].question for i in missing])
+                for i, vector in zip(missing, encoded):
+                    vectors[i] = vector.tolist()
+                    rows[i].embedding = json.dumps(vectors[i])
+                db.commit()
+            self.matrix = np.asarray(vectors, dtype=np.float32) if vectors else None
+        finally:
+            db.close()
+        self._loaded = True
+        logger.info(f"📚 Loaded {len(self.entries)} screening answers")
+
+    @staticmethod
+    def _row_to_entry(row: ScreeningAnswer) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "question": row.question,
+            "answer": row.answer,
+            "company": row.company or "",
+            "job_title": row.job_title or "",
+            "source": row.source or "generated",
+            "uses": row.uses or 0,
+            "timestamp": row.timestamp,
+        }
+
+    def search_many(self, questions: List[str]) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """Best stored answer per question, or (None, best_score) below threshold"""
+        self._ensure_loaded()
+        if self.matrix is None or not len(self.entries) or not questions:
+            return [(None, 0.0) for _ in questions]
+
+        accepted = np.asarray([e["source"] == "accepted" for e in self.entries])
+        if not accepted.any():
+            return [(None, 0.0) for _ in questions]
+
+        # Unreviewed generated answers are never reused for another application
+        scores = np.where(accepted, self._encode(questions) @ self.matrix.T, -1.0)
+        results = []
+        for row in scores:
+            best = int(np.argmax(row))
+            score = float(row[best])
+            results.append((self.entries[best], score) if score >= self.threshold else (None, score))
+        return results
+
+    def add(self, question: str, answer: str, company: str = "", job_title: str = "",
+            source: str = "generated") -> Dict[str, Any]:
+        self._ensure_loaded()
+        vector = self._encode([question])[0]
+        db = SessionLocal()
+        try:
+            row = ScreeningAnswer(
+                question=question,
+                answer=answer,
+                embedding=json.dumps(vector.tolist()),
+                company=company,
+                job_title=job_title,
+                source=source,
+            )
+            db.add(row)
+            db.commit()
+            db.refresh(row)
+            entry = self._row_to_entry(row)
+        finally:
+            db.close()
+
+        self.entries.append(entry)
+        self.matrix = vector[None, :] if self.matrix is None else np.vstack([self.matrix, vector])
+        return entry
+
+    def accept(self, entry_id: int, answer: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Mark a generated answer as accepted (optionally as edited) so it can be retrieved"""
+        self._ensure_loaded()
+        db = SessionLocal()
+        try:
+            row = db.query(ScreeningAnswer).filter(ScreeningAnswer.id == entry_id).first()
+            if row is None:
+                return None
+            row.source = "accepted"
+            if answer:
+                row.answer = answer
+            db.commit()
+            db.refresh(row)
+            entry = self._row_to_entry(row)
+        finally:
+            db.close()
+
+        for i, existing in enumerate(self.entries):
+            if existing["id"] == entry_id:
+                self.entries[i] = entry
+        return entry
+
+    def list_entries(self) -> List[Dict[str, Any]]:
+        """Stored answers, most recent first"""
+        self._ensure_loaded()
+        return list(reversed(self.entries))
+
+    def mark_used(self, entry_ids: List[int]):
+        if not entry_ids:
+            return
+        db = SessionLocal()
+        try:
+            for row in db.query(ScreeningAnswer).filter(ScreeningAnswer.id.in_(entry_ids)).all():
+                row.uses = (row.uses or 0) + 1
+            db.commit()
+        finally:
+            db.close()
+
+
+def adapt_answer(entry: Dict[str, Any], job: Dict[str, Any]) -> str:
+    """Swap the company/title an answer was written for with the current job's"""
+    answer = entry["answer"]
+    for old, new in ((entry.get("company"), job.get("company")), (entry.get("job_title"), job.get("title"))):
+        if old and new and old.strip().lower() != str(new).strip().lower():
+            replacement = str(new).strip()
+            # Whole words only ("Meta" not in "Metadata"); lookarounds behave like \b but
+            # also fit names ending in punctuation ("Acme Inc."). The new name is literal text.
+            pattern = rf"(?<!\w){re.escape(old.strip())}(?!\w)"
+            answer = re.sub(pattern, lambda _: replacement, answer, flags=re.I)
+    return answer
+
+
+def _profile_context(profile: ProfileData) -> str:
+    experience = "; ".join(
+        f"{exp.get('position', '')} at {exp.get('company', '')}".strip()
+        for exp in (profile.experience or [])[:3]
+    )
+    education = "; ".join(
+        f"{edu.get('degree', '')} {edu.get('field', '')} from {edu.get('school', '')}".strip()
+        for edu in (profile.education or [])[:2]
+    )
+    return (
+        f"Name: {profile.fullName}\n"
+        f"Summary: {profile.summary}\n"
+        f"Skills: {', '.join(profile.skills or [])}\n"
+        f"Experience: {experience}\n"
+        f"Education: {education}"
+    )
+
+
+async def _generate_answer(llm, question: str, profile: ProfileData, job: Dict[str, Any]) -> str:
+    description = str(job.get("description") or job.get("raw") or "")[:1500]
+    prompt = f"""You are helping a candidate answer a job application question.
+Write a sincere first-person answer of 80-150 words. Use only facts from the candidate profile.
+Do not invent employers, degrees or numbers. Return only the answer text.
+
+Candidate profile:
+{_profile_context(profile)}
+
+Job: {job.get('title', '')} at {job.get('company', '')}
+{description}
+
+Question: "{question}"
+"""
+    response = await asyncio.wait_for(llm.ainvoke([HumanMessage(content=prompt)]), timeout=GENERATION_TIMEOUT)
+    return response.content.strip() if response else ""
+
+
+async def answer_screening_questions(
+    fields: List[Field],
+    profile: ProfileData,
+    job: Optional[Dict[str, Any]],
+    index: AnswerIndex,
+    llm,
+    max_concurrency: int = 3,
+) -> Dict[str, str]:
+    """Fill long-answer questions by retrieval first, generating only on a miss"""
+    job = job or {}
+    results: Dict[str, str] = {}
+    labels = [f.label.strip() for f in fields]
+
+    misses = []
+    used = []
+    for field, label, (entry, score) in zip(fields, labels, index.search_many(labels)):
+        if entry:
+            results[field.field_id] = adapt_answer(entry, job)
+            used.append(entry["id"])
+            index.stats["retrieved"] += 1
+            logger.info(f"📚 Answer retrieved for '{label}' ({score:.2f}, {entry['source']})")
+        else:
+            misses.append((field, label))
+    index.mark_used(used)
+
+    # Identical question text on one page only needs one generation
+    unique_questions = {}
+    for field, label in misses:
+        unique_questions.setdefault(label.lower(), label)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate(label: str):
+        async with semaphore:
+            try:
+                return label, await _generate_answer(llm, label, profile, job)
+            except Exception as e:
+                logger.warning(f"Answer generation failed for '{label}': {str(e)}")
+                return label, ""
+
+    generated = dict(await asyncio.gather(*(generate(label) for label in unique_questions.values())))
+
+    for field, label in misses:
+        answer = generated.get(unique_questions[label.lower()], "")
+        if answer:
+            results[field.field_id] = answer
+
+    for label, answer in generated.items():
+        if answer:
+            index.add(label, answer, job.get("company", ""), job.get("title", ""), source="generated")
+            index.stats["generated"] += 1
+
+    return results
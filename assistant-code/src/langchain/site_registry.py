@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.Database.Database import SessionLocal
+from src.langchain.models import SelectorStat
+
+logger = logging.getLogger(__name__)
+
+SITE_REGISTRY_PATH = os.getenv("SITE_REGISTRY_PATH", os.path.join(os.path.dirname(__file__), "site_selectors.json"))
+
+# A selector tried this often that almost never matches is a pruning candidate
+PRUNE_MIN_ATTEMPTS = 20
+PRUNE_MAX_HIT_RATE = 0.05
+
+
+@dataclass
+class SiteRule:
+    name: str
+    domains: List[str]
+    description: List[str] = field(default_factory=list)  # candidate description containers, raced in the browser
+    title: List[str] = field(default_factory=list)
+    company: List[str] = field(default_factory=list)
+    render: str = "auto"  # "browser" skips the plain HTTP tier for app-shell sites
+
+    def matches(self, url: str) -> bool:
+        return any(domain in url for domain in self.domains)
+
+
+@dataclass
+class SelectorStats:
+    attempts: int = 0
+    hits: int = 0
+    total_latency_ms: float = 0.0  # time until the selector appeared, summed over browser hits
+    timed_hits: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.attempts, 3) if self.attempts else 0.0,
+            "avg_hit_latency_ms": round(self.total_latency_ms / self.timed_hits, 1) if self.timed_hits else None,
+        }
+
+
+class SiteRegistry:
+    """Per-domain extraction rules loaded from site_selectors.json.
+
+    New sites or selectors are added by editing the JSON file (or pointing
+    SITE_REGISTRY_PATH at another one) and calling reload(). Every selector
+    that was checked is counted so dead or slow selectors show up in stats();
+    counts persist in the selector_stats table across restarts.
+    """
+
+    def __init__(self, path: str = SITE_REGISTRY_PATH):
+        self.path = path
+        self.rules: List[SiteRule] = []
+        self._stats: Dict[str, Dict[str, SelectorStats]] = {}
+        self._stats_loaded = False
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> int:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                sites = json.load(f).get("sites", [])
+            rules = [SiteRule(**site) for site in sites]
+        except (OSError, ValueError, TypeError) as e:
+            # Keep the rules we have rather than scraping without any
+            logger.error(f"❌ Could not load site registry {self.path}: {str(e)}")
+            return len(self.rules)
+        self.rules = rules
+        logger.info(f"🗺️ Loaded {len(rules)} site extraction rules")
+        return len(rules)
+
+    def rule_for(self, url: str) -> Optional[SiteRule]:
+        for rule in self.rules:
+            if rule.matches(url):
+                return rule
+        return None
+
+    def _ensure_stats_loaded(self):
+        # Called with self._lock held
+        if self._stats_loaded:
+            return
+        db = SessionLocal()
+        try:
+            for row in db.query(SelectorStat).all():
+                self._stats.setdefault(row.site, {})[row.selector] = SelectorStats(
+                    attempts=row.attempts or 0,
+                    hits=row.hits or 0,
+                    total_latency_ms=row.total_latency_ms or 0.0,
+                    timed_hits=row.timed_hits or 0,
+                )
+        finally:
+            db.close()
+        self._stats_loaded = True
+
+    def _persist(self, site: str, selectors: List[str]):
+        # Called with self._lock held, so rows for one (site, selector) are never inserted twice
+        db = SessionLocal()
+        try:
+            rows = {
+                row.selector: row for row in
+                db.query(SelectorStat).filter(SelectorStat.site == site, SelectorStat.selector.in_(selectors)).all()
+            }
+            for selector in selectors:
+                row = rows.get(selector)
+                if row is None:
+                    row = SelectorStat(site=site, selector=selector)
+                    db.add(row)
+                stats = self._stats[site][selector]
+                row.attempts = stats.attempts
+                row.hits = stats.hits
+                row.total_latency_ms = stats.total_latency_ms
+                row.timed_hits = stats.timed_hits
+                row.updated_at = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            # Stats are advisory; a failed write must never fail the scrape
+            db.rollback()
+            logger.warning(f"⚠️ Could not persist selector stats for {site}: {str(e)}")
+        finally:
+            db.close()
+
+    def record_lookup(self, rule: Optional[SiteRule], checked: List[str], winner: Optional[str],
+                      latency_ms: Optional[float] = None):
+        """One lookup over a site's description selectors.
+
+        checked lists the selectors that were actually looked for: the winner
+        is a hit and every other checked selector was absent. Selectors never
+        checked (after the first match of an ordered lookup, or still pending
+        when another won a race) are not counted.
+        """
+        if rule is None or not checked:
+            return
+        with self._lock:
+            self._ensure_stats_loaded()
+            for selector in checked:
+                stats = self._stats.setdefault(rule.name, {}).setdefault(selector, SelectorStats())
+                stats.attempts += 1
+                if selector == winner:
+                    stats.hits += 1
+                    if latency_ms is not None:
+                        stats.total_latency_ms += latency_ms
+                        stats.timed_hits += 1
+            self._persist(rule.name, checked)
+
+    @staticmethod
+    def checked_in_order(rule: Optional[SiteRule], winner: Optional[str]) -> List[str]:
+        """Selectors an in-order lookup looked at: all before the match, and the match"""
+        if rule is None:
+            return []
+        if winner in rule.description:
+            return rule.description[:rule.description.index(winner) + 1]
+        return list(rule.description)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._ensure_stats_loaded()
+            sites = {
+                site: {selector: s.as_dict() for selector, s in selectors.items()}
+                for site, selectors in self._stats.items()
+            }
+            prune_candidates = [
+                {"site": site, "selector": selector}
+                for site, selectors in self._stats.items()
+                for selector, s in selectors.items()
+                if s.attempts >= PRUNE_MIN_ATTEMPTS and s.hits / s.attempts <= PRUNE_MAX_HIT_RATE
+            ]
+        return {"rules": len(self.rules), "sites": sites, "prune_candidates": prune_candidates}
+
+
+site_registry = SiteRegistry()
@@ -0,0 +1,323 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Canonical skill -> aliases as they appear in postings and profiles.
+# Aliases are tokenized like the text they are matched against, so "ci/cd",
+# "ci cd" and "ci-cd" all compile to the same token path. Lowercase aliases
+# match any casing; aliases (and canonical names) with capitals only match that
+# exact casing, which keeps words like "go", "excel" or "swift" out of the results.
+# Generic terms ("version control", "algorithms") are their own skills rather than
+# aliases of one product, so a posting is never credited with a tool it didn't name.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python", "python3"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["typescript"],
+    "C": ["C", "c language", "c programming"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Go": ["golang", "go lang", "Go"],
+    "Rust": [],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swiftui"],
+    "Scala": ["scala"],
+    "R": ["R", "r programming", "rstudio"],
+    "MATLAB": ["matlab"],
+    "SQL": ["sql", "t-sql", "tsql", "pl/sql", "plsql"],
+    "Bash": ["bash", "shell scripting", "shell script"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3", "scss", "sass"],
+    # Frameworks and libraries
+    "React": ["react.js", "reactjs"],
+    "React Native": ["react native"],
+    "Angular": ["angular", "angularjs", "angular.js"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Next.js": ["next.js", "nextjs"],
+    "Node.js": ["Node", "node.js", "nodejs"],
+    "Express": ["express.js", "expressjs"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring Boot": ["spring boot", "springboot"],
+    "Spring Framework": ["spring framework", "spring mvc"],
+    ".NET": [".net", "dotnet", ".net core", "asp.net"],
+    "Ruby on Rails": ["rails", "ruby on rails", "ror"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "Redux": ["redux"],
+    "GraphQL": ["graphql"],
+    "REST": ["restful", "rest api", "rest apis", "restful api", "restful apis"],
+    "gRPC": ["grpc"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch", "torch"],
+    "Keras": ["keras"],
+    "LangChain": ["langchain"],
+    "Hugging Face": ["hugging face", "huggingface"],
+    "spaCy": ["spacy"],
+    "OpenCV": ["opencv"],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": ["hadoop"],
+    "Kafka": ["kafka", "apache kafka"],
+    "Airflow": ["airflow", "apache airflow"],
+    "dbt": ["dbt"],
+    "Playwright": ["playwright"],
+    "Selenium": ["selenium"],
+    "Jest": ["jest"],
+    "Cypress": ["cypress"],
+    "pytest": ["pytest"],
+    "JUnit": ["junit"],
+    # Data stores
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "MySQL": ["mysql"],
+    "SQLite": ["sqlite"],
+    "SQL Server": ["sql server", "mssql", "microsoft sql server"],
+    "Oracle Database": ["oracle db", "oracle database"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search", "elk"],
+    "Cassandra": ["cassandra"],
+    "DynamoDB": ["dynamodb"],
+    "Snowflake": ["snowflake"],
+    "BigQuery": ["bigquery", "big query"],
+    "NoSQL": ["nosql"],
+    # Cloud and infrastructure
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker"],
+    "Containerization": ["containerization"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"],
+    "GitHub Actions": ["github actions"],
+    "CI/CD": ["ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["git"],
+    "GitHub": ["github"],
+    "GitLab": ["gitlab"],
+    "Bitbucket": ["bitbucket"],
+    "Version Control": ["version control", "source control"],
+    "Linux": ["linux", "unix"],
+    "Microservices": ["microservices", "microservice", "micro-services"],
+    "Serverless": ["serverless", "aws lambda", "lambda functions"],
+    "Nginx": ["nginx"],
+    # Data and ML
+    "Machine Learning": ["machine learning", "ML"],
+    "Deep Learning": ["deep learning"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "LLMs": ["llm", "llms", "large language models", "large language model"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Visualization": ["data visualization", "data visualisation"],
+    "Statistics": ["statistics", "statistical analysis"],
+    "ETL": ["etl", "elt", "data pipelines", "data pipeline"],
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Excel": ["microsoft excel", "ms excel", "spreadsheets"],
+    # Practices and tools
+    "Agile": ["agile", "scrum", "kanban"],
+    "Jira": ["jira"],
+    "Confluence": ["confluence"],
+    "Figma": ["figma"],
+    "Unit Testing": ["unit testing", "unit tests", "tdd", "test-driven development"],
+    "System Design": ["system design", "distributed systems"],
+    "Object-Oriented Programming": ["oop", "object-oriented programming", "object oriented programming", "object-oriented design"],
+    "Data Structures": ["data structures"],
+    "Algorithms": ["algorithms"],
+    "Data Structures and Algorithms": ["data structures and algorithms", "dsa"],
+    "API Design": ["api design", "api development"],
+    "Salesforce": ["salesforce"],
+    "SAP": [],
+    # Professional
+    "Communication": ["communication", "communication skills", "written and verbal communication"],
+    "Leadership": ["leadership", "team leadership"],
+    "Project Management": ["project management", "pmp"],
+    "Stakeholder Management": ["stakeholder management"],
+    "Problem Solving": ["problem solving", "problem-solving"],
+    "Customer Service": ["customer service"],
+    "Recruiting": ["recruiting", "recruitment", "talent acquisition"],
+    "Employee Relations": ["employee relations"],
+    "HRIS": ["hris"],
+    "Workday HCM": ["workday hcm", "workday hris"],
+    "SuccessFactors": ["successfactors", "sap successfactors"],
+}
+
+# Exact-case names that are also letters or everyday words: "R&D", "C-level",
+# "Go above and beyond", "Swift delivery". They only count where context allows.
+AMBIGUOUS_ALIASES = {"C", "R", "Go", "Node", "Rust", "Swift", "Spark", "Excel", "Express"}
+SENTENCE_BREAKS = set(".!?:;\n•*")
+LIST_WORDS = {"and", "or"}
+
+# Tokens keep the characters that are part of skill names (c++, c#, node.js, .net)
+TOKEN_PATTERN = re.compile(r'\.?[A-Za-z0-9][A-Za-z0-9+#.]*')
+
+
+def token_spans(text: str) -> List[Tuple[str, int, int]]:
+    """(token, start, end) for each token, sentence punctuation trimmed ("Java." -> "Java")"""
+    spans = []
+    for match in TOKEN_PATTERN.finditer(text or ""):
+        tok = match.group().rstrip(".")
+        if tok:
+            spans.append((tok, match.start(), match.start() + len(tok)))
+    return spans
+
+
+def tokenize(text: str) -> List[str]:
+    """Original-case tokens with sentence punctuation trimmed"""
+    return [tok for tok, _, _ in token_spans(text)]
+
+
+class SkillGazetteer:
+    """Alias-normalizing skill extractor over a token trie.
+
+    Every alias is compiled into a trie keyed on lowercase tokens; extraction walks
+    the text once, taking the longest alias at each position.
+    """
+
+    _END = "__skill__"
+
+    def __init__(self, aliases: Dict[str, List[str]] = None):
+        self.trie: Dict = {}
+        self.canonical_lower: Dict[str, str] = {}
+        for canonical, alias_list in (aliases or SKILL_ALIASES).items():
+            self.canonical_lower[canonical.lower()] = canonical
+            for alias in [canonical] + list(alias_list):
+                self._add(alias, canonical)
+
+    def _add(self, alias: str, canonical: str):
+        tokens = tokenize(alias)
+        if not tokens:
+            return
+        node = self.trie
+        for tok in tokens:
+            node = node.setdefault(tok.lower(), {})
+        # None = any casing; otherwise the set of exact spellings that may match
+        exact = frozenset([" ".join(tokens)]) if alias != alias.lower() else None
+        if self._END not in node:
+            node[self._END] = (canonical, exact)
+            return
+        existing_canonical, existing_exact = node[self._END]
+        if existing_exact is None or exact is None:
+            node[self._END] = (existing_canonical, None)
+        else:
+            node[self._END] = (existing_canonical, existing_exact | exact)
+
+    @staticmethod
+    def _out_of_context(spans: List[Tuple[str, int, int]], text: str, i: int, j: int) -> bool:
+        """True when an ambiguous alias at spans[i:j] is being used as a plain word"""
+        if " ".join(tok for tok, _, _ in spans[i:j]) not in AMBIGUOUS_ALIASES:
+            return False
+        end = spans[j - 1][2]
+        if text[end:end + 1] in ("&", "-"):
+            return True  # R&D, C-level, Go-to-market
+        if j == len(spans):
+            return False
+        following, following_start, _ = spans[j]
+        if following.lower() == "level":
+            return True
+        # Sentence-initial and running straight into a lowercase word: a verb or
+        # adjective ("Go above and beyond"), not a list ("Go, Python" / "Go and Rust")
+        lead = text[spans[i - 1][2] if i else 0:spans[i][1]]
+        sentence_start = i == 0 or any(ch in SENTENCE_BREAKS for ch in lead)
+        return (sentence_start and not text[end:following_start].strip()
+                and following.islower() and following not in LIST_WORDS)
+
+    def _scan(self, spans: List[Tuple[str, int, int]], text: str) -> Iterable[Tuple[int, int, str]]:
+        tokens = [tok for tok, _, _ in spans]
+        lowered = [tok.lower() for tok in tokens]
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            best = None
+            j = i
+            while j < len(tokens) and lowered[j] in node:
+                node = node[lowered[j]]
+                j += 1
+                if self._END in node:
+                    canonical, exact = node[self._END]
+                    if ((exact is None or " ".join(tokens[i:j]) in exact)
+                            and not self._out_of_context(spans, text, i, j)):
+                        best = (j, canonical)
+            if best:
+                yield i, best[0], best[1]
+                i = best[0]
+            else:
+                i += 1
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(canonical for _, _, canonical in self._scan(token_spans(text), text or "")))
+
+    def normalize(self, skill: str) -> Optional[str]:
+        """Canonical name when the whole string is a known alias, else None"""
+        spans = token_spans(skill)
+        for start, end, canonical in self._scan(spans, skill or ""):
+            if start == 0 and end == len(spans):
+                return canonical
+        return self.canonical_lower.get((skill or "").strip().lower())
+
+    def normalize_list(self, skills: Iterable[str]) -> List[str]:
+        """Canonicalize a skill list; unknown entries are kept (trimmed) so nothing is lost"""
+        result = []
+        for skill in skills or []:
+            skill = str(skill).strip()
+            if not skill:
+                continue
+            canonical = self.normalize(skill)
+            if canonical:
+                result.append(canonical)
+                continue
+            found = self.extract(skill)
+            # "Experience with Docker and k8s" -> Docker, Kubernetes
+            result.extend(found if found else [skill])
+        return list(dict.fromkeys(result))
+
+    def skill_gap(self, profile_skills: Iterable[str], job_skills: Iterable[str],
+                  profile_text: str = "") -> Tuple[List[str], List[str]]:
+        """(matched, missing) job skills against profile skills plus skills named in profile_text"""
+        have: Set[str] = {s.lower() for s in self.normalize_list(profile_skills)}
+        have.update(s.lower() for s in self.extract(profile_text))
+        text_lower = (profile_text or "").lower()
+
+        matched, missing = [], []
+        for skill in self.normalize_list(job_skills):
+            key = skill.lower()
+            if key in have or (key not in self.canonical_lower and key in text_lower):
+                matched.append(skill)
+            else:
+                missing.append(skill)
+        return matched, missing
+
+
+@lru_cache(maxsize=1)
+def get_skill_gazetteer() -> SkillGazetteer:
+    return SkillGazetteer()
+
+
+if __name__ == "__main__":
+    # Regression phrases: ambiguous names used as plain words must not become skills
+    gazetteer = get_skill_gazetteer()
+    checks = {
+        "Lead R&D initiatives with C-level executives": [],
+        "Go above and beyond for our customers": [],
+        "Partner with C level executives on go-to-market": [],
+        "Swift delivery of Excel reports": ["Excel"],
+        "Experience with Go, R and C in production": ["Go", "R", "C"],
+        "Go and Python services on AWS": ["Go", "Python", "AWS"],
+        "We use GitHub for version control": ["GitHub", "Version Control"],
+        "Apply on our Workday career site": [],
+    }
+    failed = 0
+    for phrase, expected in checks.items():
+        found = gazetteer.extract(phrase)
+        if found != expected:
+            failed += 1
+            print(f"❌ {phrase!r}: expected {expected}, got {found}")
+    print("✅ All gazetteer checks passed" if not failed else f"❌ {failed} gazetteer checks failed")
+    raise SystemExit(1 if failed else 0)
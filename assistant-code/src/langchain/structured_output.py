@@ -0,0 +1,263 @@
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+from langchain.schema import AIMessage, BaseMessage, HumanMessage
+from pydantic import BaseModel, ValidationError
+
+from src.langchain.main import ACTIVE_MODEL
+
+logger = logging.getLogger(__name__)
+
+# with_structured_output method per provider in main.get_llm. OpenAI and Anthropic
+# support tool calling; Together's Llama/Mixtral endpoints support JSON mode.
+NATIVE_METHODS = {
+    "openai": "function_calling",
+    "claude": "function_calling",
+    "mistral": "json_mode",
+    "llama": "json_mode",
+}
+
+# Only the most recent completion points are worth trying when truncating a reply
+MAX_REPAIR_CANDIDATES = 20
+
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+structured_output_stats = {
+    "native": 0,        # provider returned a parsed object
+    "parsed": 0,        # plain text was valid JSON
+    "repaired": 0,      # plain text needed repair
+    "field_retries": 0,  # follow-up calls for still-invalid fields
+    "defaulted": 0,     # invalid fields dropped in favour of schema defaults
+    "failed": 0,
+}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a reply cannot be turned into a valid schema instance"""
+
+
+# ================== JSON REPAIR ================== #
+def _strip_fences(text: str) -> str:
+    fenced = re.search(r'```(?:json)?\s*(.*?)```', text, re.S | re.I)
+    return fenced.group(1) if fenced else text
+
+
+def _drop_trailing_comma(out: List[str]):
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _scan(text: str) -> Tuple[str, List[str], bool, List[Tuple[int, Tuple[str, ...]]]]:
+    """Single pass over a JSON-ish reply.
+
+    Fixes trailing commas and Python literals, stops at the end of the first
+    top-level value and records every position where a complete value ends, so a
+    truncated reply can be cut back to its last complete member.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    cuts: List[Tuple[int, Tuple[str, ...]]] = []
+    in_string = escape = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            i += 1
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                return "".join(out), [], False, cuts
+            cuts.append((len(out), tuple(stack)))
+        elif ch == ",":
+            _drop_trailing_comma(out)
+            cuts.append((len(out), tuple(stack)))
+            out.append(ch)
+        elif ch.isalpha():
+            word = re.match(r'[A-Za-z_]+', text[i:]).group()
+            out.append(_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out), stack, in_string, cuts
+
+
+def _close(buffer: str, stack: List[str], in_string: bool) -> str:
+    if in_string:
+        buffer += '"'
+    buffer = buffer.rstrip()
+    if buffer.endswith(","):
+        buffer = buffer[:-1]
+    if buffer.endswith(":"):
+        buffer += " null"
+    return buffer + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Any:
+    """Parse model output as JSON, repairing fences, prose, trailing commas and truncation"""
+    text = _strip_fences(text or "")
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise StructuredOutputError("No JSON object found in model output")
+    text = text[min(starts):]
+
+    buffer, stack, in_string, cuts = _scan(text)
+    candidates = [_close(buffer, stack, in_string)]
+    candidates += [_close(buffer[:pos], list(open_stack), False) for pos, open_stack in reversed(cuts[-MAX_REPAIR_CANDIDATES:])]
+    for candidate in candidates:
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            continue
+    raise StructuredOutputError("Model output could not be repaired into JSON")
+
+
+def parse_json_output(text: str) -> Any:
+    """json.loads with repair as the fallback, counted in structured_output_stats"""
+    try:
+        result = json.loads(text, strict=False)
+        structured_output_stats["parsed"] += 1
+    except (json.JSONDecodeError, TypeError):
+        result = repair_json(text)
+        structured_output_stats["repaired"] += 1
+    return result
+
+
+# ================== STRUCTURED INVOCATION ================== #
+def _as_messages(prompt) -> List[BaseMessage]:
+    if isinstance(prompt, str):
+        return [HumanMessage(content=prompt)]
+    if hasattr(prompt, "to_messages"):
+        return prompt.to_messages()
+    return list(prompt)
+
+
+def _validate(schema: Type[BaseModel], data: Dict[str, Any]) -> Tuple[Optional[BaseModel], Set[str]]:
+    """Schema instance, or None plus the top-level fields that failed validation"""
+    try:
+        return schema(**data), set()
+    except ValidationError as e:
+        return None, {str(error["loc"][0]) for error in e.errors() if error.get("loc")}
+
+
+def _json_schema(schema: Type[BaseModel]) -> Dict[str, Any]:
+    # pydantic v2 / v1
+    builder = getattr(schema, "model_json_schema", None) or schema.schema
+    return builder()
+
+
+class StructuredOutput:
+    """Schema-validated LLM calls without whole-reply retries.
+
+    Uses the provider's native structured output where main.get_llm's model has
+    one, and falls back to plain text with tolerant JSON repair. Fields that are
+    still invalid afterwards are requested again on their own, once; anything
+    left invalid falls back to the schema default or raises StructuredOutputError.
+    """
+
+    def __init__(self, llm, schema: Type[BaseModel], method: Optional[str] = None):
+        self.llm = llm
+        self.schema = schema
+        self.native = None
+        method = method or NATIVE_METHODS.get(ACTIVE_MODEL)
+        if method:
+            try:
+                self.native = llm.with_structured_output(schema, method=method, include_raw=True)
+            except (NotImplementedError, TypeError, ValueError) as e:
+                logger.info(f"Native structured output unavailable for {schema.__name__}: {e}")
+
+    def invoke(self, prompt) -> BaseModel:
+        messages = _as_messages(prompt)
+        data = self._first_pass(messages)
+        instance, invalid = _validate(self.schema, data)
+        if instance is not None:
+            return instance
+
+        logger.info(f"🧩 Re-requesting invalid {self.schema.__name__} fields: {', '.join(sorted(invalid))}")
+        structured_output_stats["field_retries"] += 1
+        data.update(self._retry_fields(messages, data, invalid))
+        instance, invalid = _validate(self.schema, data)
+        if instance is not None:
+            return instance
+
+        # Let optional fields fall back to their defaults rather than fail the call
+        instance, missing = _validate(self.schema, {k: v for k, v in data.items() if k not in invalid})
+        if instance is not None:
+            structured_output_stats["defaulted"] += len(invalid)
+            return instance
+
+        structured_output_stats["failed"] += 1
+        raise StructuredOutputError(f"Invalid {self.schema.__name__} fields: {', '.join(sorted(missing))}")
+
+    def _first_pass(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        if self.native is not None:
+            try:
+                result = self.native.invoke(messages)
+                if result.get("parsed") is not None:
+                    structured_output_stats["native"] += 1
+                    return result["parsed"].dict()
+                raw = result.get("raw")
+                if getattr(raw, "tool_calls", None):
+                    return dict(raw.tool_calls[0]["args"])
+                return self._parse_dict(raw.content if raw is not None else "")
+            except Exception as e:
+                logger.warning(f"Native structured output failed, using text mode: {e}")
+
+        try:
+            return self._parse_dict(self.llm.invoke(messages).content)
+        except StructuredOutputError as e:
+            logger.warning(f"{self.schema.__name__} reply was not JSON: {e}")
+            return {}
+
+    @staticmethod
+    def _parse_dict(text: str) -> Dict[str, Any]:
+        result = parse_json_output(text)
+        if not isinstance(result, dict):
+            raise StructuredOutputError("Model output is not a JSON object")
+        return result
+
+    def _retry_fields(self, messages: List[BaseMessage], data: Dict[str, Any], invalid: Set[str]) -> Dict[str, Any]:
+        """One follow-up call asking only for the fields that failed validation"""
+        full_schema = _json_schema(self.schema)
+        properties = full_schema.get("properties", {})
+        subset = {"type": "object", "properties": {name: properties[name] for name in invalid if name in properties}}
+        for defs_key in ("$defs", "definitions"):
+            if defs_key in full_schema:
+                subset[defs_key] = full_schema[defs_key]
+
+        follow_up = messages + [
+            AIMessage(content=json.dumps({k: v for k, v in data.items() if k not in invalid}, default=str)),
+            HumanMessage(content=(
+                f"These fields were missing or invalid: {', '.join(sorted(invalid))}. "
+                f"Return ONLY a JSON object with exactly these keys, matching this JSON schema:\n"
+                f"{json.dumps(subset)}"
+            )),
+        ]
+        try:
+            fixed = self._parse_dict(self.llm.invoke(follow_up).content)
+        except Exception as e:
+            logger.warning(f"Field retry failed: {e}")
+            return {}
+        return {k: v for k, v in fixed.items() if k in invalid}